@@ -0,0 +1,160 @@
+"""Async-native versions of the auth views, routed when ``settings.ASYNC_VIEWS`` is on.
+
+Lookups use the async ORM, and PBKDF2 hashing/verification runs in the bounded
+hasher pool (``PASSWORD_HASHER_THREADS``). Login runs the whole
+``authenticate()`` call in that pool, so every configured backend, the
+``user_login_failed`` signal and the backends' timing protection apply exactly
+as in the sync view; the backends' user lookup runs on that thread too, and
+its database connection is closed afterwards. Session work (login/logout)
+goes through ``sync_to_async`` because Django 4.1 has no async session or
+auth API.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import authenticate, get_user_model, login as auth_login, logout as auth_logout
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import connections
+from django.http import JsonResponse
+
+from visorhr.async_utils import aget_user, async_csrf_exempt, async_require_POST, run_in_hasher
+
+from .bootstrap import get_bootstrap_state, register_user
+from .views import _json_error, _parse_body
+
+
+async def _acheck_password(user, raw_password):
+    """Verify ``raw_password`` off the event loop, upgrading the stored hash if needed."""
+    rehash = []
+    valid = await run_in_hasher(check_password, raw_password, user.password, rehash.append)
+    if valid and rehash:
+        encoded = await run_in_hasher(make_password, raw_password)
+        await get_user_model()._default_manager.filter(pk=user.pk).aupdate(password=encoded)
+    return valid
+
+
+def _authenticate(request, username, password):
+    """``authenticate()`` for a hasher-pool thread, which keeps no database connection open afterwards."""
+    try:
+        return authenticate(request, username=username, password=password)
+    finally:
+        connections.close_all()
+
+
+@async_csrf_exempt
+@async_require_POST
+async def register(request):
+    data = _parse_body(request)
+    if data is None:
+        return _json_error("Invalid JSON body.")
+
+    username = (data.get("username") or "").strip()
+    email = (data.get("email") or "").strip()
+    password = data.get("password") or ""
+
+    if not username or not password:
+        return _json_error("Username and password are required.")
+
+    User = get_user_model()
+    if await User.objects.filter(username=username).aexists():
+        return _json_error("Username already exists.", status=409)
+
+    encoded = await run_in_hasher(make_password, password)
+    user = await sync_to_async(register_user)(username, email, encoded)
+
+    role_note = " (promoted to superadmin)" if user.is_superuser else ""
+    return JsonResponse(
+        {
+            "success": True,
+            "message": f"User registered{role_note}.",
+            "user": {
+                "id": user.id,
+                "username": user.username,
+                "email": user.email,
+                "is_superuser": user.is_superuser,
+                "is_staff": user.is_staff,
+            },
+        },
+        status=201,
+    )
+
+
+@async_csrf_exempt
+@async_require_POST
+async def login(request):
+    data = _parse_body(request)
+    if data is None:
+        return _json_error("Invalid JSON body.")
+
+    username = (data.get("username") or "").strip()
+    password = data.get("password") or ""
+
+    if not username or not password:
+        return _json_error("Username and password are required.")
+
+    user = await run_in_hasher(_authenticate, request, username, password)
+    if user is None:
+        return _json_error("Invalid credentials.", status=401)
+
+    await sync_to_async(auth_login)(request, user)
+    return JsonResponse(
+        {
+            "success": True,
+            "message": "Logged in.",
+            "user": {"id": user.id, "username": user.username, "email": user.email},
+        }
+    )
+
+
+@async_csrf_exempt
+@async_require_POST
+async def logout(request):
+    user = await aget_user(request)
+    if user.is_authenticated:
+        await sync_to_async(auth_logout)(request)
+    return JsonResponse({"success": True, "message": "Logged out."})
+
+
+@async_csrf_exempt
+@async_require_POST
+async def validate_admin(request):
+    """Validate superadmin credentials for gated registration."""
+    data = _parse_body(request)
+    if data is None:
+        return _json_error("Invalid JSON body.")
+
+    username_or_email = (data.get("username") or "").strip()
+    password = data.get("password") or ""
+
+    if not username_or_email or not password:
+        return _json_error("Username/email and password are required.")
+
+    User = get_user_model()
+    user = await User.objects.filter(username=username_or_email).afirst()
+    if not user:
+        user = await User.objects.filter(email=username_or_email).afirst()
+
+    if not user:
+        return _json_error("Invalid credentials.", status=401)
+
+    if not user.is_superuser:
+        return _json_error("Only superadmin can authorize registrations.", status=403)
+
+    if not await _acheck_password(user, password):
+        return _json_error("Invalid credentials.", status=401)
+
+    return JsonResponse({
+        "success": True,
+        "message": "Admin validated.",
+    })
+
+
+@async_csrf_exempt
+async def check_user_exists(request):
+    """Check if any users exist in the system."""
+    state = await sync_to_async(get_bootstrap_state)()
+    return JsonResponse({
+        "success": True,
+        "users_exist": state["users_exist"],
+        "user_count": state["user_count"],
+        "superadmin_present": state["superadmin_present"],
+    })
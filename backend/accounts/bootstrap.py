@@ -0,0 +1,91 @@
+"""Cached "system bootstrap state" for the auth views.
+
+The frontend asks on every page load whether any users exist, and registration
+needs to know whether it is creating the very first user (who becomes
+superadmin). Both read ``get_bootstrap_state()``, which is computed once and
+kept in Django's cache until a user is created, deleted or has
+``is_superuser`` changed (see ``accounts.signals``).
+
+The cache is only a hint for promotion: ``register_user`` re-checks under a
+lock inside the insert's transaction, so two simultaneous first registrations
+cannot both become superadmin even when the cached state is stale.
+"""
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+
+CACHE_KEY = "accounts:bootstrap_state"
+BOOTSTRAP_LOCK_NAME = "visorhr_accounts_bootstrap"
+BOOTSTRAP_LOCK_TIMEOUT = 10
+
+
+def _cache_timeout():
+    return getattr(settings, "BOOTSTRAP_STATE_CACHE_SECONDS", 300)
+
+
+def compute_bootstrap_state():
+    User = get_user_model()
+    user_count = User.objects.count()
+    return {
+        "users_exist": user_count > 0,
+        "user_count": user_count,
+        "superadmin_present": user_count > 0 and User.objects.filter(is_superuser=True).exists(),
+    }
+
+
+def get_bootstrap_state():
+    state = cache.get(CACHE_KEY)
+    if state is None:
+        state = compute_bootstrap_state()
+        cache.set(CACHE_KEY, state, _cache_timeout())
+    return state
+
+
+def invalidate_bootstrap_state():
+    cache.delete(CACHE_KEY)
+    # Also after commit, so a reader that repopulated the cache mid-transaction is not left stale.
+    transaction.on_commit(lambda: cache.delete(CACHE_KEY))
+
+
+@contextmanager
+def bootstrap_lock():
+    """Serialize first-user registration across processes.
+
+    MySQL gets a named lock; SQLite already serializes writers, and the
+    promotion check runs after the insert, so it needs nothing extra.
+    """
+    if connection.vendor != "mysql":
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT GET_LOCK(%s, %s)", [BOOTSTRAP_LOCK_NAME, BOOTSTRAP_LOCK_TIMEOUT])
+        if cursor.fetchone()[0] != 1:
+            raise TimeoutError("Timed out waiting for the bootstrap registration lock.")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", [BOOTSTRAP_LOCK_NAME])
+
+
+def register_user(username, email, encoded_password):
+    """Create a user from an already-hashed password; the very first user becomes superadmin."""
+    User = get_user_model()
+    fields = {
+        "username": User.normalize_username(username),
+        "email": User.objects.normalize_email(email),
+        "password": encoded_password,
+    }
+    if get_bootstrap_state()["users_exist"]:
+        return User.objects.create(**fields)
+
+    with bootstrap_lock(), transaction.atomic():
+        user = User.objects.create(**fields)
+        if not User.objects.exclude(pk=user.pk).exists():
+            user.is_staff = user.is_superuser = True
+            user.save(update_fields=["is_staff", "is_superuser"])
+    return user
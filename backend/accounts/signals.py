@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .bootstrap import invalidate_bootstrap_state
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User, dispatch_uid="accounts_bootstrap_state_save")
+def user_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    # Logins save last_login only; that cannot change the bootstrap state.
+    if created or update_fields is None or "is_superuser" in update_fields:
+        invalidate_bootstrap_state()
+
+
+@receiver(post_delete, sender=User, dispatch_uid="accounts_bootstrap_state_delete")
+def user_deleted(sender, instance, **kwargs):
+    invalidate_bootstrap_state()
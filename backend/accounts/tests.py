@@ -0,0 +1,134 @@
+import json
+import threading
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model, user_login_failed
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+
+from . import async_views, bootstrap
+
+# The async views, routed as they are when ASYNC_VIEWS is on.
+urlpatterns = [
+    path("api/auth/register/", async_views.register),
+    path("api/auth/login/", async_views.login),
+    path("api/auth/logout/", async_views.logout),
+    path("api/auth/validate-admin/", async_views.validate_admin),
+    path("api/auth/check-user-exists/", async_views.check_user_exists),
+]
+
+
+class SuspendedUsernamesBackend(ModelBackend):
+    """A backend with a rule of its own, which a login that bypassed authenticate() would skip."""
+
+    def user_can_authenticate(self, user):
+        return super().user_can_authenticate(user) and not user.username.startswith("suspended-")
+
+
+@override_settings(ROOT_URLCONF="accounts.tests")
+class AsyncAuthViewTests(TransactionTestCase):
+    async def post(self, name, body):
+        return await self.async_client.post(f"/api/auth/{name}/", json.dumps(body), content_type="application/json")
+
+    def test_register_login_and_logout(self):
+        async def scenario():
+            first = await self.post("register", {"username": "root", "email": "root@example.com", "password": "s3cret-pw"})
+            second = await self.post("register", {"username": "clerk", "password": "s3cret-pw"})
+            again = await self.post("register", {"username": "clerk", "password": "other"})
+            bad = await self.post("login", {"username": "clerk", "password": "wrong"})
+            good = await self.post("login", {"username": "clerk", "password": "s3cret-pw"})
+            out = await self.post("logout", {})
+            exists = await self.async_client.get("/api/auth/check-user-exists/")
+            return first, second, again, bad, good, out, exists
+
+        first, second, again, bad, good, out, exists = async_to_sync(scenario)()
+        self.assertEqual((first.status_code, first.json()["user"]["is_superuser"]), (201, True))
+        self.assertEqual((second.status_code, second.json()["user"]["is_superuser"]), (201, False))
+        self.assertEqual(again.status_code, 409)
+        self.assertEqual(bad.status_code, 401)
+        self.assertEqual((good.status_code, good.json()["user"]["username"]), (200, "clerk"))
+        self.assertIn("sessionid", good.cookies)
+        self.assertEqual(out.json()["message"], "Logged out.")
+        self.assertEqual(exists.json()["user_count"], 2)
+        self.assertTrue(get_user_model().objects.get(username="clerk").check_password("s3cret-pw"))
+
+    @override_settings(AUTHENTICATION_BACKENDS=["accounts.tests.SuspendedUsernamesBackend"])
+    def test_login_goes_through_the_configured_backends(self):
+        User = get_user_model()
+        User.objects.create_user("suspended-clerk", password="pw")
+        User.objects.create_user("inactive", password="pw", is_active=False)
+        failures, threads = [], set()
+
+        def record(sender, credentials, **kwargs):
+            failures.append(credentials["username"])
+            threads.add(threading.current_thread().name.split("_")[0])
+
+        user_login_failed.connect(record)
+        self.addCleanup(user_login_failed.disconnect, record)
+        for username in ("suspended-clerk", "inactive", "nobody"):
+            response = async_to_sync(self.post)("login", {"username": username, "password": "pw"})
+            self.assertEqual(response.status_code, 401, username)
+        self.assertEqual(failures, ["suspended-clerk", "inactive", "nobody"])
+        # authenticate() ran in the bounded hasher pool, not the sync_to_async executor.
+        self.assertEqual(threads, {"hasher"})
+
+    def test_validate_admin(self):
+        User = get_user_model()
+        User.objects.create_superuser("admin", "admin@example.com", "pw")
+        User.objects.create_user("clerk", password="pw")
+        cases = (
+            ({"username": "admin@example.com", "password": "pw"}, 200),
+            ({"username": "admin", "password": "wrong"}, 401),
+            ({"username": "clerk", "password": "pw"}, 403),
+            ({"username": "admin"}, 400),
+        )
+        for body, status in cases:
+            self.assertEqual(async_to_sync(self.post)("validate-admin", body).status_code, status, body)
+
+
+class BootstrapStateTests(TransactionTestCase):
+    def setUp(self):
+        cache.delete(bootstrap.CACHE_KEY)
+
+    def cached(self):
+        return cache.get(bootstrap.CACHE_KEY)
+
+    def test_state_is_cached_until_users_change(self):
+        self.assertEqual(bootstrap.get_bootstrap_state(), {"users_exist": False, "user_count": 0, "superadmin_present": False})
+        with CaptureQueriesContext(connection) as ctx:
+            bootstrap.get_bootstrap_state()
+        self.assertEqual(ctx.captured_queries, [])
+
+        user = get_user_model().objects.create_user("clerk", password="pw")
+        self.assertIsNone(self.cached())
+        self.assertEqual(bootstrap.get_bootstrap_state()["user_count"], 1)
+
+        # A login only writes last_login, which leaves the state alone.
+        user.last_login = user.date_joined
+        user.save(update_fields=["last_login"])
+        self.assertIsNotNone(self.cached())
+
+        user.is_superuser = True
+        user.save(update_fields=["is_superuser"])
+        self.assertIsNone(self.cached())
+        self.assertTrue(bootstrap.get_bootstrap_state()["superadmin_present"])
+
+        user.delete()
+        self.assertIsNone(self.cached())
+        self.assertFalse(bootstrap.get_bootstrap_state()["users_exist"])
+
+    def test_only_the_first_user_is_promoted(self):
+        first = bootstrap.register_user("first", "first@example.com", make_password("pw"))
+        self.assertTrue(first.is_superuser and first.is_staff)
+        # A stale "no users yet" state must not promote anyone else.
+        empty = {"users_exist": False, "user_count": 0, "superadmin_present": False}
+        with mock.patch("accounts.bootstrap.get_bootstrap_state", return_value=empty):
+            second = bootstrap.register_user("second", "", make_password("pw"))
+        self.assertFalse(second.is_superuser or second.is_staff)
+        self.assertEqual(list(get_user_model().objects.filter(is_superuser=True).values_list("username", flat=True)), ["first"])
@@ -1,10 +1,14 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Under ASGI the async-native views avoid a thread hop per request.
+auth_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("register/", views.register, name="register"),
-    path("login/", views.login, name="login"),
-    path("logout/", views.logout, name="logout"),
-    path("validate-admin/", views.validate_admin, name="validate_admin"),
-    path("check-user-exists/", views.check_user_exists, name="check_user_exists"),
+    path("register/", auth_views.register, name="register"),
+    path("login/", auth_views.login, name="login"),
+    path("logout/", auth_views.logout, name="logout"),
+    path("validate-admin/", auth_views.validate_admin, name="validate_admin"),
+    path("check-user-exists/", auth_views.check_user_exists, name="check_user_exists"),
 ]
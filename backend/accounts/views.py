@@ -1,9 +1,12 @@
 import json
 from django.contrib.auth import authenticate, get_user_model, login as auth_login, logout as auth_logout
+from django.contrib.auth.hashers import make_password
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
+from .bootstrap import get_bootstrap_state, register_user
+
 
 def _json_error(message, status=400):
     return JsonResponse({"success": False, "message": message}, status=status)
@@ -34,16 +37,9 @@ def register(request):
     if User.objects.filter(username=username).exists():
         return _json_error("Username already exists.", status=409)
 
-    first_user = User.objects.count() == 0
-    user = User.objects.create_user(
-        username=username,
-        email=email,
-        password=password,
-        is_staff=first_user,
-        is_superuser=first_user,
-    )
+    user = register_user(username, email, make_password(password))
 
-    role_note = " (promoted to superadmin)" if first_user else ""
+    role_note = " (promoted to superadmin)" if user.is_superuser else ""
     return JsonResponse(
         {
             "success": True,
@@ -135,10 +131,10 @@ def validate_admin(request):
 @csrf_exempt
 def check_user_exists(request):
     """Check if any users exist in the system."""
-    User = get_user_model()
-    user_count = User.objects.count()
+    state = get_bootstrap_state()
     return JsonResponse({
         "success": True,
-        "users_exist": user_count > 0,
-        "user_count": user_count,
+        "users_exist": state["users_exist"],
+        "user_count": state["user_count"],
+        "superadmin_present": state["superadmin_present"],
     })
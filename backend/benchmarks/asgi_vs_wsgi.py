@@ -0,0 +1,158 @@
+"""Compare the auth API under uvicorn (async views) and gunicorn (sync views).
+
+Starts each server against the configured database, registers a throwaway
+user, then drives ``login`` and ``check-user-exists`` with concurrent
+keep-alive clients and prints requests/sec and latency percentiles as JSON.
+
+    python benchmarks/asgi_vs_wsgi.py --concurrency 32 --duration 15
+
+Requires ``uvicorn`` and ``gunicorn`` (not in requirements.txt; install them in
+the benchmark environment only).
+"""
+
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    "wsgi": lambda port, workers: [
+        sys.executable, "-m", "gunicorn", "visorhr.wsgi:application",
+        "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--threads", "4",
+        "--worker-class", "gthread", "--log-level", "warning",
+    ],
+    "asgi": lambda port, workers: [
+        sys.executable, "-m", "uvicorn", "visorhr.asgi:application",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ],
+}
+
+ENDPOINTS = {
+    "check_user_exists": ("GET", "/api/auth/check-user-exists/", None),
+    "login": ("POST", "/api/auth/login/", "credentials"),
+}
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", ENDPOINTS["check_user_exists"][1])
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not come up")
+
+
+def request(conn, method, path, body):
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    started = time.perf_counter()
+    conn.request(method, path, body=body, headers=headers)
+    response = conn.getresponse()
+    response.read()
+    return response.status, time.perf_counter() - started
+
+
+def run_load(port, method, path, body, concurrency, duration):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        nonlocal errors
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local, failed = [], 0
+        while time.monotonic() < stop_at:
+            try:
+                status, elapsed = request(conn, method, path, body)
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            if status >= 400:
+                failed += 1
+            local.append(elapsed)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2) if latencies else None
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+    }
+
+
+def bench_server(kind, args, credentials):
+    env = dict(os.environ, DJANGO_ASYNC_VIEWS="1" if kind == "asgi" else "0")
+    proc = subprocess.Popen(SERVERS[kind](args.port, args.workers), cwd=BACKEND_DIR, env=env)
+    try:
+        wait_for(args.port)
+        conn = http.client.HTTPConnection("127.0.0.1", args.port)
+        request(conn, "POST", "/api/auth/register/", credentials)
+        conn.close()
+        results = {}
+        for name in args.endpoints:
+            method, path, body = ENDPOINTS[name]
+            body = credentials if body == "credentials" else None
+            results[name] = run_load(args.port, method, path, body, args.concurrency, args.duration)
+        return results
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", nargs="+", choices=sorted(SERVERS), default=["wsgi", "asgi"])
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per endpoint.")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes.")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    # One user per run; registration is idempotent enough (409 on reruns is fine).
+    credentials = json.dumps({"username": f"bench-{uuid.uuid4().hex[:8]}", "password": "bench-pass-123"})
+    report = {
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "workers": args.workers,
+        "results": {kind: bench_server(kind, args, credentials) for kind in args.servers},
+    }
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Measure the per-request cost of ``visorhr.middleware.MetricsMiddleware``.
+
+Drives the full WSGI handler in-process (no network) with and without the
+middleware, alternating rounds so both see the same machine state, and prints
+the median per-request time and the relative overhead as JSON. Cheap endpoints
+are the worst case for relative overhead.
+
+    DJANGO_DB_ENGINE=sqlite python benchmarks/metrics_overhead.py --requests 2000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "visorhr.settings")
+
+PATHS = {
+    "db_health": "/api/health/db/",
+    "no_db": "/api/auth/login/",  # GET is rejected by require_POST before any query
+}
+METRICS_MIDDLEWARE = "visorhr.middleware.MetricsMiddleware"
+
+
+def make_handler(with_metrics):
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.test.utils import override_settings
+
+    middleware = [m for m in settings.MIDDLEWARE if m != METRICS_MIDDLEWARE]
+    if with_metrics:
+        middleware.insert(0, METRICS_MIDDLEWARE)
+    with override_settings(MIDDLEWARE=middleware):
+        return WSGIHandler()
+
+
+def time_requests(handler, path, count):
+    environ = {"PATH_INFO": path, "HTTP_HOST": "localhost"}
+    setup_testing_defaults(environ)
+    started = time.perf_counter()
+    for _ in range(count):
+        response = handler(dict(environ), lambda status, headers: None)
+        b"".join(response)
+        response.close()
+    return (time.perf_counter() - started) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per round.")
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    import logging
+
+    import django
+
+    django.setup()
+    logging.disable(logging.WARNING)  # 405s would otherwise log every request
+
+    handlers = {"baseline": make_handler(False), "metrics": make_handler(True)}
+    report = {"requests_per_round": args.requests, "rounds": args.rounds, "results": {}}
+    for name, path in PATHS.items():
+        samples = {key: [] for key in handlers}
+        for key, handler in handlers.items():
+            time_requests(handler, path, min(200, args.requests))  # warm up
+        for _ in range(args.rounds):
+            for key, handler in handlers.items():
+                samples[key].append(time_requests(handler, path, args.requests))
+        baseline = statistics.median(samples["baseline"])
+        measured = statistics.median(samples["metrics"])
+        report["results"][name] = {
+            "baseline_us": round(baseline * 1e6, 1),
+            "metrics_us": round(measured * 1e6, 1),
+            "overhead_us": round((measured - baseline) * 1e6, 1),
+            "overhead_pct": round((measured / baseline - 1) * 100, 2),
+        }
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""Reproducible benchmark suite for the auth and employee endpoints.
+
+``run`` creates a throwaway database (Django's test database: a temp SQLite
+file, or ``test_<MYSQL_DATABASE>`` on MySQL), seeds synthetic employees and
+users, drives each scenario through the full Django stack in-process and writes
+a JSON report with throughput, latency percentiles and DB queries per request.
+``compare`` diffs two reports and exits non-zero when a scenario regressed.
+
+    python benchmarks/suite.py run --engine sqlite --employees 5000 --output bench.json
+    python benchmarks/suite.py compare main.json bench.json --threshold 0.15
+
+Query counts are deterministic, so they catch N+1 regressions even on a noisy
+machine; timings are best compared on the same host.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+PASSWORD = "bench-pass-123"
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed, queries):
+    latencies = sorted(latencies)
+    ms = lambda value: None if value is None else round(value * 1000, 3)  # noqa: E731
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "mean_ms": ms(statistics.fmean(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p90_ms": ms(percentile(latencies, 0.90)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1]) if latencies else None,
+        "queries_per_request": round(queries / len(latencies), 2) if latencies else None,
+    }
+
+
+def make_jpeg(width=1200, height=900):
+    from PIL import Image
+
+    image = Image.new("RGB", (width, height))
+    pixels = image.load()
+    for x in range(0, width, 8):
+        for y in range(0, height, 8):
+            pixels[x, y] = ((x * 7) % 256, (y * 5) % 256, (x + y) % 256)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def seed(employees, seed_value):
+    from django.contrib.auth import get_user_model
+    from django.db import connection, transaction
+
+    from employee.models import EmpPersonal, allocate_change_seq
+
+    if EmpPersonal._meta.db_table not in connection.introspection.table_names():
+        # EMP_PERSONAL is unmanaged, so migrate does not create it in the test database.
+        with connection.schema_editor() as editor:
+            editor.create_model(EmpPersonal)
+
+    User = get_user_model()
+    User.objects.create_superuser("bench-admin", "admin@example.com", PASSWORD)
+    User.objects.create_user("bench-user", "user@example.com", PASSWORD)
+
+    from employee import synthetic
+
+    # Same rows as ``manage.py generate_employees --seed <seed>``, search keys included.
+    with transaction.atomic():
+        change_seq = allocate_change_seq(connection.alias)
+    for block, first_index, size in synthetic.blocks(employees):
+        synthetic.generate_block(seed_value, block, first_index, size, first_emp_id=first_index + 1, change_seq=change_seq)
+
+
+def scenarios(photo_bytes):
+    """name -> (request function, expected status, login as, default iteration share)."""
+    from employee import synthetic
+
+    counter = iter(range(10**9))
+    lock = threading.Lock()
+
+    def unique():
+        with lock:
+            return next(counter)
+
+    def login(client):
+        return client.post(
+            "/api/auth/login/",
+            json.dumps({"username": "bench-user", "password": PASSWORD}),
+            content_type="application/json",
+        )
+
+    def employee_payload(n):
+        # A complete, valid record, as the frontend form would send it.
+        row = synthetic.build_row(10**8 + n, random.Random(n))
+        row["date_of_birth"] = row["date_of_birth"].isoformat()
+        return {name: value for name, value in row.items() if value is not None}
+
+    def save_json(client):
+        return client.post("/api/employee/save/", json.dumps(employee_payload(unique())), content_type="application/json")
+
+    def save_photo(client):
+        n = unique()
+        photo = io.BytesIO(photo_bytes)
+        photo.name = f"bench-{n}.jpg"
+        return client.post("/api/employee/save/", {**employee_payload(n), "emp_photo": photo})
+
+    return {
+        "check_user_exists": (lambda client: client.get("/api/auth/check-user-exists/"), 200, None, 1.0),
+        "login": (login, 200, None, 0.1),  # PBKDF2 dominates; fewer iterations keep runs short
+        "save_employee_json": (save_json, 201, "bench-user", 1.0),
+        "save_employee_photo": (save_photo, 201, "bench-user", 0.5),
+        "api_search": (lambda client: client.get("/api/employee/search/?q=Rahim"), 200, "bench-user", 1.0),
+        "admin_changelist": (lambda client: client.get("/admin/employee/emppersonal/"), 200, "bench-admin", 0.5),
+        "admin_search": (lambda client: client.get("/admin/employee/emppersonal/?q=Karim+Hossain"), 200, "bench-admin", 0.5),
+    }
+
+
+def run_scenario(request, expected_status, username, iterations, warmup, concurrency):
+    from django.test import Client
+
+    from visorhr.metrics import registry
+
+    def make_client():
+        client = Client()
+        if username:
+            from django.contrib.auth import get_user_model
+
+            client.force_login(get_user_model().objects.get(username=username))
+        return client
+
+    warm_client = make_client()
+    for _ in range(warmup):
+        request(warm_client)
+
+    registry.reset()
+    latencies, errors = [], [0]
+    results_lock = threading.Lock()
+    per_worker = [iterations // concurrency + (1 if i < iterations % concurrency else 0) for i in range(concurrency)]
+
+    def worker(count):
+        client = make_client()
+        local, failed = [], 0
+        for _ in range(count):
+            started = time.perf_counter()
+            response = request(client)
+            local.append(time.perf_counter() - started)
+            if response.status_code != expected_status:
+                failed += 1
+        with results_lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        worker(iterations)
+    else:
+        threads = [threading.Thread(target=worker, args=(count,)) for count in per_worker]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    queries = sum(stats["db_queries"] for stats in registry.snapshot().values())
+    return summarize(latencies, errors[0], elapsed, queries)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    if args.engine == "sqlite":
+        os.environ["DJANGO_DB_ENGINE"] = "sqlite"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "visorhr.settings")
+    media_root = tempfile.mkdtemp(prefix="visorhr-bench-media-")
+
+    import logging
+
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.MEDIA_ROOT = media_root
+    settings.DEBUG = False  # no per-query logging in connection.queries
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+    logging.disable(logging.WARNING)
+
+    from django.db import connection
+
+    from employee.derivatives import shutdown_executor
+
+    if connection.vendor == "sqlite":
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(tempfile.mkdtemp(prefix="visorhr-bench-"), "bench.sqlite3")
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        seed_started = time.perf_counter()
+        seed(args.employees, args.seed)
+        seed_seconds = time.perf_counter() - seed_started
+
+        photo_bytes = make_jpeg()
+        selected = scenarios(photo_bytes)
+        if args.scenarios:
+            selected = {name: selected[name] for name in args.scenarios}
+        results = {}
+        for name, (request, expected_status, username, share) in selected.items():
+            iterations = max(1, int(args.iterations * share))
+            results[name] = run_scenario(request, expected_status, username, iterations, args.warmup, args.concurrency)
+            print(f"{name}: {results[name]['rps']} req/s, p95 {results[name]['p95_ms']} ms", file=sys.stderr)
+    finally:
+        shutdown_executor(wait=True)
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "engine": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+            "employees": args.employees,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "seed_seconds": round(seed_seconds, 2),
+        },
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+# (metric, higher is better)
+COMPARED_METRICS = (("rps", True), ("p50_ms", False), ("p95_ms", False), ("queries_per_request", False))
+
+
+def compare(args):
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    with open(args.candidate) as fh:
+        candidate = json.load(fh)
+
+    regressions = []
+    print(f"{'scenario':<22}{'metric':<22}{'baseline':>12}{'candidate':>12}{'change':>10}")
+    for name, new in candidate["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            before, after = old.get(metric), new.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if higher_is_better else change
+            # Any extra query per request is a regression; timings get the noise threshold.
+            limit = 0 if metric == "queries_per_request" else args.threshold
+            flag = ""
+            if worse > limit:
+                flag = "  REGRESSION"
+                regressions.append((name, metric))
+            print(f"{name:<22}{metric:<22}{before:>12}{after:>12}{change:>+10.1%}{flag}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}.")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Seed a throwaway database and run the scenarios.")
+    run_parser.add_argument("--engine", choices=("sqlite", "mysql"), default="sqlite")
+    run_parser.add_argument("--employees", type=int, default=5000, help="Synthetic EmpPersonal rows to seed.")
+    run_parser.add_argument("--iterations", type=int, default=300, help="Requests per scenario (scaled per scenario).")
+    run_parser.add_argument("--warmup", type=int, default=5)
+    run_parser.add_argument("--concurrency", type=int, default=1, help="Client threads (keep 1 on SQLite).")
+    run_parser.add_argument("--seed", type=int, default=1234)
+    run_parser.add_argument("--scenarios", nargs="+", help="Run only these scenarios.")
+    run_parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+
+    compare_parser = sub.add_parser("compare", help="Diff two reports; exit 1 on regressions.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative slowdown (default 15%%).")
+
+    args = parser.parse_args()
+    return run(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
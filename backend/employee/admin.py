@@ -1,30 +1,45 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
 from django.utils import timezone
 
-from .models import EmpPersonal
+from . import audit, duplicates
+from .changelist import EstimatedCountPaginator, KeysetChangeList
+from .derivatives import schedule_derivatives
+from .exports import EXPORT_DEFAULT_FIELDS, export_response
+from .models import EMPLOYEE_REQUIRED_FIELDS, SIDE_FIELDS, SIDE_TABLES, EmpAuditEntry, EmpPersonal
+from .printing import id_card_response
+from .search import search_employees
+
+
+class EmpPersonalForm(forms.ModelForm):
+    """Edits the side-table columns too; on EmpPersonal they are properties, not model fields."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk is not None:
+            for name in SIDE_FIELDS:
+                if name in self.fields:
+                    self.initial.setdefault(name, getattr(self.instance, name))
+
+    def _post_clean(self):
+        super()._post_clean()
+        # Only changed values, so untouched side tables are neither loaded nor written.
+        for name in self.changed_data:
+            if name in SIDE_FIELDS:
+                setattr(self.instance, name, self.cleaned_data[name])
+
+
+_side_form_fields = {
+    name: SIDE_TABLES[relation]._meta.get_field(name).formfield() for name, relation in SIDE_FIELDS.items()
+}
+EmpPersonalForm.base_fields.update(_side_form_fields)
+EmpPersonalForm.declared_fields.update(_side_form_fields)
 
 
 @admin.register(EmpPersonal)
 class EmpPersonalAdmin(admin.ModelAdmin):
-    required_fields = [
-        "emp_code",
-        "emp_name",
-        "date_of_birth",
-        "sex",
-        "religion",
-        "blood_group",
-        "marital_status",
-        "nationality",
-        "contact_no",
-        "national_id",
-        "present_vill",
-        "present_dist",
-        "present_address",
-        "parmanent_vill",
-        "parmanent_dist",
-        "permanent_address",
-        "emp_photo",
-    ]
+    form = EmpPersonalForm
+    required_fields = EMPLOYEE_REQUIRED_FIELDS
     list_display = ("emp_id", "emp_code", "emp_name", "bang_emp_name", "father_name", "mother_name", "national_id")
     search_fields = (
         "emp_code",
@@ -37,7 +52,15 @@ class EmpPersonalAdmin(admin.ModelAdmin):
         "smart_id",
     )
 
+    # Each list filter is backed by an index (ensure_employee_indexes); counts are
+    # estimated/capped and pages are keyset-addressed, see employee/changelist.py.
+    list_filter = ("present_dist", "sex", "religion", "contractual")
+    ordering = ("-emp_id",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     readonly_fields = ("photo_added_date", "updated_date")
+    actions = ("export_csv", "export_xlsx", "print_id_cards")
 
     fieldsets = (
         (
@@ -158,11 +181,61 @@ class EmpPersonalAdmin(admin.ModelAdmin):
     )
 
     def save_model(self, request, obj, form, change):
+        stamped = ["updated_by", "updated_date"]
         if not obj.photo_added_by:
             obj.photo_added_by = request.user.id
+            stamped.append("photo_added_by")
         obj.updated_date = timezone.now().date()
         obj.updated_by = request.user.id
-        super().save_model(request, obj, form, change)
+        if change:
+            # Rewrite only the columns the form changed, not the whole row.
+            columns = {field.name for field in obj._meta.concrete_fields}
+            obj.save(update_fields=[name for name in form.changed_data if name in columns] + stamped)
+        else:
+            super().save_model(request, obj, form, change)
+        # Read the new values back from obj: uploads only get their stored name on save.
+        after = {name: getattr(obj, name) for name in form.changed_data}
+        audit.record(
+            obj.emp_id,
+            audit.diff(form.initial if change else {}, after, form.changed_data),
+            user_id=request.user.id,
+            action=EmpAuditEntry.ACTION_UPDATE if change else EmpAuditEntry.ACTION_CREATE,
+            source=audit.SOURCE_ADMIN,
+        )
+        schedule_derivatives(
+            obj,
+            photo="emp_photo" in form.changed_data,
+            signature="emp_signature" in form.changed_data,
+        )
+        if set(form.changed_data) & set(duplicates.BLOCKING_FIELDS):
+            self._warn_duplicates(request, obj)
+
+    def _warn_duplicates(self, request, obj):
+        found = duplicates.candidates_for(obj, limit=5)
+        if found:
+            listed = ", ".join(f"{match['emp_code'] or match['emp_id']} ({match['score']:.2f})" for match in found)
+            messages.warning(request, f"Possible duplicate of: {listed}.")
+
+    @admin.action(description="Export selected employees (CSV)")
+    def export_csv(self, request, queryset):
+        return export_response(queryset, EXPORT_DEFAULT_FIELDS, "csv")
+
+    @admin.action(description="Export selected employees (XLSX)")
+    def export_xlsx(self, request, queryset):
+        return export_response(queryset, EXPORT_DEFAULT_FIELDS, "xlsx")
+
+    @admin.action(description="Print ID cards for selected employees (PDF)")
+    def print_id_cards(self, request, queryset):
+        return id_card_response(queryset, "pdf", "a4")
+
+    def get_search_results(self, request, queryset, search_term):
+        # search_fields only drives the search box; matching uses EMP_SEARCH_KEY.
+        if not search_term.strip():
+            return queryset, False
+        return search_employees(search_term, queryset), False
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
 
     def get_form(self, request, obj=None, **kwargs):
         form = super().get_form(request, obj, **kwargs)
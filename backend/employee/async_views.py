@@ -0,0 +1,43 @@
+"""Async-native employee views, routed when ``settings.ASYNC_VIEWS`` is on."""
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError
+from django.http import JsonResponse
+
+from visorhr.async_utils import aget_user, async_csrf_exempt, async_require_POST
+
+from .idempotency import idempotent
+from .schema import EMPLOYEE_SCHEMA
+from .views import (
+    _create_employee,
+    _duplicate_employee_response,
+    _employee_saved_response,
+    _invalid_employee_response,
+    _possible_duplicates,
+    _read_employee_payload,
+)
+
+
+@async_csrf_exempt
+@async_require_POST
+@idempotent
+async def save_employee(request):
+    user = await aget_user(request)
+    if not user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    # Multipart parsing streams files to disk and the model save writes them to
+    # storage; both are blocking I/O, so they run on the sync thread.
+    payload = await sync_to_async(_read_employee_payload)(request)
+    if isinstance(payload, JsonResponse):
+        return payload
+    data, files = payload
+
+    cleaned, errors = EMPLOYEE_SCHEMA.validate(data)
+    if errors:
+        return _invalid_employee_response(errors)
+    try:
+        emp = await sync_to_async(_create_employee)(cleaned, files, user.id)
+    except IntegrityError:
+        return _duplicate_employee_response()
+    return _employee_saved_response(emp, await sync_to_async(_possible_duplicates)(emp))
@@ -0,0 +1,166 @@
+"""Write-behind, field-level audit trail for employee changes.
+
+Write paths call ``record`` with the diff they already know about (the PATCH
+view compares old and new values anyway, the admin has ``form.changed_data``).
+Once the transaction commits, the entry is appended to an in-process buffer.
+A background thread writes the buffer to EMP_AUDIT with one ``bulk_create``
+every ``EMPLOYEE_AUDIT_FLUSH_INTERVAL`` seconds, or sooner once
+``EMPLOYEE_AUDIT_BATCH_SIZE`` entries are waiting. The save itself only pays
+for building the diff. If more than ``EMPLOYEE_AUDIT_MAX_PENDING`` entries pile
+up (e.g. the flusher is behind), the request that adds one flushes inline.
+An interval of 0 writes every entry as soon as its transaction commits.
+
+Entries still buffered when a process is killed are lost; a normal interpreter
+exit flushes them.
+"""
+
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.core.files import File
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+from .models import EmpAuditEntry
+
+logger = logging.getLogger(__name__)
+
+SOURCE_API = "api"
+SOURCE_ADMIN = "admin"
+
+DEFAULT_HISTORY_LIMIT = 50
+MAX_HISTORY_LIMIT = 500
+
+
+def _flush_interval():
+    return getattr(settings, "EMPLOYEE_AUDIT_FLUSH_INTERVAL", 2.0)
+
+
+def _batch_size():
+    return getattr(settings, "EMPLOYEE_AUDIT_BATCH_SIZE", 500)
+
+
+def _max_pending():
+    return getattr(settings, "EMPLOYEE_AUDIT_MAX_PENDING", 10_000)
+
+
+def _jsonable(value):
+    if isinstance(value, File):
+        return value.name or None
+    return value
+
+
+def diff(before, after, fields=None):
+    """``{field: [old, new]}`` for the ``fields`` (default: all keys of ``after``) whose value differs."""
+    changes = {}
+    for name in after if fields is None else fields:
+        old, new = _jsonable(before.get(name)), _jsonable(after.get(name))
+        if old != new:
+            changes[name] = [old, new]
+    return changes
+
+
+class AuditBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = []
+        self._thread = None
+
+    def add(self, entry):
+        inline = _flush_interval() <= 0
+        with self._lock:
+            self._pending.append(entry)
+            pending = len(self._pending)
+            if not inline and (self._thread is None or not self._thread.is_alive()):
+                self._start()
+        if inline or pending >= _max_pending():
+            self.flush()
+        elif pending >= _batch_size():
+            self._wakeup.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write every buffered entry now; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                entries, self._pending = self._pending, []
+            if not entries:
+                return 0
+            try:
+                EmpAuditEntry.objects.bulk_create(
+                    [
+                        EmpAuditEntry(
+                            emp_id=emp_id, action=action, source=source, changed_by=user_id, changed_at=at, changes=changes
+                        )
+                        for emp_id, action, source, user_id, at, changes in entries
+                    ],
+                    batch_size=_batch_size(),
+                )
+            except DatabaseError:
+                with self._lock:
+                    # Keep them for the next attempt, up to the pending limit.
+                    room = max(0, _max_pending() - len(self._pending))
+                    kept = entries[-room:] if room else []
+                    self._pending[:0] = kept
+                logger.exception("Writing %d employee audit entries failed; %d dropped.", len(entries), len(entries) - len(kept))
+                return 0
+            return len(entries)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="employee-audit-flusher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(_flush_interval())
+            self._wakeup.clear()
+            self._background_flush()
+
+    def _background_flush(self):
+        if not self.pending():
+            # Nothing to write, so no connection was opened and there is none to close.
+            return
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Employee audit flush failed.")
+        finally:
+            # Hand the thread's connection back (to the pool, where configured).
+            connections.close_all()
+
+
+_buffer = AuditBuffer()
+atexit.register(_buffer.flush)
+
+
+def flush():
+    return _buffer.flush()
+
+
+def record(emp_id, changes, user_id=None, action=EmpAuditEntry.ACTION_UPDATE, source=SOURCE_API):
+    """Queue an audit entry for ``emp_id``; it is buffered only if the current transaction commits."""
+    if not changes:
+        return
+    entry = (emp_id, action, source, user_id, timezone.now(), changes)
+    transaction.on_commit(lambda: _buffer.add(entry))
+
+
+def history(emp_id, before=None, limit=DEFAULT_HISTORY_LIMIT):
+    """Return ``(entries, next_cursor)``: ``emp_id``'s audit entries, newest first, older than ``before``."""
+    # Entries this process still holds would otherwise be missing from its own reads.
+    _buffer.flush()
+    queryset = EmpAuditEntry.objects.filter(emp_id=emp_id)
+    if before is not None:
+        queryset = queryset.filter(id__lt=before)
+    entries = list(queryset.order_by("-id")[: limit + 1])
+    if len(entries) > limit:
+        entries = entries[:limit]
+        return entries, entries[-1].id
+    return entries, None
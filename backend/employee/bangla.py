@@ -0,0 +1,143 @@
+"""Normalization and phonetic keys for Bangla (and romanized Bangla) names.
+
+The same name can be typed with several Unicode encodings: precomposed or
+nukta-decomposed letters (ড়/ড + ়), stray ZWJ/ZWNJ from some keyboards, the
+e-kar typed before its consonant in legacy visual-order input, khanda-ta as
+ত + hasanta, and Bengali digits. ``normalize`` maps all of these to one form;
+``phonetic_key`` goes further and reduces a name to a consonant skeleton that
+romanized input ("Rahim", "Mohammad") maps to as well.
+"""
+
+import re
+import unicodedata
+
+_INVISIBLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff"))
+_BENGALI_DIGITS = {0x09E6 + i: str(i) for i in range(10)}
+
+_CONSONANT = "[\u0995-\u09b9\u09dc-\u09df]"
+_CLUSTER = f"{_CONSONANT}\u09bc?(?:\u09cd{_CONSONANT}\u09bc?)*"
+# e-kar / ai-kar typed before the consonant cluster it belongs to.
+_PRE_KAR = re.compile(f"(^|[^\u0995-\u09b9\u09bc\u09cd\u09dc-\u09df])([\u09c7\u09c8])({_CLUSTER})")
+# Khanda-ta typed as ta + hasanta (the ZWJ that usually follows is already gone).
+_KHANDA_TA = re.compile("\u09a4\u09cd(?![\u0995-\u09b9\u09dc-\u09df])")
+_SPACES = re.compile(r"\s+")
+
+# Bengali letter -> phonetic class. Vowels, signs and hasanta map to nothing.
+_BN_PHONETIC = {}
+for _letters, _code in (
+    ("কখ", "K"),
+    ("গঘ", "G"),
+    ("ঙংঞনণ", "N"),
+    ("চছ", "C"),
+    ("জঝয", "J"),
+    ("টঠতথৎ", "T"),
+    ("ডঢদধ", "D"),
+    ("পফ", "P"),
+    ("বভ", "B"),
+    ("ম", "M"),
+    ("র", "R"),
+    ("ল", "L"),
+    ("শষস", "S"),
+    ("হ", "H"),
+):
+    for _ch in _letters:
+        _BN_PHONETIC[_ch] = _code
+# Nukta letters (after normalization these are base letter + U+09BC); antastha
+# ya is a glide and is dropped, like romanized "y".
+_BN_NUKTA = {"ড": "R", "ঢ": "R", "য": ""}
+
+# Romanized spellings, longest first so digraphs win.
+_LATIN_PHONETIC = (
+    ("chh", "C"),
+    ("kh", "K"),
+    ("gh", "G"),
+    ("ng", "N"),
+    ("ch", "C"),
+    ("jh", "J"),
+    ("th", "T"),
+    ("dh", "D"),
+    ("ph", "P"),
+    ("bh", "B"),
+    ("sh", "S"),
+    ("rh", "R"),
+    ("k", "K"),
+    ("q", "K"),
+    ("c", "K"),
+    ("g", "G"),
+    ("n", "N"),
+    ("j", "J"),
+    ("z", "J"),
+    ("t", "T"),
+    ("d", "D"),
+    ("p", "P"),
+    ("f", "P"),
+    ("b", "B"),
+    ("v", "B"),
+    ("m", "M"),
+    ("r", "R"),
+    ("l", "L"),
+    ("s", "S"),
+    ("x", "KS"),
+    ("h", "H"),
+)
+
+
+def normalize(value):
+    """Canonical form of a Bangla/English name for equality and prefix matching."""
+    if not value:
+        return ""
+    text = unicodedata.normalize("NFC", str(value)).translate(_INVISIBLE)
+    text = _KHANDA_TA.sub("\u09ce", text)
+    text = _PRE_KAR.sub(r"\1\3\2", text)
+    # Re-compose split two-part vowels (ে + া -> ো) after reordering.
+    text = unicodedata.normalize("NFC", text).translate(_BENGALI_DIGITS)
+    return _SPACES.sub(" ", text).strip().casefold()
+
+
+def _bengali_skeleton(text):
+    out = []
+    chars = list(text)
+    for i, ch in enumerate(chars):
+        if ch == "\u09bc":
+            continue
+        if i + 1 < len(chars) and chars[i + 1] == "\u09bc" and ch in _BN_NUKTA:
+            out.append(_BN_NUKTA[ch])
+        elif ch in _BN_PHONETIC:
+            out.append(_BN_PHONETIC[ch])
+        elif ch.isascii() and ch.isalpha():
+            out.append(_latin_skeleton(ch))
+    return "".join(out)
+
+
+def _latin_skeleton(text):
+    out = []
+    i = 0
+    while i < len(text):
+        for spelling, code in _LATIN_PHONETIC:
+            if text.startswith(spelling, i):
+                out.append(code)
+                i += len(spelling)
+                break
+        else:
+            i += 1  # vowels and anything unmapped
+    return "".join(out)
+
+
+def phonetic_key(value):
+    """Consonant-class skeleton shared by Bangla script and its romanizations.
+
+    ``phonetic_key("রহিম উদ্দিন") == phonetic_key("Rahim Uddin") == "RHMDN"``
+    """
+    text = normalize(value)
+    if not text:
+        return ""
+    if has_bengali(text):
+        skeleton = _bengali_skeleton(text)
+    else:
+        skeleton = _latin_skeleton(text)
+    # Doubled consonants (conjuncts, "dd", "mm") collapse to one.
+    return re.sub(r"(.)\1+", r"\1", skeleton)
+
+
+def has_bengali(value):
+    return any("\u0980" <= ch <= "\u09ff" for ch in str(value or ""))
@@ -0,0 +1,135 @@
+"""Admin changelist for EMP_PERSONAL that stays fast as the table grows.
+
+* Counts: the unfiltered total comes from table statistics on MySQL (InnoDB's
+  ``COUNT(*)`` scans the whole index); filtered counts stop at ``COUNT_CAP``.
+* Columns: only the ``list_display`` columns are selected.
+* Pages: in the default ``-emp_id`` order, pages are addressed by
+  ``?after=<emp_id>`` / ``?before=<emp_id>`` instead of ``OFFSET``, so the
+  last page costs the same as the first. Sorting by another column falls back
+  to numbered pages.
+"""
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+AFTER_VAR = "after"
+BEFORE_VAR = "before"
+COUNT_CAP = 10_000
+# Below this many rows an exact COUNT(*) is cheap and the statistics are least accurate.
+ESTIMATE_THRESHOLD = 100_000
+
+
+def estimated_row_count(model, using="default"):
+    """Row count from table statistics, or None where the backend has none."""
+    connection = connections[using]
+    if connection.vendor != "mysql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator whose ``count`` is estimated (unfiltered) or capped at COUNT_CAP (filtered)."""
+
+    count_is_exact = True
+    count_is_estimate = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                self.count_is_exact = False
+                self.count_is_estimate = True
+                return estimate
+        count = queryset[: COUNT_CAP + 1].count()
+        if count > COUNT_CAP:
+            self.count_is_exact = False
+            return COUNT_CAP
+        return count
+
+
+class KeysetChangeList(ChangeList):
+    def __init__(self, request, *args, **kwargs):
+        # ChangeList.__init__ runs the query, so the cursor has to be known first.
+        self.keyset = ORDER_VAR not in request.GET
+        self.after = self._cursor(request, AFTER_VAR)
+        self.before = self._cursor(request, BEFORE_VAR)
+        self.next_page_url = self.previous_page_url = self.first_page_url = None
+        super().__init__(request, *args, **kwargs)
+        for name in (AFTER_VAR, BEFORE_VAR):
+            self.params.pop(name, None)
+
+    @staticmethod
+    def _cursor(request, name):
+        value = request.GET.get(name)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise IncorrectLookupParameters(f"{name} must be an emp_id.")
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        for name in (AFTER_VAR, BEFORE_VAR, PAGE_VAR):
+            lookup_params.pop(name, None)
+        return lookup_params
+
+    def get_queryset(self, request):
+        fields = {field.name for field in self.model._meta.concrete_fields}
+        columns = [name for name in self.list_display if name in fields]
+        return super().get_queryset(request).only(self.model._meta.pk.name, *columns)
+
+    @property
+    def result_count_display(self):
+        count = f"{self.result_count:,}"
+        if self.paginator.count_is_exact:
+            return count
+        return f"about {count}" if self.paginator.count_is_estimate else f"{count}+"
+
+    def get_results(self, request):
+        if not self.keyset:
+            return super().get_results(request)
+
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        per_page = self.list_per_page
+        queryset = self.queryset
+        pk = self.model._meta.pk.name
+        if self.after is not None:
+            rows = list(queryset.filter(**{f"{pk}__lt": self.after})[: per_page + 1])
+            has_next, has_previous = len(rows) > per_page, True
+            rows = rows[:per_page]
+        elif self.before is not None:
+            rows = list(queryset.filter(**{f"{pk}__gt": self.before}).order_by(pk)[: per_page + 1])
+            has_next, has_previous = True, len(rows) > per_page
+            rows = rows[:per_page][::-1]
+        else:
+            rows = list(queryset[: per_page + 1])
+            has_next, has_previous = len(rows) > per_page, False
+            rows = rows[:per_page]
+
+        if has_next and rows:
+            self.next_page_url = self.get_query_string({AFTER_VAR: rows[-1].pk}, [BEFORE_VAR, PAGE_VAR])
+        if has_previous and rows:
+            self.previous_page_url = self.get_query_string({BEFORE_VAR: rows[0].pk}, [AFTER_VAR, PAGE_VAR])
+            self.first_page_url = self.get_query_string(remove=[AFTER_VAR, BEFORE_VAR, PAGE_VAR])
+
+        # A single page holds every match, so its length is the exact count.
+        self.result_count = len(rows) if not (has_next or has_previous) else paginator.count
+        self.show_full_result_count = False
+        self.show_admin_actions = True
+        self.full_result_count = None
+        self.result_list = rows
+        self.can_show_all = False
+        self.multi_page = has_next or has_previous
+        self.paginator = paginator
@@ -0,0 +1,112 @@
+"""Delta sync for EmpPersonal: ``GET /api/employee/changes/?since=<cursor>``.
+
+Every write to EMP_PERSONAL stamps the row's ``change_seq`` from the
+EMP_CHANGE_SEQ counter (``models.allocate_change_seq``), and every delete
+leaves an EmpTombstone stamped the same way. A client keeps the cursor of the
+last change it applied, ``<change_seq>.<emp_id>``, and asks for what came after
+it. Rows written by one statement share a sequence value, so ties are ordered
+by ``emp_id``. A row changed several times is sent once, with its current values.
+
+Reads stop at the counter's committed value. Writers hold the counter row until
+they commit, so every change up to that value is already visible.
+"""
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import EmpChangeSequence, EmpPersonal, EmpTombstone, allocate_change_seq
+from .queries import QueryParamError, select_values
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_SIZE = 5000
+
+
+class CursorExpired(Exception):
+    """The cursor is older than the oldest tombstone kept; the client has to resync from scratch."""
+
+
+def encode_cursor(change_seq, emp_id):
+    return f"{change_seq}.{emp_id}"
+
+
+def parse_cursor(raw):
+    """``(change_seq, emp_id)`` from a ``since`` parameter, or None to start from the beginning."""
+    if raw in (None, ""):
+        return None
+    try:
+        change_seq, emp_id = (int(part) for part in raw.split("."))
+    except ValueError:
+        raise QueryParamError("since must be a next_cursor returned by this endpoint.") from None
+    if change_seq < 0 or emp_id < 0:
+        raise QueryParamError("since must be a next_cursor returned by this endpoint.")
+    return change_seq, emp_id
+
+
+def record_deletion(emp_id, using, change_seq=None):
+    """Leave ``emp_id``'s tombstone, stamped ``change_seq`` if it was allocated before the row was deleted."""
+    if change_seq is None:
+        change_seq = allocate_change_seq(using)
+    EmpTombstone.objects.using(using).create(emp_id=emp_id, change_seq=change_seq, deleted_at=timezone.now())
+
+
+def _counter():
+    return EmpChangeSequence.objects.filter(pk=EmpChangeSequence.SINGLETON).values("value", "pruned_through").first() or {
+        "value": 0,
+        "pruned_through": 0,
+    }
+
+
+def _after(queryset, horizon, cursor):
+    queryset = queryset.filter(change_seq__lte=horizon)
+    if cursor is not None:
+        change_seq, emp_id = cursor
+        # A plain range on change_seq that any backend can seek on, minus the rows already sent.
+        queryset = queryset.filter(change_seq__gte=change_seq).exclude(change_seq=change_seq, emp_id__lte=emp_id)
+    return queryset.order_by("change_seq", "emp_id")
+
+
+def changes_since(cursor, fields, limit=DEFAULT_BATCH_SIZE):
+    """The changes after ``cursor`` (see ``parse_cursor``), oldest first, at most ``limit`` of them.
+
+    Returns a dict with ``changed`` (rows of ``fields`` values, in that order),
+    ``deleted`` (emp_ids), ``next_cursor`` and ``has_more``. Raises CursorExpired
+    when tombstones the client has not seen were pruned.
+    """
+    counter = _counter()
+    if cursor is not None and cursor[0] < counter["pruned_through"]:
+        raise CursorExpired()
+    horizon = counter["value"]
+
+    rows = select_values(_after(EmpPersonal.objects.all(), horizon, cursor), [*fields, "change_seq"])[: limit + 1]
+    changed = [(row["change_seq"], row["emp_id"], row) for row in rows]
+    deleted = _after(EmpTombstone.objects.all(), horizon, cursor).values_list("change_seq", "emp_id")[: limit + 1]
+    # Both lists are sorted on (change_seq, emp_id), and emp_ids are never reused.
+    merged = sorted([*changed, *((change_seq, emp_id, None) for change_seq, emp_id in deleted)], key=lambda entry: entry[:2])
+    page = merged[:limit]
+    if page:
+        cursor = page[-1][:2]
+    return {
+        "fields": list(fields),
+        "changed": [[row[name] for name in fields] for _, _, row in page if row is not None],
+        "deleted": [emp_id for _, emp_id, row in page if row is None],
+        "next_cursor": encode_cursor(*cursor) if cursor is not None else encode_cursor(0, 0),
+        "has_more": len(merged) > limit,
+    }
+
+
+def prune_tombstones(before):
+    """Delete the tombstones of employees deleted before ``before``; returns how many went.
+
+    Cursors older than the last pruned tombstone get CursorExpired from then on.
+    """
+    with transaction.atomic():
+        through = EmpTombstone.objects.filter(deleted_at__lt=before).aggregate(through=Max("change_seq"))["through"]
+        if through is None:
+            return 0
+        deleted, _ = EmpTombstone.objects.filter(change_seq__lte=through).delete()
+        counter, _ = EmpChangeSequence.objects.select_for_update().get_or_create(pk=EmpChangeSequence.SINGLETON)
+        if through > counter.pruned_through:
+            counter.pruned_through = through
+            counter.save(update_fields=["pruned_through"])
+    return deleted
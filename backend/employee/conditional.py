@@ -0,0 +1,96 @@
+"""Conditional GET (``If-None-Match``/``If-Modified-Since``) for employee records and image files.
+
+The validators come from something much cheaper than the resource, so a
+revalidation answered with 304 neither loads the row nor reads the file:
+
+- An employee's JSON gets a strong ETag made of its ``change_seq``, which every
+  write bumps (see ``models.allocate_change_seq``), and the requested fields.
+  Answering ``If-None-Match`` reads that one column. ``updated_date`` is a DATE,
+  too coarse for ``Last-Modified``, so records have none.
+- An image file's ETag is a SHA-256 of its content. The digest is computed once
+  and cached under the file's name, size and modification time, so later
+  revalidations cost a stat. ``Last-Modified`` is the modification time.
+
+A URL carrying the digest (``?v=<digest>``) always names the same bytes, so
+its response may be cached for a year without revalidation.
+"""
+
+import hashlib
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+DIGEST_CACHE_KEY = "employee:file-digest:{}"
+DIGEST_LENGTH = 32
+
+FileVersion = namedtuple("FileVersion", "name digest last_modified size")
+
+
+def _digest_cache_timeout():
+    return getattr(settings, "EMPLOYEE_FILE_DIGEST_CACHE_SECONDS", 7 * 24 * 3600)
+
+
+def employee_etag(emp_id, change_seq, fields):
+    """Strong ETag of an employee's ``fields``, or None for a row written without a ``change_seq``."""
+    if change_seq is None:
+        return None
+    fields_key = hashlib.sha1(",".join(fields).encode()).hexdigest()[:8]
+    return f'"e{emp_id}.{change_seq}.{fields_key}"'
+
+
+def file_version(name, storage=default_storage):
+    """The FileVersion of the stored file ``name``, or None if there is no such file."""
+    if not name:
+        return None
+    try:
+        size = storage.size(name)
+        modified = storage.get_modified_time(name)
+    except OSError:
+        return None
+    # Hashed, as cache backends such as memcached reject long or non-ASCII keys.
+    key = DIGEST_CACHE_KEY.format(hashlib.sha1(f"{name}\0{size}\0{modified.timestamp()}".encode()).hexdigest())
+    digest = cache.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        try:
+            with storage.open(name, "rb") as fileobj:
+                for chunk in fileobj.chunks():
+                    sha.update(chunk)
+        except OSError:
+            return None
+        digest = sha.hexdigest()[:DIGEST_LENGTH]
+        cache.set(key, digest, _digest_cache_timeout())
+    return FileVersion(name, digest, int(modified.timestamp()), size)
+
+
+def file_etag(version):
+    return f'"{version.digest}"'
+
+
+def not_modified(request, etag, last_modified=None):
+    """The 304 (or 412) response the request's preconditions call for, or None to serve it in full."""
+    if etag is None and last_modified is None:
+        return None
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def with_validators(response, etag, last_modified=None, immutable=False):
+    """Set ``ETag``, ``Last-Modified`` and ``Cache-Control`` on a 200 or 304 response.
+
+    Without ``immutable`` clients must revalidate before each reuse, which is
+    what makes them send ``If-None-Match``.
+    """
+    if etag is not None:
+        response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    if immutable:
+        patch_cache_control(response, private=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
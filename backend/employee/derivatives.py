@@ -0,0 +1,127 @@
+"""Off-request generation of photo thumbnails and cleaned signatures.
+
+Saving an employee only schedules the work: once the transaction commits, the
+original file paths are handed to a process pool running ``employee.imaging``
+(or, with ``EMPLOYEE_DERIVATIVES_VIA_JOBS``, to the ``run_workers`` job queue).
+Derivatives are written next to the originals under predictable names, so their
+URLs can be computed without any extra bookkeeping.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+from jobs.queue import enqueue
+
+from . import imaging
+from .tasks import DERIVATIVES_PRIORITY
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def thumbnail_sizes():
+    return tuple(getattr(settings, "EMPLOYEE_THUMBNAIL_SIZES", (128, 384)))
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = getattr(settings, "EMPLOYEE_DERIVATIVE_WORKERS", 2)
+            # spawn: never fork a threaded web worker holding DB connections.
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def shutdown_executor(wait=True):
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def local_path(fieldfile):
+    if not fieldfile or not fieldfile.name:
+        return None
+    try:
+        return fieldfile.path
+    except NotImplementedError:
+        logger.warning("Storage for %s has no local path; skipping derivatives.", fieldfile.name)
+        return None
+
+
+def _log_failure(future):
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Employee image derivative generation failed: %s", exc, exc_info=exc)
+
+
+def schedule_derivatives(emp, photo=True, signature=True):
+    """Queue derivative generation for ``emp`` to run after the current transaction commits."""
+    photo_path = local_path(emp.emp_photo) if photo else None
+    signature_path = local_path(emp.emp_signature) if signature else None
+    if not photo_path and not signature_path:
+        return
+
+    if getattr(settings, "EMPLOYEE_DERIVATIVES_VIA_JOBS", False):
+        # Inserted in the current transaction, so the job only exists if the save commits.
+        enqueue(
+            "employee.derivatives",
+            {"photo_path": photo_path, "signature_path": signature_path, "sizes": thumbnail_sizes()},
+            priority=DERIVATIVES_PRIORITY,
+        )
+        return
+
+    def submit():
+        args = (imaging.build_derivatives, photo_path, signature_path, thumbnail_sizes())
+        try:
+            future = get_executor().submit(*args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge image); start a fresh pool.
+            shutdown_executor(wait=False)
+            future = get_executor().submit(*args)
+        future.add_done_callback(_log_failure)
+
+    transaction.on_commit(submit)
+
+
+def derivative_names(emp):
+    """Storage names of every derivative ``emp`` should have, keyed by role."""
+    names = {}
+    if emp.emp_photo:
+        for size in thumbnail_sizes():
+            for ext, _, _ in imaging.PHOTO_FORMATS:
+                names[f"photo_{size}_{ext}"] = imaging.thumbnail_name(emp.emp_photo.name, size, ext)
+    if emp.emp_signature:
+        names["signature_clean"] = imaging.signature_name(emp.emp_signature.name)
+    return names
+
+
+def image_names(emp):
+    """Storage names of ``emp``'s original photo/signature and all its derivatives, keyed by role."""
+    names = {}
+    if emp.emp_photo:
+        names["photo"] = emp.emp_photo.name
+    if emp.emp_signature:
+        names["signature"] = emp.emp_signature.name
+    names.update(derivative_names(emp))
+    return names
+
+
+def derivative_urls(emp, only_existing=True):
+    """URLs of ``emp``'s derivatives; with ``only_existing`` pending ones are omitted."""
+    return {
+        role: default_storage.url(name)
+        for role, name in derivative_names(emp).items()
+        if not only_existing or default_storage.exists(name)
+    }
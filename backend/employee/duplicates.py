@@ -0,0 +1,257 @@
+"""Probable duplicate employees, found through blocking keys instead of comparing every pair.
+
+Each employee gets a few blocking keys, stored in EMP_SEARCH_KEY with
+``kind="blk"`` next to its search keys and maintained by the same code:
+
+- ``id:<digits>``: national ID or smart ID. A 17-digit NID is an old 13-digit
+  one with the birth year prefixed, so it is folded to its last 13 digits. Both
+  fields share the namespace because they are often typed into each other.
+- ``bc:<digits>``: birth certificate number.
+- ``dob:<date>:<name>``: date of birth plus the phonetic key of the name.
+- ``par:<father>:<mother>``: phonetic keys of both parents' names.
+
+Names are keyed in English and Bangla script alike (``bangla.phonetic_key``),
+with honorifics such as Md./Mohammad/Mst. dropped. Only employees sharing a key
+are compared, and each such pair is scored on all the evidence (see ``score``).
+"""
+
+import csv
+import re
+from collections import namedtuple
+from functools import lru_cache
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db.models import Count
+
+from . import bangla
+from .models import EmpPersonal, EmpSearchKey
+
+# Columns the blocking keys are derived from.
+BLOCKING_FIELDS = (
+    "national_id",
+    "smart_id",
+    "birth_certificate_no",
+    "date_of_birth",
+    "emp_name",
+    "bang_emp_name",
+    "father_name",
+    "bang_father_name",
+    "mother_name",
+    "bang_mother_name",
+)
+# Columns a candidate is scored on.
+SCORED_FIELDS = ("emp_id", "sex", *BLOCKING_FIELDS)
+
+KEY_MAX_LENGTH = EmpSearchKey._meta.get_field("key").max_length
+# Keys shared by more employees than this (a very common name on one date) say
+# too little to be worth comparing every pair in them.
+MAX_BLOCK_SIZE = 100
+# Candidates read for one employee when checking a save.
+MAX_CANDIDATES = 200
+
+# Phonetic keys of Md., Mohammad, Mohd., Mst., Mosammat and their Bangla spellings
+# (মোঃ, মোছাঃ, মোহাম্মদ, মোসাম্মৎ).
+HONORIFIC_KEYS = frozenset({"M", "MD", "MC", "MHD", "MHMD", "MST", "MSMT"})
+
+WEIGHTS = {
+    "identifier": 0.55,
+    "birth_certificate": 0.45,
+    "name": 0.25,
+    "date_of_birth": 0.15,
+    "father": 0.1,
+    "mother": 0.1,
+}
+# Conflicting values count against a match.
+DOB_MISMATCH = -0.2
+SEX_MISMATCH = -0.3
+
+_DIGITS = re.compile(r"[^0-9A-Z]+")
+_TOKEN_SPLIT = re.compile(r"[\s.,;:'\"()\-_/]+")
+
+Match = namedtuple("Match", "emp_id other_id score reasons")
+
+
+def min_score():
+    return getattr(settings, "EMPLOYEE_DUPLICATE_MIN_SCORE", 0.5)
+
+
+def normalize_id(value):
+    ident = _DIGITS.sub("", str(value or "").upper())
+    if len(ident) == 17 and ident.isdigit() and ident[:2] in ("19", "20"):
+        return ident[4:]
+    return ident
+
+
+# Cached: names repeat a lot across a table, and normalizing them is most of the cost of a scan.
+@lru_cache(maxsize=65536)
+def name_tokens(value):
+    """Phonetic keys of the words of a name, honorifics dropped."""
+    if not value:
+        return ()
+    tokens = (bangla.phonetic_key(word) for word in _TOKEN_SPLIT.split(bangla.normalize(value)))
+    return tuple(token for token in tokens if token and token not in HONORIFIC_KEYS)
+
+
+def name_key(value):
+    return "".join(name_tokens(value))
+
+
+def _name_keys(emp, *fields):
+    return {key for key in (name_key(getattr(emp, field)) for field in fields) if key}
+
+
+def blocking_keys(emp):
+    """The blocking keys (``EmpSearchKey.key`` values) of ``emp``; any object with the BLOCKING_FIELDS."""
+    keys = set()
+    for field in ("national_id", "smart_id"):
+        ident = normalize_id(getattr(emp, field))
+        if ident:
+            keys.add(f"id:{ident}")
+    certificate = normalize_id(emp.birth_certificate_no)
+    if certificate:
+        keys.add(f"bc:{certificate}")
+    if emp.date_of_birth:
+        for name in _name_keys(emp, "emp_name", "bang_emp_name"):
+            keys.add(f"dob:{emp.date_of_birth}:{name}")
+    for father in _name_keys(emp, "father_name", "bang_father_name"):
+        for mother in _name_keys(emp, "mother_name", "bang_mother_name"):
+            keys.add(f"par:{father}:{mother}")
+    return {key[:KEY_MAX_LENGTH] for key in keys}
+
+
+def features(emp):
+    """What ``score`` compares, computed once per employee."""
+    ids = {normalize_id(getattr(emp, field)) for field in ("national_id", "smart_id")}
+    names = [name_tokens(getattr(emp, field)) for field in ("emp_name", "bang_emp_name")]
+    return SimpleNamespace(
+        ids=ids - {""},
+        certificate=normalize_id(emp.birth_certificate_no),
+        dob=emp.date_of_birth,
+        sex=emp.sex,
+        names={"".join(tokens) for tokens in names if tokens},
+        tokens={token for tokens in names for token in tokens},
+        fathers=_name_keys(emp, "father_name", "bang_father_name"),
+        mothers=_name_keys(emp, "mother_name", "bang_mother_name"),
+    )
+
+
+def score(a, b):
+    """``(score, reasons)`` for two ``features``; the score is between 0 and 1."""
+    total, reasons = 0.0, []
+    if a.ids & b.ids:
+        total += WEIGHTS["identifier"]
+        reasons.append("identifier")
+    if a.certificate and a.certificate == b.certificate:
+        total += WEIGHTS["birth_certificate"]
+        reasons.append("birth_certificate")
+    if a.names & b.names:
+        similarity = 1.0
+    elif a.tokens and b.tokens:
+        # Some words in common, e.g. a middle name left out of one record.
+        similarity = len(a.tokens & b.tokens) / len(a.tokens | b.tokens)
+    else:
+        similarity = 0.0
+    if similarity:
+        total += WEIGHTS["name"] * similarity
+        reasons.append("name")
+    if a.dob and b.dob:
+        if a.dob == b.dob:
+            total += WEIGHTS["date_of_birth"]
+            reasons.append("date_of_birth")
+        else:
+            total += DOB_MISMATCH
+    for parent in ("father", "mother"):
+        if getattr(a, parent + "s") & getattr(b, parent + "s"):
+            total += WEIGHTS[parent]
+            reasons.append(parent)
+    if a.sex and b.sex and a.sex != b.sex:
+        total += SEX_MISMATCH
+    return round(min(max(total, 0.0), 1.0), 2), reasons
+
+
+def _block_keys():
+    return EmpSearchKey.objects.filter(kind=EmpSearchKey.KIND_BLOCK)
+
+
+def _rows(ids, fields=SCORED_FIELDS, chunk_size=1000):
+    ids = sorted(ids)
+    rows = {}
+    for start in range(0, len(ids), chunk_size):
+        for row in EmpPersonal.objects.filter(emp_id__in=ids[start : start + chunk_size]).values(*fields):
+            rows[row["emp_id"]] = row
+    return rows
+
+
+def candidates_for(emp, threshold=None, limit=10):
+    """Probable duplicates of the saved employee ``emp``, best first.
+
+    Two indexed queries: the employees sharing a blocking key, then their scored
+    columns. Returns dicts with ``emp_id``, ``emp_code``, ``emp_name``, ``score``
+    and ``reasons``.
+    """
+    keys = blocking_keys(emp)
+    if not keys:
+        return []
+    threshold = min_score() if threshold is None else threshold
+    ids = _block_keys().filter(key__in=keys).exclude(employee_id=emp.pk).values_list("employee_id", flat=True)
+    rows = _rows(list(ids.distinct()[:MAX_CANDIDATES]), (*SCORED_FIELDS, "emp_code"))
+    mine = features(emp)
+    found = []
+    for row in rows.values():
+        value, reasons = score(mine, features(SimpleNamespace(**row)))
+        if value >= threshold:
+            found.append({"emp_id": row["emp_id"], "emp_code": row["emp_code"], "emp_name": row["emp_name"], "score": value, "reasons": reasons})
+    found.sort(key=lambda match: (-match["score"], match["emp_id"]))
+    return found[:limit]
+
+
+def find_duplicates(threshold=None, max_block_size=MAX_BLOCK_SIZE, key_chunk_size=500, on_progress=None):
+    """Yield a ``Match`` (``emp_id < other_id``) for every probable duplicate pair in the table.
+
+    Reads only the blocking keys that more than one employee shares (a GROUP BY
+    on the ``(kind, key)`` index), then compares the members of each block.
+    ``on_progress(done, total)`` is called per chunk of keys.
+    """
+    threshold = min_score() if threshold is None else threshold
+    shared = (
+        _block_keys()
+        .values("key")
+        .annotate(members=Count("id"))
+        .filter(members__gt=1, members__lte=max_block_size)
+        .order_by()
+        .values_list("key", flat=True)
+    )
+    keys = list(shared)
+    seen = set()
+    for start in range(0, len(keys), key_chunk_size):
+        blocks = {}
+        chunk = keys[start : start + key_chunk_size]
+        for key, emp_id in _block_keys().filter(key__in=chunk).values_list("key", "employee_id"):
+            blocks.setdefault(key, []).append(emp_id)
+        pairs = set()
+        for members in blocks.values():
+            members.sort()
+            pairs.update((a, b) for i, a in enumerate(members) for b in members[i + 1 :] if a != b)
+        pairs -= seen
+        seen |= pairs
+        if pairs:
+            cached = {emp_id: features(SimpleNamespace(**row)) for emp_id, row in _rows({emp_id for pair in pairs for emp_id in pair}).items()}
+            for a, b in sorted(pairs):
+                if a in cached and b in cached:
+                    value, reasons = score(cached[a], cached[b])
+                    if value >= threshold:
+                        yield Match(a, b, value, reasons)
+        if on_progress is not None:
+            on_progress(min(start + key_chunk_size, len(keys)), len(keys))
+
+
+def write_report(matches, fileobj):
+    """Write ``matches`` to the text file ``fileobj`` as CSV; returns how many were written."""
+    writer = csv.writer(fileobj)
+    writer.writerow(["emp_id", "other_id", "score", "reasons"])
+    count = 0
+    for match in matches:
+        writer.writerow([match.emp_id, match.other_id, f"{match.score:.2f}", " ".join(match.reasons)])
+        count += 1
+    return count
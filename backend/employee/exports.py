@@ -0,0 +1,201 @@
+"""Streaming EmpPersonal exports as CSV, JSON Lines or XLSX.
+
+Rows are fetched in keyset batches on ``emp_id`` (MySQLdb's default cursor
+buffers a whole result set client-side, so ``.iterator()`` alone would not
+bound memory there) and each batch is encoded and handed to
+``StreamingHttpResponse`` before the next one is read. The header goes out
+before the first query runs.
+"""
+
+import csv
+import io
+import json
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+
+from .models import BANGLA_NAME_KEY_FIELDS
+from .queries import SELECTABLE_FIELDS, field_lookup
+
+DEFAULT_CHUNK_SIZE = 2000
+
+_DERIVED_FIELDS = {name for keys in BANGLA_NAME_KEY_FIELDS.values() for name in keys} | {"change_seq"}
+EXPORT_DEFAULT_FIELDS = tuple(f for f in SELECTABLE_FIELDS if f not in _DERIVED_FIELDS)
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+def iter_batches(queryset, fields, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of value tuples for ``fields`` (which must include ``emp_id``)."""
+    key_index = list(fields).index("emp_id")
+    queryset = queryset.order_by("emp_id").values_list(*map(field_lookup, fields))
+    last_id = None
+    while True:
+        page = queryset if last_id is None else queryset.filter(emp_id__gt=last_id)
+        batch = list(page[:chunk_size])
+        if not batch:
+            return
+        yield batch
+        if len(batch) < chunk_size:
+            return
+        last_id = batch[-1][key_index]
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def csv_stream(fields, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM so Excel opens the Bangla columns as UTF-8.
+    buffer.write("\ufeff")
+    writer.writerow(fields)
+    yield buffer.getvalue().encode("utf-8")
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_text(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def jsonl_stream(fields, batches):
+    for batch in batches:
+        lines = [json.dumps(dict(zip(fields, map(_json_value, row))), ensure_ascii=False) for row in batch]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class ChunkSink:
+    """Write-only file object that collects what zipfile writes until drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_XLSX_PARTS = (
+    (
+        "[Content_Types].xml",
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>",
+    ),
+    (
+        "_rels/.rels",
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>",
+    ),
+    (
+        "xl/workbook.xml",
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Employees" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>",
+    ),
+    (
+        "xl/_rels/workbook.xml.rels",
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>",
+    ),
+)
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return "<c/>"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = _XML_ILLEGAL.sub("", _text(value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def _xlsx_row(values):
+    return "<row>" + "".join(_xlsx_cell(v) for v in values) + "</row>"
+
+
+def xlsx_stream(fields, batches):
+    """Write a single-sheet workbook with inline strings, streaming the zip as it grows."""
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_PARTS:
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(fields).encode("utf-8"))
+            yield sink.drain()
+            for batch in batches:
+                sheet.write("".join(_xlsx_row(row) for row in batch).encode("utf-8"))
+                yield sink.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+_WRITERS = {"csv": csv_stream, "jsonl": jsonl_stream, "xlsx": xlsx_stream}
+
+
+def export_stream(queryset, fields, fmt="csv", chunk_size=DEFAULT_CHUNK_SIZE, on_batch=None):
+    """Encoded chunks of the export; ``on_batch`` is called with each batch's row count."""
+    batches = iter_batches(queryset, fields, chunk_size=chunk_size)
+    if on_batch is not None:
+        batches = _observed(batches, on_batch)
+    return _WRITERS[fmt](list(fields), batches)
+
+
+def _observed(batches, on_batch):
+    for batch in batches:
+        yield batch
+        on_batch(len(batch))
+
+
+def export_response(queryset, fields, fmt="csv", filename="employees", chunk_size=DEFAULT_CHUNK_SIZE):
+    content_type, extension = FORMATS[fmt]
+    stream = export_stream(queryset, fields, fmt, chunk_size=chunk_size)
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    return response
@@ -0,0 +1,157 @@
+"""Pillow-only rendering of employee ID cards (CR80, 85.6 x 54 mm at 300 dpi).
+
+Like ``employee.imaging`` this module does not import Django: it runs in
+spawned worker processes, and callers pass plain dicts with filesystem paths.
+Fonts and the blank card template are loaded once per process and reused for
+every card it renders.
+
+Bangla names are only shaped correctly (conjuncts, reordered vowel signs) when
+Pillow has libraqm (``PIL.features.check("raqm")``) and a Bengali font such as
+Noto Sans Bengali is configured; otherwise they are drawn unshaped and a warning
+is logged once per process.
+"""
+
+import logging
+import os
+from collections import namedtuple
+from functools import lru_cache
+from io import BytesIO
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps, features
+
+from .imaging import signature_name, thumbnail_name
+
+logger = logging.getLogger(__name__)
+
+CARD_SIZE = (1011, 638)
+CARD_SIZE_MM = (85.6, 54.0)
+JPEG_QUALITY = 90
+
+HEADER_HEIGHT = 110
+PHOTO_BOX = (40, 140, 300, 460)  # left, top, right, bottom
+SIGNATURE_BOX = (660, 500, 970, 590)
+TEXT_LEFT = 340
+TEXT_WIDTH = CARD_SIZE[0] - TEXT_LEFT - 40
+HEADER_COLOR = (22, 84, 140)
+BLOOD_COLOR = (190, 30, 45)
+TEXT_COLOR = (20, 20, 20)
+MUTED_COLOR = (90, 90, 90)
+
+CardStyle = namedtuple("CardStyle", "title font bangla_font", defaults=("VisorHR", None, None))
+
+_style = CardStyle()
+
+
+def init_worker(style=None):
+    """Pool initializer: remember the style and warm the caches before the first card."""
+    global _style
+    _style = style or CardStyle()
+    if not features.check("raqm"):
+        logger.warning("Pillow was built without libraqm; Bangla text on ID cards will not be shaped.")
+    _template(_style.title, _style.font)
+
+
+@lru_cache(maxsize=None)
+def _font(path, size):
+    if path:
+        layout = ImageFont.Layout.RAQM if features.check("raqm") else ImageFont.Layout.BASIC
+        return ImageFont.truetype(path, size, layout_engine=layout)
+    return ImageFont.load_default(size)
+
+
+def _fitted_font(path, text, largest, smallest=24):
+    """The largest font size (in steps of 2) at which ``text`` fits the text column."""
+    for size in range(largest, smallest - 1, -2):
+        font = _font(path, size)
+        if font.getlength(text) <= TEXT_WIDTH:
+            return font
+    return _font(path, smallest)
+
+
+@lru_cache(maxsize=4)
+def _template(title, font_path):
+    card = Image.new("RGB", CARD_SIZE, "white")
+    draw = ImageDraw.Draw(card)
+    draw.rectangle((0, 0, CARD_SIZE[0], HEADER_HEIGHT), fill=HEADER_COLOR)
+    draw.text((40, HEADER_HEIGHT // 2), title, font=_font(font_path, 56), fill="white", anchor="lm")
+    draw.rectangle(PHOTO_BOX, outline=(200, 200, 200), width=2)
+    draw.line((SIGNATURE_BOX[0], SIGNATURE_BOX[3], SIGNATURE_BOX[2], SIGNATURE_BOX[3]), fill=MUTED_COLOR, width=2)
+    return card
+
+
+def _preferred(path, derivative):
+    """``derivative`` (a pre-shrunk copy from ``employee.imaging``) if it exists, else ``path``."""
+    return derivative if os.path.exists(derivative) else path
+
+
+def _paste_photo(card, path):
+    box_size = (PHOTO_BOX[2] - PHOTO_BOX[0], PHOTO_BOX[3] - PHOTO_BOX[1])
+    with Image.open(_preferred(path, thumbnail_name(path, 384, "jpg"))) as source:
+        source.draft("RGB", (box_size[0] * 2, box_size[1] * 2))
+        photo = ImageOps.exif_transpose(source).convert("RGB")
+    card.paste(ImageOps.fit(photo, box_size, Image.Resampling.LANCZOS), PHOTO_BOX[:2])
+
+
+def _paste_signature(card, path):
+    box_size = (SIGNATURE_BOX[2] - SIGNATURE_BOX[0], SIGNATURE_BOX[3] - SIGNATURE_BOX[1])
+    with Image.open(_preferred(path, signature_name(path))) as source:
+        ink = ImageOps.exif_transpose(source).convert("L")
+    ink.thumbnail(box_size, Image.Resampling.LANCZOS)
+    # Only the dark strokes are drawn, so the card shows through the paper of the scan.
+    mask = ink.point(lambda v: 255 if v < 160 else 0)
+    left = SIGNATURE_BOX[0] + (box_size[0] - ink.width) // 2
+    top = SIGNATURE_BOX[1] + (box_size[1] - ink.height)
+    card.paste(TEXT_COLOR, (left, top, left + ink.width, top + ink.height), mask)
+
+
+def _draw_card(record):
+    style = _style
+    card = _template(style.title, style.font).copy()
+    draw = ImageDraw.Draw(card)
+
+    y = PHOTO_BOX[1]
+    name = record.get("emp_name") or ""
+    if name:
+        font = _fitted_font(style.font, name, 48)
+        draw.text((TEXT_LEFT, y), name, font=font, fill=TEXT_COLOR)
+        y += font.size + 18
+    bangla = record.get("bang_emp_name") or ""
+    if bangla:
+        font = _fitted_font(style.bangla_font or style.font, bangla, 46)
+        draw.text((TEXT_LEFT, y), bangla, font=font, fill=TEXT_COLOR)
+        y += font.size + 30
+
+    label_font = _font(style.font, 30)
+    for label, value in (("ID", record.get("emp_code")), ("Card No", record.get("card_no"))):
+        if value:
+            draw.text((TEXT_LEFT, y), f"{label}: {value}", font=label_font, fill=MUTED_COLOR)
+            y += 44
+
+    blood = record.get("blood_group")
+    if blood:
+        badge = (TEXT_LEFT, 500, TEXT_LEFT + 130, 580)
+        draw.rounded_rectangle(badge, radius=14, fill=BLOOD_COLOR)
+        draw.text(((badge[0] + badge[2]) // 2, (badge[1] + badge[3]) // 2), blood, font=_font(style.font, 40), fill="white", anchor="mm")
+
+    for key, paste in (("photo_path", _paste_photo), ("signature_path", _paste_signature)):
+        path = record.get(key)
+        if not path:
+            continue
+        try:
+            paste(card, path)
+        except (OSError, ValueError) as exc:
+            # A missing or corrupt file leaves that box blank rather than losing the whole batch.
+            logger.warning("Employee %s: could not use %s: %s", record.get("emp_id"), path, exc)
+    return card
+
+
+def render_card(record):
+    """JPEG bytes of one card. ``record`` holds the text fields plus ``photo_path``/``signature_path``."""
+    buffer = BytesIO()
+    _draw_card(record).save(buffer, "JPEG", quality=JPEG_QUALITY, dpi=(300, 300))
+    return buffer.getvalue()
+
+
+def render_cards(records):
+    """Worker entry point: render a chunk of cards (one round trip per chunk, not per card)."""
+    return [render_card(record) for record in records]
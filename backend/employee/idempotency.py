@@ -0,0 +1,192 @@
+"""``Idempotency-Key`` support for the employee write endpoints.
+
+The first request with a given key (per user) runs normally and its response
+is stored in EMP_IDEMPOTENCY_KEY; a retry with the same key and the same
+request gets that response back (with ``Idempotent-Replayed: true``) instead
+of writing again. Reusing a key for a different request is a 422, and a retry
+that arrives while the first attempt is still running is a 409. Server errors
+are not stored, so they can be retried. Keys expire after
+``EMPLOYEE_IDEMPOTENCY_TTL`` seconds (default 24 hours).
+"""
+
+import functools
+import hashlib
+import json
+import time
+from asyncio import iscoroutinefunction
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from visorhr.async_utils import aget_user
+
+from .models import EmpIdempotencyKey
+from .uploads import UploadRejected, install_upload_handler
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 128
+# A claimed key whose request never finished (worker killed) can be retried after this.
+STALE_SECONDS = 300
+PURGE_INTERVAL = 60
+
+_last_purge = 0.0
+
+
+def _ttl():
+    return getattr(settings, "EMPLOYEE_IDEMPOTENCY_TTL", 24 * 3600)
+
+
+def _is_json(request):
+    return (request.content_type or "").startswith("application/json")
+
+
+def _parse_form(request):
+    """Parse a form/multipart body through the streaming upload handler, so it can be fingerprinted.
+
+    Returns False when the upload was rejected; the view reports that itself and writes nothing.
+    """
+    try:
+        handler = install_upload_handler(request)
+    except UploadRejected:
+        return False
+    request.POST  # noqa: B018 - streams the files to disk, hashing them on the way
+    return handler.error is None
+
+
+def _file_digest(upload):
+    digest = getattr(upload, "digest", None)
+    if digest is None:
+        sha = hashlib.sha256()
+        for chunk in upload.chunks():
+            sha.update(chunk)
+        upload.seek(0)
+        digest = sha.hexdigest()
+    return digest
+
+
+def _fingerprint(request):
+    digest = hashlib.sha256(f"{request.method} {request.path}\n".encode())
+    if _is_json(request):
+        digest.update(request.body)
+        return digest.hexdigest()
+    for name, values in sorted(request.POST.lists()):
+        digest.update(json.dumps([name, values]).encode())
+    for name, uploads in sorted(request.FILES.lists()):
+        for upload in uploads:
+            digest.update(json.dumps([name, upload.name, upload.size, _file_digest(upload)]).encode())
+    return digest.hexdigest()
+
+
+def _error(message, status):
+    return JsonResponse({"success": False, "message": message}, status=status)
+
+
+def _purge_expired(now):
+    global _last_purge
+    if time.monotonic() - _last_purge < PURGE_INTERVAL:
+        return
+    _last_purge = time.monotonic()
+    EmpIdempotencyKey.objects.filter(created_at__lt=now - timedelta(seconds=_ttl())).delete()
+
+
+def _begin(user_id, key, fingerprint):
+    """Claim ``key`` for this request; returns the record, or a response to send instead."""
+    now = timezone.now()
+    _purge_expired(now)
+    try:
+        with transaction.atomic():
+            return EmpIdempotencyKey.objects.create(user_id=user_id, key=key, fingerprint=fingerprint)
+    except IntegrityError:
+        pass
+
+    record = EmpIdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+    if record is None:  # purged between the insert and the read
+        return _error("Idempotency-Key is being reset; retry the request.", 409)
+    age = (now - record.created_at).total_seconds()
+    expired = age > _ttl() or (record.status is None and age > STALE_SECONDS)
+    if expired:
+        claimed = EmpIdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).update(
+            fingerprint=fingerprint, status=None, response="", created_at=now
+        )
+        if claimed:
+            record.fingerprint, record.status, record.response, record.created_at = fingerprint, None, "", now
+            return record
+        return _error("A request with this Idempotency-Key is already in progress.", 409)
+    if record.fingerprint != fingerprint:
+        return _error("Idempotency-Key was already used for a different request.", 422)
+    if record.status is None:
+        return _error("A request with this Idempotency-Key is already in progress.", 409)
+    response = HttpResponse(record.response, status=record.status, content_type="application/json")
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _finish(record, response):
+    if response.status_code >= 500 or response.streaming:
+        _release(record)
+        return
+    EmpIdempotencyKey.objects.filter(pk=record.pk).update(
+        status=response.status_code, response=response.content.decode("utf-8")
+    )
+
+
+def _release(record):
+    record.delete()
+
+
+def idempotent(view):
+    """Make a write view replay its stored response for a repeated ``Idempotency-Key``."""
+    if iscoroutinefunction(view):
+
+        @functools.wraps(view)
+        async def async_inner(request, *args, **kwargs):
+            key = request.headers.get(HEADER, "").strip()
+            if not key:
+                return await view(request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return _error(f"{HEADER} must be at most {MAX_KEY_LENGTH} characters.", 400)
+            user = await aget_user(request)
+            if not user.is_authenticated:
+                return await view(request, *args, **kwargs)
+            if not _is_json(request) and not await sync_to_async(_parse_form)(request):
+                return await view(request, *args, **kwargs)
+            state = await sync_to_async(_begin)(user.id, key, _fingerprint(request))
+            if isinstance(state, HttpResponse):
+                return state
+            try:
+                response = await view(request, *args, **kwargs)
+            except BaseException:
+                await sync_to_async(_release)(state)
+                raise
+            await sync_to_async(_finish)(state, response)
+            return response
+
+        return async_inner
+
+    @functools.wraps(view)
+    def inner(request, *args, **kwargs):
+        key = request.headers.get(HEADER, "").strip()
+        if not key:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(f"{HEADER} must be at most {MAX_KEY_LENGTH} characters.", 400)
+        if not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if not _is_json(request) and not _parse_form(request):
+            return view(request, *args, **kwargs)
+        state = _begin(request.user.id, key, _fingerprint(request))
+        if isinstance(state, HttpResponse):
+            return state
+        try:
+            response = view(request, *args, **kwargs)
+        except BaseException:
+            _release(state)
+            raise
+        _finish(state, response)
+        return response
+
+    return inner
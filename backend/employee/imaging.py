@@ -0,0 +1,79 @@
+"""Pillow-only image transforms for employee photos and signatures.
+
+This module deliberately avoids importing Django so it can run in spawned worker
+processes without configuring settings; callers pass filesystem paths.
+"""
+
+import os
+
+from PIL import Image, ImageOps
+
+PHOTO_FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "JPEG", {"quality": 85, "progressive": True, "optimize": True}),
+)
+SIGNATURE_MAX_WIDTH = 600
+SIGNATURE_THRESHOLD = 160
+
+
+def thumbnail_name(name, size, ext):
+    root, _ = os.path.splitext(name)
+    return f"{root}.thumb-{size}.{ext}"
+
+
+def signature_name(name):
+    root, _ = os.path.splitext(name)
+    return f"{root}.clean.png"
+
+
+def _atomic_save(image, path, fmt, **params):
+    tmp_path = f"{path}.tmp"
+    image.save(tmp_path, fmt, **params)
+    os.replace(tmp_path, path)
+
+
+def make_photo_thumbnails(src_path, sizes):
+    """Write a WebP and a JPEG thumbnail per size next to ``src_path``; return their paths."""
+    written = []
+    with Image.open(src_path) as original:
+        # Let the JPEG decoder downscale while decoding instead of loading full resolution.
+        original.draft("RGB", (max(sizes) * 2, max(sizes) * 2))
+        image = ImageOps.exif_transpose(original).convert("RGB")
+    for size in sorted(sizes, reverse=True):
+        thumb = image.copy()
+        thumb.thumbnail((size, size), Image.Resampling.LANCZOS)
+        for ext, fmt, params in PHOTO_FORMATS:
+            path = thumbnail_name(src_path, size, ext)
+            _atomic_save(thumb, path, fmt, **params)
+            written.append(path)
+        # Smaller sizes are cheaper to derive from the previous thumbnail.
+        image = thumb
+    return written
+
+
+def make_clean_signature(src_path):
+    """Write a trimmed, black-and-white PNG of a scanned signature; return its path."""
+    with Image.open(src_path) as original:
+        gray = ImageOps.exif_transpose(original).convert("L")
+    gray = ImageOps.autocontrast(gray, cutoff=1)
+    ink = gray.point(lambda v: 255 if v < SIGNATURE_THRESHOLD else 0)
+    bbox = ink.getbbox()
+    if bbox:
+        gray = gray.crop(bbox)
+    if gray.width > SIGNATURE_MAX_WIDTH:
+        height = max(1, round(gray.height * SIGNATURE_MAX_WIDTH / gray.width))
+        gray = gray.resize((SIGNATURE_MAX_WIDTH, height), Image.Resampling.LANCZOS)
+    binary = gray.point(lambda v: 0 if v < SIGNATURE_THRESHOLD else 255, mode="1")
+    path = signature_name(src_path)
+    _atomic_save(binary, path, "PNG", optimize=True)
+    return path
+
+
+def build_derivatives(photo_path=None, signature_path=None, sizes=(128, 384)):
+    """Worker entry point: generate every derivative for one employee."""
+    written = []
+    if photo_path:
+        written.extend(make_photo_thumbnails(photo_path, sizes))
+    if signature_path:
+        written.append(make_clean_signature(signature_path))
+    return written
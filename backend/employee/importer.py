@@ -0,0 +1,186 @@
+"""Streaming bulk import of EmpPersonal rows from CSV or XLSX uploads.
+
+Rows are read one at a time, validated in batches with the same schema as
+``save_employee`` and written with ``bulk_create`` in batches, so memory use depends on the batch
+size rather than on the size of the file.
+"""
+
+import csv
+import io
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from django.db import DatabaseError, transaction
+
+from .models import EmpPersonal
+from .schema import EMPLOYEE_SCHEMA
+
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFormatError(ValueError):
+    """Raised when an uploaded file cannot be read as CSV or XLSX.
+
+    Raised by ``import_employees`` part way through a file, ``report`` holds
+    the rows imported before the error; those batches are already committed.
+    """
+
+    report = None
+
+
+def _normalize_header(name):
+    return str(name or "").strip().lower().replace(" ", "_")
+
+
+def iter_csv_rows(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        try:
+            header = [_normalize_header(h) for h in next(reader)]
+        except StopIteration:
+            return
+        for values in reader:
+            if not any(values):
+                yield None
+                continue
+            yield dict(zip(header, values))
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError("CSV files must be UTF-8 encoded.") from exc
+    finally:
+        text.detach()
+
+
+def _cell_value(value):
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if value is None:
+        return None
+    return str(value)
+
+
+def iter_xlsx_rows(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:  # optional dependency for spreadsheet imports
+        raise ImportFormatError("XLSX import requires the openpyxl package.") from exc
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as exc:
+        raise ImportFormatError("Could not read the XLSX workbook.") from exc
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        try:
+            header = [_normalize_header(h) for h in next(rows)]
+        except StopIteration:
+            return
+        for values in rows:
+            if not any(v not in (None, "") for v in values):
+                yield None
+                continue
+            yield {name: _cell_value(v) for name, v in zip(header, values) if name}
+    finally:
+        workbook.close()
+
+
+def iter_rows(fileobj, filename):
+    """Yield one dict per data row (``None`` for blank rows) from a CSV/XLSX file."""
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return iter_csv_rows(fileobj)
+    if name.endswith(".xlsx"):
+        return iter_xlsx_rows(fileobj)
+    raise ImportFormatError("Unsupported file type; upload a .csv or .xlsx file.")
+
+
+@dataclass
+class ImportReport:
+    total: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row_number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def _flush(batch, report):
+    """Insert a batch in one statement, falling back to per-row inserts to isolate bad rows."""
+    if not batch:
+        return
+    objs = [emp for _, emp in batch]
+    try:
+        with transaction.atomic():
+            EmpPersonal.objects.bulk_create(objs, batch_size=len(objs))
+        report.created += len(objs)
+        return
+    except DatabaseError:
+        pass
+
+    with transaction.atomic():
+        for row_number, emp in batch:
+            try:
+                with transaction.atomic():
+                    emp.save(force_insert=True)
+                report.created += 1
+            except DatabaseError as exc:
+                report.add_error(row_number, {"__all__": [str(exc)]})
+
+
+def import_employees(rows, user_id=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+    """Validate and insert ``rows`` (an iterable of dicts) and return an ImportReport.
+
+    Row numbers in the report match spreadsheet line numbers (the header is row 1).
+    ``progress``, if given, is called with the report after every batch.
+    An ImportFormatError from ``rows`` is re-raised carrying the report so far.
+    """
+    batch_size = max(1, int(batch_size or DEFAULT_BATCH_SIZE))
+    report = ImportReport()
+    pending = []
+
+    def flush_pending():
+        batch = []
+        results = EMPLOYEE_SCHEMA.validate_many(data for _, data in pending)
+        for (row_number, _), (cleaned, errors) in zip(pending, results):
+            if errors:
+                report.add_error(row_number, errors)
+                continue
+            batch.append((row_number, EMPLOYEE_SCHEMA.build(cleaned, photo_added_by=user_id, updated_by=user_id)))
+        _flush(batch, report)
+        pending.clear()
+        if progress is not None:
+            progress(report)
+
+    try:
+        for row_number, data in enumerate(rows, start=2):
+            if data is None:
+                continue
+            report.total += 1
+            pending.append((row_number, data))
+            if len(pending) >= batch_size:
+                flush_pending()
+    except ImportFormatError as exc:
+        # Everything read before the error is imported, like the batches already committed.
+        flush_pending()
+        exc.report = report
+        raise
+
+    flush_pending()
+    return report
@@ -0,0 +1,53 @@
+from concurrent.futures import wait
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from employee import imaging
+from employee.derivatives import get_executor, local_path, shutdown_executor, thumbnail_sizes
+from employee.models import EmpPersonal
+
+
+class Command(BaseCommand):
+    help = "Generate photo thumbnails and cleaned signatures for existing employees."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=200, help="Employees in flight at once.")
+
+    def handle(self, *args, **options):
+        no_photo = Q(emp_photo__isnull=True) | Q(emp_photo="")
+        no_signature = Q(emp_signature__isnull=True) | Q(emp_signature="")
+        queryset = (
+            EmpPersonal.objects.exclude(no_photo & no_signature)
+            .only("emp_id", "emp_photo", "emp_signature")
+            .order_by("emp_id")
+        )
+        executor = get_executor()
+        self.done = self.failed = 0
+        pending = {}
+        try:
+            for emp in queryset.iterator(chunk_size=1000):
+                future = executor.submit(
+                    imaging.build_derivatives,
+                    local_path(emp.emp_photo),
+                    local_path(emp.emp_signature),
+                    thumbnail_sizes(),
+                )
+                pending[future] = emp.emp_id
+                if len(pending) >= options["chunk_size"]:
+                    self._collect(pending)
+            self._collect(pending)
+        finally:
+            shutdown_executor()
+        self.stdout.write(self.style.SUCCESS(f"Built derivatives for {self.done} employees ({self.failed} failed)."))
+
+    def _collect(self, pending):
+        wait(pending)
+        for future, emp_id in pending.items():
+            try:
+                future.result()
+                self.done += 1
+            except Exception as exc:  # keep going; report every broken file
+                self.failed += 1
+                self.stderr.write(f"Employee {emp_id}: {exc}")
+        pending.clear()
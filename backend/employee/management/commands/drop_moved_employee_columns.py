@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from employee.models import EmpAddressDetail, EmpContactDetail, EmpEducationDetail, EmpPersonal
+
+SIDE_MODELS = (EmpAddressDetail, EmpContactDetail, EmpEducationDetail)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drop the EMP_PERSONAL columns that migration 0012 copied into the side tables. "
+        "Irreversible: run it in a later release, once the side tables are proven in production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only check and report what would be dropped.")
+
+    def handle(self, *args, **options):
+        table = EmpPersonal._meta.db_table
+        if table not in connection.introspection.table_names():
+            raise CommandError(f"{table} does not exist.")
+        with connection.cursor() as cursor:
+            existing = {column.name.lower() for column in connection.introspection.get_table_description(cursor, table)}
+
+        quote = connection.ops.quote_name
+        drops = []
+        with connection.cursor() as cursor:
+            for model in SIDE_MODELS:
+                columns = [f.column for f in model._meta.concrete_fields if not f.primary_key and f.column in existing]
+                if not columns:
+                    continue
+                side = quote(model._meta.db_table)
+                any_value = " OR ".join(f"p.{quote(column)} <> ''" for column in columns)
+                cursor.execute(
+                    f"SELECT COUNT(*) FROM {quote(table)} p WHERE ({any_value}) "
+                    f"AND NOT EXISTS (SELECT 1 FROM {side} s WHERE s.emp_id = p.emp_id)"
+                )
+                (uncopied,) = cursor.fetchone()
+                if uncopied:
+                    raise CommandError(f"{uncopied} employees have values in {', '.join(columns)} but no {model._meta.db_table} row; nothing was dropped.")
+                drops.extend(columns)
+
+        if not drops:
+            self.stdout.write("The moved columns are already gone.")
+            return
+        if options["dry_run"]:
+            self.stdout.write(f"Would drop {', '.join(drops)}.")
+            return
+        with connection.schema_editor() as editor:
+            if connection.vendor == "mysql":
+                # One ALTER, so the table is rebuilt once rather than per column.
+                editor.execute(f"ALTER TABLE {quote(table)} {', '.join(f'DROP COLUMN {quote(column)}' for column in drops)}")
+            else:
+                for column in drops:
+                    editor.execute(f"ALTER TABLE {quote(table)} DROP COLUMN {quote(column)}")
+        self.stdout.write(self.style.SUCCESS(f"Dropped {len(drops)} columns from {table}."))
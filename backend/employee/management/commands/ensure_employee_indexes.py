@@ -0,0 +1,85 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from employee.models import EmpPersonal
+from employee.upsert import missing_unique_constraints, reset_upsert_keys
+
+MAX_REPORTED_DUPLICATES = 20
+
+
+class Command(BaseCommand):
+    help = "Create the unique constraints and indexes declared on EmpPersonal (EMP_PERSONAL is unmanaged, so migrate skips them)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be created.")
+
+    def handle(self, *args, **options):
+        table = EmpPersonal._meta.db_table
+        if table not in connection.introspection.table_names():
+            raise CommandError(f"{table} does not exist.")
+
+        missing = missing_unique_constraints()
+        missing_indexes = self._missing_indexes()
+        if not missing and not missing_indexes:
+            self.stdout.write("All indexes already exist.")
+            return
+
+        for index in missing_indexes:
+            if options["dry_run"]:
+                self.stdout.write(f"Would create {index.name}.")
+                continue
+            with connection.schema_editor() as editor:
+                editor.add_index(EmpPersonal, index)
+            self.stdout.write(self.style.SUCCESS(f"Created {index.name}."))
+
+        failed = []
+        for constraint in missing:
+            duplicates = self._duplicates(constraint.fields)
+            if duplicates:
+                failed.append(constraint.name)
+                self.stderr.write(f"Cannot create {constraint.name}: duplicate {', '.join(constraint.fields)} values:")
+                for row in duplicates:
+                    values = ", ".join(str(row[name]) for name in constraint.fields)
+                    self.stderr.write(f"  {values} ({row['rows']} rows)")
+                continue
+            if options["dry_run"]:
+                self.stdout.write(f"Would create {constraint.name}.")
+                continue
+            self._create(constraint)
+            self.stdout.write(self.style.SUCCESS(f"Created {constraint.name}."))
+
+        reset_upsert_keys()
+        if failed:
+            raise CommandError(f"Resolve the duplicates above, then re-run to create: {', '.join(failed)}.")
+
+    def _missing_indexes(self):
+        with connection.cursor() as cursor:
+            existing = connection.introspection.get_constraints(cursor, EmpPersonal._meta.db_table)
+        indexed = {tuple(info["columns"]) for info in existing.values() if info["index"] or info["unique"]}
+        return [
+            index
+            for index in EmpPersonal._meta.indexes
+            if tuple(EmpPersonal._meta.get_field(name).column for name in index.fields) not in indexed
+        ]
+
+    def _duplicates(self, fields):
+        # NULLs never conflict in a unique index; blank strings do.
+        queryset = EmpPersonal.objects.all()
+        for name in fields:
+            queryset = queryset.filter(**{f"{name}__isnull": False})
+        return list(
+            queryset.values(*fields)
+            .annotate(rows=Count("emp_id"))
+            .filter(rows__gt=1)
+            .order_by("-rows")[:MAX_REPORTED_DUPLICATES]
+        )
+
+    def _create(self, constraint):
+        # A plain CREATE UNIQUE INDEX: schema_editor.add_constraint() would rebuild the whole table on SQLite.
+        quote = connection.ops.quote_name
+        columns = ", ".join(quote(EmpPersonal._meta.get_field(name).column) for name in constraint.fields)
+        with connection.schema_editor() as editor:
+            editor.execute(
+                f"CREATE UNIQUE INDEX {quote(constraint.name)} ON {quote(EmpPersonal._meta.db_table)} ({columns})"
+            )
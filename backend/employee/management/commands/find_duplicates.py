@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from employee.duplicates import MAX_BLOCK_SIZE, find_duplicates, min_score, write_report
+
+
+class Command(BaseCommand):
+    help = "List probable duplicate employees as CSV (emp_id, other_id, score, reasons), comparing only rows that share a blocking key."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="-", help="CSV file to write (default: stdout).")
+        parser.add_argument("--min-score", type=float, default=None, help="Lowest score reported (default EMPLOYEE_DUPLICATE_MIN_SCORE).")
+        parser.add_argument("--max-block-size", type=int, default=MAX_BLOCK_SIZE, help="Skip blocking keys shared by more employees than this.")
+
+    def handle(self, *args, **options):
+        threshold = options["min_score"] if options["min_score"] is not None else min_score()
+        matches = find_duplicates(threshold, max_block_size=options["max_block_size"])
+        started = time.monotonic()
+        if options["output"] == "-":
+            count = write_report(matches, self.stdout)
+        else:
+            with open(options["output"], "w", newline="", encoding="utf-8") as fileobj:
+                count = write_report(matches, fileobj)
+        elapsed = time.monotonic() - started
+        self.stderr.write(self.style.SUCCESS(f"Found {count} probable duplicate pairs scoring {threshold} or more in {elapsed:.1f}s."))
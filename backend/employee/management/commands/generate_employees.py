@@ -0,0 +1,107 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+
+from employee import synthetic
+from employee.models import EmpPersonal, EmpSearchKey, allocate_change_seq
+
+
+class Command(BaseCommand):
+    help = "Insert deterministic synthetic EmpPersonal rows (for load and scaling tests)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, required=True, help="Rows to generate.")
+        parser.add_argument("--seed", type=int, default=1, help="Same seed and start give identical rows.")
+        parser.add_argument("--start", type=int, default=0, help="Index of the first row (emp_code E<index>).")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Rows per INSERT.")
+        parser.add_argument("--photo-ratio", type=float, default=0.0, help="Fraction of rows given a placeholder photo.")
+        parser.add_argument("--create-table", action="store_true", help="Create EMP_PERSONAL if it does not exist.")
+        parser.add_argument("--skip-search-index", action="store_true", help="Don't write EMP_SEARCH_KEY rows.")
+
+    def handle(self, *args, **options):
+        if options["count"] <= 0:
+            raise CommandError("--count must be positive.")
+        self._ensure_tables(options["create_table"])
+
+        workers = options["workers"] or os.cpu_count() or 1
+        if connection.vendor == "sqlite" and workers > 1:
+            # SQLite has a single writer; extra processes would only queue on its lock.
+            self.stdout.write("SQLite allows one writer at a time; using 1 worker.")
+            workers = 1
+
+        # Rows get explicit ids above the current maximum, so workers never collide.
+        first_emp_id = (EmpPersonal.objects.aggregate(last=models.Max("emp_id"))["last"] or 0) + 1
+        # One change_seq for the whole load, committed up front so the workers never wait on the counter.
+        with transaction.atomic():
+            change_seq = allocate_change_seq(connection.alias)
+        connection.close()
+
+        started = time.monotonic()
+        rows = photos = 0
+        jobs = list(synthetic.blocks(options["count"], options["start"]))
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=synthetic.init_worker,
+        )
+        try:
+            pending = set()
+            for block, first_index, size in jobs:
+                pending.add(
+                    executor.submit(
+                        synthetic.generate_block,
+                        options["seed"],
+                        block,
+                        first_index,
+                        size,
+                        first_emp_id + (first_index - options["start"]),
+                        change_seq,
+                        batch_size=options["batch_size"],
+                        photo_ratio=options["photo_ratio"],
+                        media_root=str(settings.MEDIA_ROOT) if options["photo_ratio"] else None,
+                        index_keys=not options["skip_search_index"],
+                    )
+                )
+                # Keep a couple of blocks queued per worker; the rest wait here.
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    rows, photos = self._collect(done, rows, photos, options["count"], started)
+            done, _ = wait(pending)
+            rows, photos = self._collect(done, rows, photos, options["count"], started)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {rows} employees ({photos} with photos) in {time.monotonic() - started:.1f}s.")
+        )
+        if options["skip_search_index"]:
+            self.stdout.write("Search keys were skipped; run rebuild_search_index before using search.")
+        self.stdout.write("Change-feed clients should do a full resync (no `since`) to pick up the generated rows.")
+
+    def _collect(self, done, rows, photos, total, started):
+        for future in done:
+            block_rows, block_photos = future.result()
+            rows += block_rows
+            photos += block_photos
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"  {rows}/{total} rows ({rows / elapsed:,.0f} rows/s)")
+        return rows, photos
+
+    def _ensure_tables(self, create):
+        tables = connection.introspection.table_names()
+        if EmpSearchKey._meta.db_table not in tables:
+            raise CommandError(f"{EmpSearchKey._meta.db_table} does not exist; run migrate first.")
+        if EmpPersonal._meta.db_table in tables:
+            return
+        if not create:
+            raise CommandError(f"{EmpPersonal._meta.db_table} does not exist; pass --create-table to create it.")
+        # create_model ignores Meta.managed, which is what lets it build the unmanaged table.
+        with connection.schema_editor() as editor:
+            editor.create_model(EmpPersonal)
+        self.stdout.write(f"Created table {EmpPersonal._meta.db_table}.")
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employee.importer import DEFAULT_BATCH_SIZE, ImportFormatError, import_employees, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import EmpPersonal rows from a CSV or XLSX file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to a .csv or .xlsx file.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--user-id", type=int, default=None, help="Recorded as updated_by/photo_added_by.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with open(path, "rb") as fileobj:
+                report = import_employees(
+                    iter_rows(fileobj, path),
+                    user_id=options["user_id"],
+                    batch_size=options["batch_size"],
+                )
+        except OSError as exc:
+            raise CommandError(f"Could not open {path}: {exc}") from exc
+        except ImportFormatError as exc:
+            if exc.report is None:
+                raise CommandError(str(exc)) from exc
+            raise CommandError(f"{exc} Imported {exc.report.created} of {exc.report.total} rows before the error.") from exc
+
+        for error in report.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        if report.failed > len(report.errors):
+            self.stderr.write(f"... {report.failed - len(report.errors)} more failed rows not shown.")
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {report.created} of {report.total} rows ({report.failed} failed).")
+        )
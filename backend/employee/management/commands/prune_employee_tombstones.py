@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from employee.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Drop change-feed tombstones of employees deleted more than --days ago (run daily, e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Default: EMPLOYEE_TOMBSTONE_RETENTION_DAYS (90).")
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else getattr(settings, "EMPLOYEE_TOMBSTONE_RETENTION_DAYS", 90)
+        pruned = prune_tombstones(timezone.now() - timedelta(days=days))
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} tombstones older than {days} days."))
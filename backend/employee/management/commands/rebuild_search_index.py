@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from employee.models import EmpPersonal
+from employee.search import reindex_queryset
+
+
+class Command(BaseCommand):
+    help = "Rebuild EMP_SEARCH_KEY from EMP_PERSONAL (run once after migrating, or after bulk SQL loads)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = reindex_queryset(EmpPersonal.objects.all(), chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} employees."))
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employee.printing import FORMATS, SHEETS, id_card_stream, select_employees, shutdown_executor
+from employee.queries import FILTER_FIELDS
+
+
+class Command(BaseCommand):
+    help = "Render ID cards for selected employees into one PDF or ZIP file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Path of the .pdf or .zip file to write.")
+        parser.add_argument("--ids", default="", help="Comma-separated emp_ids (default: every employee matching the filters).")
+        for name in FILTER_FIELDS:
+            parser.add_argument(f"--{name}", default=None)
+        parser.add_argument("--sheet", choices=SHEETS, default="card", help="card: one card per page; a4: 10 per A4 sheet.")
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        fmt = output.rsplit(".", 1)[-1].lower()
+        if fmt not in FORMATS:
+            raise CommandError(f"Output must end in one of: {', '.join('.' + f for f in FORMATS)}.")
+        try:
+            ids = [int(value) for value in options["ids"].split(",") if value.strip()]
+        except ValueError:
+            raise CommandError("--ids must be comma-separated emp_ids.") from None
+        filters = {name: options[name] for name in FILTER_FIELDS if options[name]}
+
+        queryset = select_employees(ids, filters)
+        cards = 0
+
+        def on_card(record):
+            nonlocal cards
+            cards += 1
+
+        started = time.monotonic()
+        try:
+            with open(output, "wb") as fileobj:
+                for chunk in id_card_stream(queryset, fmt, options["sheet"], on_card=on_card):
+                    fileobj.write(chunk)
+        finally:
+            shutdown_executor()
+        elapsed = time.monotonic() - started
+        rate = cards / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(f"Rendered {cards} cards to {output} in {elapsed:.1f}s ({rate:.0f} cards/s)."))
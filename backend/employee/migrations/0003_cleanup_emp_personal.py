@@ -8,6 +8,8 @@ class Migration(migrations.Migration):
 
     def drop_columns(apps, schema_editor):
         connection = connections[schema_editor.connection.alias]
+        if connection.vendor != "mysql" or "EMP_PERSONAL" not in connection.introspection.table_names():
+            return
         db_name = connection.settings_dict.get("NAME")
         columns = ["photo", "attribute", "attribute2", "attribute3", "attribute4", "attribute5", "attribute6"]
         with connection.cursor() as cursor:
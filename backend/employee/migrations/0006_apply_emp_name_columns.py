@@ -3,6 +3,8 @@ from django.db import connections, migrations
 
 def add_columns(apps, schema_editor):
     connection = connections[schema_editor.connection.alias]
+    if connection.vendor != "mysql" or "EMP_PERSONAL" not in connection.introspection.table_names():
+        return
     db_name = connection.settings_dict.get("NAME")
     columns = [
         ("emp_name", "VARCHAR(64)"),
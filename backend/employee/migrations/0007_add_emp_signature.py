@@ -3,6 +3,8 @@ from django.db import migrations, models, connections
 
 def add_emp_signature_column(apps, schema_editor):
     connection = connections[schema_editor.connection.alias]
+    if connection.vendor != "mysql" or "EMP_PERSONAL" not in connection.introspection.table_names():
+        return
     db_name = connection.settings_dict.get("NAME")
     with connection.cursor() as cursor:
         cursor.execute(
@@ -0,0 +1,30 @@
+# Generated by Django 4.1.5 on 2026-10-18 14:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0008_auto_update_date_auto_now'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmpSearchKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('id', 'Identifier'), ('name', 'Name token')], max_length=4)),
+                ('key', models.CharField(max_length=64)),
+                ('employee', models.ForeignKey(db_column='emp_id', db_constraint=False, on_delete=django.db.models.deletion.CASCADE, related_name='search_keys', to='employee.emppersonal')),
+            ],
+            options={
+                'db_table': 'EMP_SEARCH_KEY',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='empsearchkey',
+            index=models.Index(fields=['kind', 'key'], name='emp_search_kind_key_idx'),
+        ),
+    ]
@@ -0,0 +1,87 @@
+from django.db import connections, migrations, models
+
+KEY_COLUMNS = [
+    ("bang_emp_name_norm", "VARCHAR(96)"),
+    ("bang_emp_name_phon", "VARCHAR(48)"),
+    ("bang_father_name_norm", "VARCHAR(96)"),
+    ("bang_father_name_phon", "VARCHAR(48)"),
+    ("bang_mother_name_norm", "VARCHAR(96)"),
+    ("bang_mother_name_phon", "VARCHAR(48)"),
+    ("bang_husband_name_norm", "VARCHAR(96)"),
+    ("bang_husband_name_phon", "VARCHAR(48)"),
+]
+
+
+def add_key_columns(apps, schema_editor):
+    connection = connections[schema_editor.connection.alias]
+    if connection.vendor != "mysql" or "EMP_PERSONAL" not in connection.introspection.table_names():
+        return
+    db_name = connection.settings_dict.get("NAME")
+    with connection.cursor() as cursor:
+        for name, col_type in KEY_COLUMNS:
+            cursor.execute(
+                """
+                SELECT COUNT(*) FROM information_schema.columns
+                WHERE table_schema = %s AND table_name = 'EMP_PERSONAL' AND column_name = %s
+                """,
+                [db_name, name],
+            )
+            if cursor.fetchone()[0] == 0:
+                cursor.execute(f"ALTER TABLE EMP_PERSONAL ADD COLUMN {name} {col_type} NULL")
+            cursor.execute(
+                """
+                SELECT COUNT(*) FROM information_schema.statistics
+                WHERE table_schema = %s AND table_name = 'EMP_PERSONAL' AND column_name = %s
+                """,
+                [db_name, name],
+            )
+            if cursor.fetchone()[0] == 0:
+                cursor.execute(f"CREATE INDEX EMP_PERSONAL_{name}_idx ON EMP_PERSONAL ({name})")
+
+
+def backfill_key_columns(apps, schema_editor):
+    from employee import bangla
+
+    EmpPersonal = apps.get_model("employee", "EmpPersonal")
+    if EmpPersonal._meta.db_table not in schema_editor.connection.introspection.table_names():
+        return
+    sources = ["bang_emp_name", "bang_father_name", "bang_mother_name", "bang_husband_name"]
+    batch = []
+    for emp in EmpPersonal.objects.only("emp_id", *sources).order_by("emp_id").iterator(chunk_size=2000):
+        for source in sources:
+            value = getattr(emp, source)
+            setattr(emp, f"{source}_norm", bangla.normalize(value)[:96] or None)
+            setattr(emp, f"{source}_phon", bangla.phonetic_key(value)[:48] or None)
+        batch.append(emp)
+        if len(batch) >= 2000:
+            EmpPersonal.objects.bulk_update(batch, [name for name, _ in KEY_COLUMNS])
+            batch = []
+    if batch:
+        EmpPersonal.objects.bulk_update(batch, [name for name, _ in KEY_COLUMNS])
+
+
+def key_field(max_length):
+    return models.CharField(max_length=max_length, null=True, blank=True, editable=False, db_index=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employee", "0009_emp_search_key"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_key_columns, reverse_code=migrations.RunPython.noop),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name="emppersonal",
+                    name=name,
+                    field=key_field(96 if name.endswith("_norm") else 48),
+                )
+                for name, _ in KEY_COLUMNS
+            ],
+        ),
+        migrations.RunPython(backfill_key_columns, reverse_code=migrations.RunPython.noop),
+    ]
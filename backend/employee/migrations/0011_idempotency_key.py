@@ -0,0 +1,32 @@
+# Generated by Django 4.1.5 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0010_bangla_name_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmpIdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.BigIntegerField()),
+                ('key', models.CharField(max_length=128)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('status', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('response', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'db_table': 'EMP_IDEMPOTENCY_KEY',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='empidempotencykey',
+            constraint=models.UniqueConstraint(fields=('user_id', 'key'), name='emp_idempotency_user_key_uniq'),
+        ),
+    ]
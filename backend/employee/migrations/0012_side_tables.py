@@ -0,0 +1,99 @@
+# Generated by Django 4.1.5 on 2026-10-18 15:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+SIDE_MODELS = ["EmpAddressDetail", "EmpContactDetail", "EmpEducationDetail"]
+COPY_BATCH = 20000
+
+
+def copy_side_columns(apps, schema_editor):
+    """Copy the non-blank cold columns of EMP_PERSONAL into the new side tables."""
+    connection = schema_editor.connection
+    if "EMP_PERSONAL" not in connection.introspection.table_names():
+        return
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        existing = {column.name for column in connection.introspection.get_table_description(cursor, "EMP_PERSONAL")}
+        cursor.execute("SELECT MIN(emp_id), MAX(emp_id) FROM EMP_PERSONAL")
+        low, high = cursor.fetchone()
+        if low is None:
+            return
+        for model_name in SIDE_MODELS:
+            model = apps.get_model("employee", model_name)
+            table = quote(model._meta.db_table)
+            columns = [f.column for f in model._meta.concrete_fields if not f.primary_key and f.column in existing]
+            if not columns:
+                continue
+            targets = ", ".join(quote(column) for column in columns)
+            sources = ", ".join(f"p.{quote(column)}" for column in columns)
+            any_value = " OR ".join(f"p.{quote(column)} <> ''" for column in columns)
+            # Rows already copied are skipped, so an interrupted run can simply be repeated.
+            sql = (
+                f"INSERT INTO {table} (emp_id, {targets}) SELECT p.emp_id, {sources} FROM EMP_PERSONAL p "
+                f"WHERE p.emp_id BETWEEN %s AND %s AND ({any_value}) "
+                f"AND NOT EXISTS (SELECT 1 FROM {table} s WHERE s.emp_id = p.emp_id)"
+            )
+            for start in range(low, high + 1, COPY_BATCH):
+                cursor.execute(sql, [start, start + COPY_BATCH - 1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0011_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmpAddressDetail',
+            fields=[
+                ('employee', models.OneToOneField(db_column='emp_id', db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='address_detail', serialize=False, to='employee.emppersonal')),
+                ('pre_house_owner_bang', models.CharField(blank=True, max_length=48, null=True)),
+                ('bang_present_vill', models.CharField(blank=True, max_length=48, null=True)),
+                ('bang_present_post', models.CharField(blank=True, max_length=36, null=True)),
+                ('bang_present_ps', models.CharField(blank=True, max_length=32, null=True)),
+                ('bang_present_dist', models.CharField(blank=True, max_length=32, null=True)),
+                ('bang_permanent_vill', models.CharField(blank=True, max_length=48, null=True)),
+                ('bang_permanent_post', models.CharField(blank=True, max_length=36, null=True)),
+                ('bang_permanent_ps', models.CharField(blank=True, max_length=32, null=True)),
+                ('bang_permanent_dist', models.CharField(blank=True, max_length=32, null=True)),
+                ('parmenent_address', models.CharField(blank=True, max_length=40, null=True)),
+            ],
+            options={
+                'db_table': 'EMP_ADDRESS_DETAIL',
+            },
+        ),
+        migrations.CreateModel(
+            name='EmpContactDetail',
+            fields=[
+                ('employee', models.OneToOneField(db_column='emp_id', db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='contact_detail', serialize=False, to='employee.emppersonal')),
+                ('emergency_cell', models.CharField(blank=True, max_length=30, null=True)),
+                ('emrg_cell_no', models.CharField(blank=True, max_length=16, null=True)),
+                ('emrg_address', models.CharField(blank=True, max_length=64, null=True)),
+                ('nominee_cell_no', models.CharField(blank=True, max_length=15, null=True)),
+                ('ref_contact_name', models.CharField(blank=True, max_length=32, null=True)),
+                ('ref_relation', models.CharField(blank=True, max_length=16, null=True)),
+                ('ref_address', models.CharField(blank=True, max_length=64, null=True)),
+            ],
+            options={
+                'db_table': 'EMP_CONTACT_DETAIL',
+            },
+        ),
+        migrations.CreateModel(
+            name='EmpEducationDetail',
+            fields=[
+                ('employee', models.OneToOneField(db_column='emp_id', db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='education_detail', serialize=False, to='employee.emppersonal')),
+                ('education', models.CharField(blank=True, max_length=32, null=True)),
+                ('employement', models.CharField(blank=True, max_length=12, null=True)),
+                ('passed_year', models.CharField(blank=True, max_length=32, null=True)),
+                ('last_exp', models.CharField(blank=True, max_length=32, null=True)),
+                ('curr_activity', models.CharField(blank=True, max_length=32, null=True)),
+                ('sob', models.CharField(blank=True, max_length=32, null=True)),
+            ],
+            options={
+                'db_table': 'EMP_EDUCATION_DETAIL',
+            },
+        ),
+        migrations.RunPython(copy_side_columns, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+from django.db import connections, migrations
+
+# Moved to EMP_ADDRESS_DETAIL / EMP_CONTACT_DETAIL / EMP_EDUCATION_DETAIL by 0012.
+MOVED_COLUMNS = [
+    "pre_house_owner_bang",
+    "bang_present_vill",
+    "bang_present_post",
+    "bang_present_ps",
+    "bang_present_dist",
+    "bang_permanent_vill",
+    "bang_permanent_post",
+    "bang_permanent_ps",
+    "bang_permanent_dist",
+    "parmenent_address",
+    "emergency_cell",
+    "emrg_cell_no",
+    "emrg_address",
+    "nominee_cell_no",
+    "ref_contact_name",
+    "ref_relation",
+    "ref_address",
+    "education",
+    "employement",
+    "passed_year",
+    "last_exp",
+    "curr_activity",
+    "sob",
+]
+SIDE_MODELS = ["EmpAddressDetail", "EmpContactDetail", "EmpEducationDetail"]
+
+
+def restore_columns(apps, schema_editor):
+    """Backwards: put the side-table values back into EMP_PERSONAL for the previous release.
+
+    The columns are only dropped later, by ``manage.py drop_moved_employee_columns``;
+    any that already are get added back first.
+    """
+    connection = connections[schema_editor.connection.alias]
+    if "EMP_PERSONAL" not in connection.introspection.table_names():
+        return
+    personal = apps.get_model("employee", "EmpPersonal")
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        existing = {column.name.lower() for column in connection.introspection.get_table_description(cursor, "EMP_PERSONAL")}
+    for name in MOVED_COLUMNS:
+        if name not in existing:
+            schema_editor.add_field(personal, personal._meta.get_field(name))
+    for model_name in SIDE_MODELS:
+        model = apps.get_model("employee", model_name)
+        table = quote(model._meta.db_table)
+        columns = [f.column for f in model._meta.concrete_fields if not f.primary_key]
+        assignments = ", ".join(f"{quote(column)} = (SELECT s.{quote(column)} FROM {table} s WHERE s.emp_id = EMP_PERSONAL.emp_id)" for column in columns)
+        schema_editor.execute(f"UPDATE EMP_PERSONAL SET {assignments} WHERE EXISTS (SELECT 1 FROM {table} s WHERE s.emp_id = EMP_PERSONAL.emp_id)")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employee", "0012_side_tables"),
+    ]
+
+    # The model stops mapping the moved columns, but they stay in EMP_PERSONAL, so the
+    # previous release still runs against this schema. Drop them with
+    # `manage.py drop_moved_employee_columns` once the side tables are proven.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(migrations.RunPython.noop, reverse_code=restore_columns),
+            ],
+            state_operations=[migrations.RemoveField(model_name="emppersonal", name=name) for name in MOVED_COLUMNS],
+        ),
+    ]
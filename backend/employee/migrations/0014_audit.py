@@ -0,0 +1,33 @@
+# Generated by Django 4.1.5 on 2026-10-18 15:20
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0013_drop_side_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmpAuditEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('emp_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update')], max_length=8)),
+                ('source', models.CharField(max_length=16)),
+                ('changed_by', models.BigIntegerField(blank=True, null=True)),
+                ('changed_at', models.DateTimeField()),
+                ('changes', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+            ],
+            options={
+                'db_table': 'EMP_AUDIT',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='empauditentry',
+            index=models.Index(fields=['emp_id', 'id'], name='emp_audit_emp_idx'),
+        ),
+    ]
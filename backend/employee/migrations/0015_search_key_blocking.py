@@ -0,0 +1,18 @@
+# Generated by Django 4.1.5 on 2026-10-18 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0014_audit'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='empsearchkey',
+            name='kind',
+            field=models.CharField(choices=[('id', 'Identifier'), ('name', 'Name token'), ('blk', 'Duplicate blocking key')], max_length=4),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 4.1.5 on 2026-10-18 15:41
+
+from django.db import connections, migrations, models
+
+INDEX_NAME = "emp_personal_change_seq_idx"
+
+
+def add_change_seq_column(apps, schema_editor):
+    connection = connections[schema_editor.connection.alias]
+    if "EMP_PERSONAL" not in connection.introspection.table_names():
+        return
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        columns = {column.name.lower() for column in connection.introspection.get_table_description(cursor, "EMP_PERSONAL")}
+        if "change_seq" not in columns:
+            cursor.execute(f"ALTER TABLE {quote('EMP_PERSONAL')} ADD COLUMN change_seq BIGINT NULL")
+        indexes = connection.introspection.get_constraints(cursor, "EMP_PERSONAL")
+        if not any(info["columns"][:1] == ["change_seq"] for info in indexes.values()):
+            cursor.execute(f"CREATE INDEX {INDEX_NAME} ON {quote('EMP_PERSONAL')} (change_seq, emp_id)")
+
+
+def start_sequence(apps, schema_editor):
+    """Existing rows all get change_seq 1; the feed pages through them by emp_id."""
+    EmpChangeSequence = apps.get_model("employee", "EmpChangeSequence")
+    connection = connections[schema_editor.connection.alias]
+    value = 0
+    if "EMP_PERSONAL" in connection.introspection.table_names():
+        with connection.cursor() as cursor:
+            cursor.execute(f"UPDATE {connection.ops.quote_name('EMP_PERSONAL')} SET change_seq = 1 WHERE change_seq IS NULL")
+        value = 1
+    EmpChangeSequence.objects.get_or_create(pk=1, defaults={"value": value})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employee', '0015_search_key_blocking'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmpChangeSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0)),
+                ('pruned_through', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'EMP_CHANGE_SEQ',
+            },
+        ),
+        migrations.CreateModel(
+            name='EmpTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('emp_id', models.BigIntegerField()),
+                ('change_seq', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'EMP_TOMBSTONE',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='emptombstone',
+            index=models.Index(fields=['change_seq', 'emp_id'], name='emp_tombstone_seq_idx'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_change_seq_column, reverse_code=migrations.RunPython.noop),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='emppersonal',
+                    name='change_seq',
+                    field=models.BigIntegerField(blank=True, editable=False, null=True),
+                ),
+            ],
+        ),
+        migrations.RunPython(start_sequence, reverse_code=migrations.RunPython.noop),
+    ]
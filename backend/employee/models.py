@@ -1,7 +1,10 @@
 from datetime import date
 
-from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import NotSupportedError, connections, models, router, transaction
+
+from . import bangla
 
 SEX_CHOICES = (
     ("male", "Male"),
@@ -41,8 +44,181 @@ CONTRACTUAL_CHOICES = (
     ("N", "No"),
 )
 
+# Fields every new employee must have; shared by the admin form and the API schema.
+EMPLOYEE_REQUIRED_FIELDS = (
+    "emp_code",
+    "emp_name",
+    "date_of_birth",
+    "sex",
+    "religion",
+    "blood_group",
+    "marital_status",
+    "nationality",
+    "contact_no",
+    "national_id",
+    "present_vill",
+    "present_dist",
+    "present_address",
+    "parmanent_vill",
+    "parmanent_dist",
+    "permanent_address",
+    "emp_photo",
+)
+
+# Columns an upsert matches on, in order of preference.
+UPSERT_KEYS = ("emp_code", "national_id")
+
+# Bangla name field -> (normalized key column, phonetic key column).
+BANGLA_NAME_KEY_FIELDS = {
+    "bang_emp_name": ("bang_emp_name_norm", "bang_emp_name_phon"),
+    "bang_father_name": ("bang_father_name_norm", "bang_father_name_phon"),
+    "bang_mother_name": ("bang_mother_name_norm", "bang_mother_name_phon"),
+    "bang_husband_name": ("bang_husband_name_norm", "bang_husband_name_phon"),
+}
+
+
+# Instance attribute listing the side tables (by relation name) with unsaved changes.
+DIRTY_SIDE_TABLES = "_dirty_side_tables"
+
+
+def allocate_change_seq(using):
+    """Next value of the employee change sequence (EMP_CHANGE_SEQ), in the caller's transaction.
+
+    Incrementing the counter row locks it until that transaction ends, so
+    writers that allocate one commit in sequence order: once a value is visible,
+    every lower value is too, and a change feed cursor never skips a late commit.
+
+    The price is that the single counter row serializes every EMP_PERSONAL
+    write: a second writer waits on the lock until the first one commits. That
+    includes a long import or upsert batch, so keep such transactions short
+    (the importer commits per batch) and allocate only when something is written.
+
+    Lock order: allocate *before* locking or writing any EMP_PERSONAL row
+    (``select_for_update()``, UPDATE, INSERT ... ON DUPLICATE KEY UPDATE,
+    DELETE). Every write path takes the counter first and the rows second; one
+    that locked a row and then the counter would deadlock against the others.
+    A caller that must lock a row before saving it allocates first and hands
+    the value to ``EmpPersonal.save(change_seq=...)``.
+    """
+    counter = EmpChangeSequence.objects.using(using).filter(pk=EmpChangeSequence.SINGLETON)
+    if not counter.update(value=models.F("value") + 1):
+        EmpChangeSequence.objects.using(using).get_or_create(pk=EmpChangeSequence.SINGLETON)
+        counter.update(value=models.F("value") + 1)
+    return counter.values_list("value", flat=True).get()
+
+
+class EmpPersonalQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """Insert ``objs`` and write their search keys and side-table rows in the same transaction.
+
+        Backends that cannot return primary keys from a bulk insert (MySQL) index
+        the rows above the pre-insert ``MAX(emp_id)`` instead, or read the ids
+        back from ``LAST_INSERT_ID()`` when side-table rows need them.
+        """
+        from .search import index_employees, reindex_queryset
+
+        objs = list(objs)
+        if not objs:
+            return objs
+        for obj in objs:
+            obj.refresh_name_keys()
+        base = self.model._base_manager.using(self.db)
+        connection = connections[self.db]
+        with transaction.atomic(using=self.db, savepoint=False):
+            # One change_seq for the whole batch; the feed orders ties by emp_id.
+            change_seq = allocate_change_seq(self.db)
+            for obj in objs:
+                obj.change_seq = change_seq
+            if kwargs.get("update_conflicts"):
+                if "change_seq" not in kwargs["update_fields"]:
+                    kwargs["update_fields"] = [*kwargs["update_fields"], "change_seq"]
+                # Upserted rows may be inserts or updates and come back without
+                # pks, so they are found again by their unique keys.
+                created = super().bulk_create(objs, *args, **kwargs)
+                matches = models.Q()
+                for key in UPSERT_KEYS:
+                    values = [getattr(obj, key) for obj in objs if getattr(obj, key) is not None]
+                    if values:
+                        matches |= models.Q(**{f"{key}__in": values})
+                if matches:
+                    reindex_queryset(base.filter(matches))
+                    self._assign_upserted_pks(objs, base.filter(matches))
+                    # A full-record upsert replaces the side-table rows as well.
+                    _write_side_records(objs, self.db, replace=True)
+                return created
+            with_side_rows = any(obj.__dict__.get(DIRTY_SIDE_TABLES) for obj in objs)
+            watermark = None
+            if connection.features.can_return_rows_from_bulk_insert:
+                created = super().bulk_create(objs, *args, **kwargs)
+            elif with_side_rows:
+                if connection.vendor != "mysql" or args or kwargs.keys() - {"batch_size"}:
+                    raise NotSupportedError("Bulk inserts with side-table values need returned ids or MySQL's LAST_INSERT_ID().")
+                created = self._bulk_insert_reading_ids(objs, kwargs.get("batch_size"))
+            else:
+                watermark = base.aggregate(last=models.Max("emp_id"))["last"] or 0
+                created = super().bulk_create(objs, *args, **kwargs)
+            if watermark is None:
+                index_employees(created)
+            else:
+                reindex_queryset(base.filter(emp_id__gt=watermark))
+            if with_side_rows:
+                _write_side_records(created, self.db)
+        return created
+
+    def update(self, **kwargs):
+        """``QuerySet.update()`` that also moves the updated rows to the end of the change feed."""
+        with transaction.atomic(using=self.db, savepoint=False):
+            if "change_seq" not in kwargs:
+                # Matching nothing must not take the sequence lock (see allocate_change_seq).
+                if not self.exists():
+                    return 0
+                kwargs["change_seq"] = allocate_change_seq(self.db)
+            return super().update(**kwargs)
+
+    def _bulk_insert_reading_ids(self, objs, batch_size=None):
+        """Insert ``objs`` batch by batch on MySQL and set their pks from ``LAST_INSERT_ID()``.
+
+        Each batch is one multi-row INSERT, for which InnoDB reserves a single
+        block of ids, so row ``i`` got ``LAST_INSERT_ID() + i * auto_increment_increment``.
+        """
+        batch_size = batch_size or len(objs)
+        with connections[self.db].cursor() as cursor:
+            cursor.execute("SELECT @@auto_increment_increment")
+            (step,) = cursor.fetchone()
+            for start in range(0, len(objs), batch_size):
+                batch = objs[start : start + batch_size]
+                super().bulk_create(batch)
+                cursor.execute("SELECT LAST_INSERT_ID()")
+                (first_id,) = cursor.fetchone()
+                for offset, obj in enumerate(batch):
+                    obj.pk = first_id + offset * step
+        return objs
+
+    @staticmethod
+    def _assign_upserted_pks(objs, queryset):
+        """Set each upserted obj's pk from the row holding its first non-null UPSERT_KEYS value."""
+        ids = {key: {} for key in UPSERT_KEYS}
+        for emp_id, *values in queryset.values_list("emp_id", *UPSERT_KEYS):
+            for key, value in zip(UPSERT_KEYS, values):
+                if value is not None:
+                    ids[key][value] = emp_id
+        for obj in objs:
+            for key in UPSERT_KEYS:
+                value = getattr(obj, key)
+                if value is not None:
+                    obj.pk = ids[key].get(value)
+                    break
+
 
 class EmpPersonal(models.Model):
+    """One employee. Rarely read column groups live in one-to-one side tables.
+
+    These are the Bangla addresses, the emergency and reference contacts and the
+    education history. Each of their columns is still an attribute of
+    EmpPersonal (see SIDE_FIELDS); its table is queried the first time one of
+    them is read, and it is written by ``save()``.
+    """
+
     emp_id = models.BigAutoField(primary_key=True)
 
     emp_code = models.CharField(max_length=10, null=True, blank=True)
@@ -73,7 +249,6 @@ class EmpPersonal(models.Model):
     child_female = models.IntegerField(null=True, blank=True)
 
     contact_no = models.CharField(max_length=30, null=True, blank=True)
-    emergency_cell = models.CharField(max_length=30, null=True, blank=True)
 
     town_of_birth = models.CharField(max_length=30, null=True, blank=True)
     national_id = models.CharField(max_length=20, null=True, blank=True)
@@ -82,10 +257,6 @@ class EmpPersonal(models.Model):
     contractual = models.CharField(max_length=1, default="N", choices=CONTRACTUAL_CHOICES)
     e_mail = models.EmailField(max_length=32, null=True, blank=True)
 
-    education = models.CharField(max_length=32, null=True, blank=True)
-    employement = models.CharField(max_length=12, null=True, blank=True)  # typo preserved
-    nominee_cell_no = models.CharField(max_length=15, null=True, blank=True)
-
     pre_house_owner = models.CharField(max_length=32, null=True, blank=True)
 
     present_vill = models.CharField(max_length=48, null=True, blank=True)
@@ -100,23 +271,20 @@ class EmpPersonal(models.Model):
     parmanent_dist = models.CharField(max_length=32, null=True, blank=True)
     permanent_address = models.CharField(max_length=96, null=True, blank=True)
 
-    parmenent_address = models.CharField(max_length=40, null=True, blank=True)
-
     bang_emp_name = models.CharField(max_length=64, null=True, blank=True)
     bang_father_name = models.CharField(max_length=32, null=True, blank=True)
     bang_mother_name = models.CharField(max_length=32, null=True, blank=True)
     bang_husband_name = models.CharField(max_length=32, null=True, blank=True)
 
-    pre_house_owner_bang = models.CharField(max_length=48, null=True, blank=True)
-    bang_present_vill = models.CharField(max_length=48, null=True, blank=True)
-    bang_present_post = models.CharField(max_length=36, null=True, blank=True)
-    bang_present_ps = models.CharField(max_length=32, null=True, blank=True)
-    bang_present_dist = models.CharField(max_length=32, null=True, blank=True)
-
-    bang_permanent_vill = models.CharField(max_length=48, null=True, blank=True)
-    bang_permanent_post = models.CharField(max_length=36, null=True, blank=True)
-    bang_permanent_ps = models.CharField(max_length=32, null=True, blank=True)
-    bang_permanent_dist = models.CharField(max_length=32, null=True, blank=True)
+    # Shadow keys derived from the bang_*_name fields on every write; see refresh_name_keys().
+    bang_emp_name_norm = models.CharField(max_length=96, null=True, blank=True, editable=False, db_index=True)
+    bang_emp_name_phon = models.CharField(max_length=48, null=True, blank=True, editable=False, db_index=True)
+    bang_father_name_norm = models.CharField(max_length=96, null=True, blank=True, editable=False, db_index=True)
+    bang_father_name_phon = models.CharField(max_length=48, null=True, blank=True, editable=False, db_index=True)
+    bang_mother_name_norm = models.CharField(max_length=96, null=True, blank=True, editable=False, db_index=True)
+    bang_mother_name_phon = models.CharField(max_length=48, null=True, blank=True, editable=False, db_index=True)
+    bang_husband_name_norm = models.CharField(max_length=96, null=True, blank=True, editable=False, db_index=True)
+    bang_husband_name_phon = models.CharField(max_length=48, null=True, blank=True, editable=False, db_index=True)
 
     photo_added_by = models.BigIntegerField(null=True, blank=True)
 
@@ -133,28 +301,347 @@ class EmpPersonal(models.Model):
     present_postal_code = models.CharField(max_length=6, null=True, blank=True)
     permanent_postal_code = models.CharField(max_length=6, null=True, blank=True)
 
-    passed_year = models.CharField(max_length=32, null=True, blank=True)
-    last_exp = models.CharField(max_length=32, null=True, blank=True)
-    curr_activity = models.CharField(max_length=32, null=True, blank=True)
-    sob = models.CharField(max_length=32, null=True, blank=True)
-
     nationality = models.CharField(max_length=32, null=True, blank=True)
     smart_id = models.CharField(max_length=16, null=True, blank=True)
     pasport_no = models.CharField(max_length=16, null=True, blank=True)
     tin_no = models.CharField(max_length=16, null=True, blank=True)
 
-    emrg_cell_no = models.CharField(max_length=16, null=True, blank=True)
-    emrg_address = models.CharField(max_length=64, null=True, blank=True)
+    # Position in the change feed (employee.changes): set from EMP_CHANGE_SEQ on every write.
+    change_seq = models.BigIntegerField(null=True, blank=True, editable=False)
 
-    ref_contact_name = models.CharField(max_length=32, null=True, blank=True)
-    ref_relation = models.CharField(max_length=16, null=True, blank=True)
-    ref_address = models.CharField(max_length=64, null=True, blank=True)
+    objects = EmpPersonalQuerySet.as_manager()
 
     class Meta:
         db_table = "EMP_PERSONAL"
         verbose_name = "Employee Personal"
         verbose_name_plural = "Employee Personal"
         managed = False  # existing table created by accounts app
+        # The table is unmanaged, so migrate never creates these constraints and
+        # indexes; ``manage.py ensure_employee_indexes`` does. The unique ones are the upsert keys.
+        constraints = [
+            models.UniqueConstraint(fields=["emp_code"], name="emp_personal_emp_code_uniq"),
+            models.UniqueConstraint(fields=["national_id"], name="emp_personal_national_id_uniq"),
+        ]
+        # Admin list filters and the API list filters; InnoDB appends emp_id to each,
+        # so filtered pages ordered by emp_id are index range scans.
+        indexes = [
+            models.Index(fields=["present_dist"], name="emp_personal_present_dist_idx"),
+            models.Index(fields=["sex"], name="emp_personal_sex_idx"),
+            models.Index(fields=["religion"], name="emp_personal_religion_idx"),
+            models.Index(fields=["contractual"], name="emp_personal_contractual_idx"),
+            # The change feed pages on (change_seq, emp_id); migration 0016 creates this one too.
+            models.Index(fields=["change_seq", "emp_id"], name="emp_personal_change_seq_idx"),
+        ]
 
     def __str__(self):
         return self.emp_code or f"Emp {self.emp_id}"
+
+    def refresh_name_keys(self, sources=None):
+        for source, (norm_field, phon_field) in BANGLA_NAME_KEY_FIELDS.items():
+            if sources is not None and source not in sources:
+                continue
+            value = getattr(self, source)
+            norm_max = self._meta.get_field(norm_field).max_length
+            phon_max = self._meta.get_field(phon_field).max_length
+            setattr(self, norm_field, bangla.normalize(value)[:norm_max] or None)
+            setattr(self, phon_field, bangla.phonetic_key(value)[:phon_max] or None)
+
+    def side_record(self, relation, create=True):
+        """This employee's row in the ``relation`` side table, loaded on first use and cached.
+
+        Employees without one get a new unsaved row, or None if ``create`` is false.
+        """
+        try:
+            return getattr(self, relation)
+        except ObjectDoesNotExist:
+            if not create:
+                return None
+            return self._meta.get_field(relation).related_model(employee=self)
+
+    def save(self, *args, change_seq=None, **kwargs):
+        """Save, stamping ``change_seq``: the given one, already allocated in this transaction, or a new one."""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not update_fields:
+            return  # Django's "save nothing"
+        if update_fields is None:
+            self.refresh_name_keys()
+        else:
+            # Only touch the keys of names being written, so a partial save of a
+            # deferred instance doesn't load (or rewrite) the other name columns.
+            # Side-table columns are written below, with their own row.
+            update_fields = [name for name in update_fields if name not in SIDE_FIELDS]
+            sources = [source for source in BANGLA_NAME_KEY_FIELDS if source in update_fields]
+            self.refresh_name_keys(sources)
+            for source in sources:
+                update_fields.extend(BANGLA_NAME_KEY_FIELDS[source])
+            update_fields.append("change_seq")
+            kwargs["update_fields"] = update_fields
+        dirty = self.__dict__.get(DIRTY_SIDE_TABLES)
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            # Allocated right before the write: the counter row stays locked until commit.
+            self.change_seq = allocate_change_seq(using) if change_seq is None else change_seq
+            super().save(*args, **kwargs)
+            for relation in dirty or ():
+                record = getattr(self, relation)
+                record.employee = self
+                record.save(using=using, force_insert=record._state.adding)
+        if dirty:
+            dirty.clear()
+
+
+def _employee_link(related_name):
+    return models.OneToOneField(
+        EmpPersonal,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        db_column="emp_id",
+        db_constraint=False,
+        related_name=related_name,
+    )
+
+
+class EmpAddressDetail(models.Model):
+    """Bangla present/permanent address blocks and the legacy ``parmenent_address``."""
+
+    employee = _employee_link("address_detail")
+
+    pre_house_owner_bang = models.CharField(max_length=48, null=True, blank=True)
+    bang_present_vill = models.CharField(max_length=48, null=True, blank=True)
+    bang_present_post = models.CharField(max_length=36, null=True, blank=True)
+    bang_present_ps = models.CharField(max_length=32, null=True, blank=True)
+    bang_present_dist = models.CharField(max_length=32, null=True, blank=True)
+
+    bang_permanent_vill = models.CharField(max_length=48, null=True, blank=True)
+    bang_permanent_post = models.CharField(max_length=36, null=True, blank=True)
+    bang_permanent_ps = models.CharField(max_length=32, null=True, blank=True)
+    bang_permanent_dist = models.CharField(max_length=32, null=True, blank=True)
+
+    parmenent_address = models.CharField(max_length=40, null=True, blank=True)
+
+    class Meta:
+        db_table = "EMP_ADDRESS_DETAIL"
+
+    def __str__(self):
+        return f"Address of {self.employee_id}"
+
+
+class EmpContactDetail(models.Model):
+    """Emergency, nominee and reference contacts."""
+
+    employee = _employee_link("contact_detail")
+
+    emergency_cell = models.CharField(max_length=30, null=True, blank=True)
+    emrg_cell_no = models.CharField(max_length=16, null=True, blank=True)
+    emrg_address = models.CharField(max_length=64, null=True, blank=True)
+    nominee_cell_no = models.CharField(max_length=15, null=True, blank=True)
+
+    ref_contact_name = models.CharField(max_length=32, null=True, blank=True)
+    ref_relation = models.CharField(max_length=16, null=True, blank=True)
+    ref_address = models.CharField(max_length=64, null=True, blank=True)
+
+    class Meta:
+        db_table = "EMP_CONTACT_DETAIL"
+
+    def __str__(self):
+        return f"Contacts of {self.employee_id}"
+
+
+class EmpEducationDetail(models.Model):
+    """Education and work history."""
+
+    employee = _employee_link("education_detail")
+
+    education = models.CharField(max_length=32, null=True, blank=True)
+    employement = models.CharField(max_length=12, null=True, blank=True)  # typo preserved
+    passed_year = models.CharField(max_length=32, null=True, blank=True)
+    last_exp = models.CharField(max_length=32, null=True, blank=True)
+    curr_activity = models.CharField(max_length=32, null=True, blank=True)
+    sob = models.CharField(max_length=32, null=True, blank=True)
+
+    class Meta:
+        db_table = "EMP_EDUCATION_DETAIL"
+
+    def __str__(self):
+        return f"Education of {self.employee_id}"
+
+
+# EmpPersonal relation name -> side model.
+SIDE_TABLES = {
+    model._meta.get_field("employee").remote_field.related_name: model
+    for model in (EmpAddressDetail, EmpContactDetail, EmpEducationDetail)
+}
+
+# Side-table column -> EmpPersonal relation name of its table.
+SIDE_FIELDS = {
+    field.name: relation
+    for relation, model in SIDE_TABLES.items()
+    for field in model._meta.concrete_fields
+    if not field.primary_key
+}
+
+
+def _side_field(relation, name):
+    def getter(self):
+        record = self.side_record(relation, create=False)
+        return None if record is None else getattr(record, name)
+
+    def setter(self, value):
+        # Blank values don't create a row, which keeps the side tables sparse.
+        record = self.side_record(relation, create=value not in (None, ""))
+        if record is None:
+            return
+        setattr(record, name, value)
+        self.__dict__.setdefault(DIRTY_SIDE_TABLES, set()).add(relation)
+
+    return property(getter, setter, doc=f"``{relation}.{name}``")
+
+
+# Properties (not fields), so EmpPersonal(**row) and schema-built instances
+# accept side-table columns like any other attribute.
+for _name, _relation in SIDE_FIELDS.items():
+    setattr(EmpPersonal, _name, _side_field(_relation, _name))
+
+
+def _write_side_records(objs, using, replace=False):
+    """Insert the side-table rows set on bulk-inserted ``objs`` (which must have pks by now).
+
+    With ``replace`` (upserts), rows are upserted and an employee with no values
+    for a table loses its old row there.
+    """
+    connection = connections[using]
+    for relation, model in SIDE_TABLES.items():
+        records, cleared = [], []
+        for obj in objs:
+            if obj.pk is None:
+                continue
+            if relation in obj.__dict__.get(DIRTY_SIDE_TABLES, ()):
+                record = getattr(obj, relation)
+                record.employee = obj
+                records.append(record)
+            elif replace:
+                cleared.append(obj.pk)
+        if cleared:
+            model.objects.using(using).filter(employee_id__in=cleared).delete()
+        if not records:
+            continue
+        options = {}
+        if replace:
+            options = {"update_conflicts": True, "update_fields": [name for name, rel in SIDE_FIELDS.items() if rel == relation]}
+            if connection.features.supports_update_conflicts_with_target:
+                options["unique_fields"] = ["employee"]
+        model.objects.using(using).bulk_create(records, **options)
+    for obj in objs:
+        obj.__dict__.pop(DIRTY_SIDE_TABLES, None)
+
+
+class EmpSearchKey(models.Model):
+    """Normalized lookup and duplicate-blocking keys for EmpPersonal, maintained by ``employee.search``."""
+
+    KIND_IDENTIFIER = "id"
+    KIND_NAME = "name"
+    KIND_BLOCK = "blk"
+    KIND_CHOICES = (
+        (KIND_IDENTIFIER, "Identifier"),
+        (KIND_NAME, "Name token"),
+        (KIND_BLOCK, "Duplicate blocking key"),
+    )
+
+    employee = models.ForeignKey(
+        EmpPersonal,
+        on_delete=models.CASCADE,
+        db_column="emp_id",
+        db_constraint=False,
+        related_name="search_keys",
+    )
+    kind = models.CharField(max_length=4, choices=KIND_CHOICES)
+    key = models.CharField(max_length=64)
+
+    class Meta:
+        db_table = "EMP_SEARCH_KEY"
+        indexes = [
+            models.Index(fields=["kind", "key"], name="emp_search_kind_key_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.key}"
+
+
+class EmpIdempotencyKey(models.Model):
+    """Response of an employee write sent with an ``Idempotency-Key`` header, replayed on retries."""
+
+    user_id = models.BigIntegerField()
+    key = models.CharField(max_length=128)
+    fingerprint = models.CharField(max_length=64)
+    status = models.PositiveSmallIntegerField(null=True, blank=True)  # None while the request is running
+    response = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = "EMP_IDEMPOTENCY_KEY"
+        constraints = [
+            models.UniqueConstraint(fields=["user_id", "key"], name="emp_idempotency_user_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
+
+
+class EmpAuditEntry(models.Model):
+    """Field-level change to an employee (``{field: [old, new]}``), written in batches by ``employee.audit``."""
+
+    ACTION_CREATE = "create"
+    ACTION_UPDATE = "update"
+    ACTION_CHOICES = (
+        (ACTION_CREATE, "Create"),
+        (ACTION_UPDATE, "Update"),
+    )
+
+    emp_id = models.BigIntegerField()
+    action = models.CharField(max_length=8, choices=ACTION_CHOICES)
+    source = models.CharField(max_length=16)
+    changed_by = models.BigIntegerField(null=True, blank=True)
+    changed_at = models.DateTimeField()
+    changes = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        db_table = "EMP_AUDIT"
+        indexes = [
+            models.Index(fields=["emp_id", "id"], name="emp_audit_emp_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.emp_id}:{self.action}@{self.changed_at:%Y-%m-%d %H:%M:%S}"
+
+
+class EmpChangeSequence(models.Model):
+    """The single-row counter behind ``EmpPersonal.change_seq`` and ``EmpTombstone.change_seq``."""
+
+    SINGLETON = 1
+
+    value = models.BigIntegerField(default=0)
+    # Tombstones up to this sequence value have been pruned; older cursors must resync.
+    pruned_through = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "EMP_CHANGE_SEQ"
+
+    def __str__(self):
+        return str(self.value)
+
+
+class EmpTombstone(models.Model):
+    """A deleted employee, kept so the change feed can report the deletion."""
+
+    emp_id = models.BigIntegerField()
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "EMP_TOMBSTONE"
+        indexes = [
+            models.Index(fields=["change_seq", "emp_id"], name="emp_tombstone_seq_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.emp_id}@{self.change_seq}"
@@ -0,0 +1,284 @@
+"""Batch ID-card printing: employees -> cards rendered in a process pool -> one PDF or ZIP.
+
+Records are read in ``emp_id`` keyset batches and sent to ``employee.idcards``
+in chunks. Only a few chunks per worker are in flight at a time, so memory stays
+bounded however many cards are printed, and the cards come back in ``emp_id``
+order. The PDF embeds each card's JPEG as is, without re-encoding it. The file is
+streamed while the cards arrive: the cross-reference table at the end only needs
+the byte offsets.
+"""
+
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import StreamingHttpResponse
+
+from . import idcards
+from .exports import ChunkSink, iter_batches
+from .models import EmpPersonal
+from .queries import apply_filters
+
+CARD_FIELDS = ("emp_id", "emp_code", "card_no", "emp_name", "bang_emp_name", "blood_group", "emp_photo", "emp_signature")
+CHUNK_SIZE = 16
+
+FORMATS = {
+    "pdf": ("application/pdf", "pdf"),
+    "zip": ("application/zip", "zip"),
+}
+
+MM = 72 / 25.4
+CARD_PT = (idcards.CARD_SIZE_MM[0] * MM, idcards.CARD_SIZE_MM[1] * MM)
+A4_PT = (595.28, 841.89)
+A4_GAP = (6 * MM, 3 * MM)
+
+
+def _a4_slots(columns=2, rows=5):
+    width = columns * CARD_PT[0] + (columns - 1) * A4_GAP[0]
+    height = rows * CARD_PT[1] + (rows - 1) * A4_GAP[1]
+    left, bottom = (A4_PT[0] - width) / 2, (A4_PT[1] - height) / 2
+    # Filled left to right, top to bottom; PDF coordinates start at the bottom left.
+    return [
+        (left + col * (CARD_PT[0] + A4_GAP[0]), bottom + (rows - 1 - row) * (CARD_PT[1] + A4_GAP[1]))
+        for row in range(rows)
+        for col in range(columns)
+    ]
+
+
+# Page size and the lower-left corner of each card on the page.
+SHEETS = {
+    "card": (CARD_PT, [(0, 0)]),  # one card per page, for card printers
+    "a4": (A4_PT, _a4_slots()),  # 2 x 5 cards per A4 sheet, for cutting
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def worker_count():
+    return getattr(settings, "EMPLOYEE_ID_CARD_WORKERS", os.cpu_count() or 1)
+
+
+def card_style():
+    return idcards.CardStyle(
+        title=getattr(settings, "EMPLOYEE_ID_CARD_TITLE", "VisorHR"),
+        font=getattr(settings, "EMPLOYEE_ID_CARD_FONT", None),
+        bangla_font=getattr(settings, "EMPLOYEE_ID_CARD_BANGLA_FONT", None),
+    )
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: never fork a threaded web worker holding DB connections.
+            _executor = ProcessPoolExecutor(
+                max_workers=worker_count(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=idcards.init_worker,
+                initargs=(card_style(),),
+            )
+        return _executor
+
+
+def shutdown_executor(wait=True):
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+            _executor = None
+
+
+def select_employees(ids=None, filters=None):
+    queryset = EmpPersonal.objects.all()
+    if ids:
+        queryset = queryset.filter(emp_id__in=ids)
+    return apply_filters(queryset, filters or {})
+
+
+def _local_path(name):
+    if not name:
+        return None
+    try:
+        return default_storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+def iter_records(queryset):
+    """Plain, picklable card records for ``queryset`` in ``emp_id`` order."""
+    for batch in iter_batches(queryset, CARD_FIELDS):
+        for row in batch:
+            record = dict(zip(CARD_FIELDS, row))
+            record["photo_path"] = _local_path(record.pop("emp_photo"))
+            record["signature_path"] = _local_path(record.pop("emp_signature"))
+            yield record
+
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def render(records, chunk_size=CHUNK_SIZE):
+    """Yield ``(record, jpeg_bytes)`` in input order, rendering in the process pool."""
+    workers = worker_count()
+    if not workers:
+        idcards.init_worker(card_style())
+        for record in records:
+            yield record, idcards.render_card(record)
+        return
+
+    pending = deque()
+    try:
+        for chunk in _chunks(records, chunk_size):
+            try:
+                future = get_executor().submit(idcards.render_cards, chunk)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM on a huge photo); start a fresh pool.
+                shutdown_executor(wait=False)
+                future = get_executor().submit(idcards.render_cards, chunk)
+            pending.append((chunk, future))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
+    finally:
+        # The client went away: drop the chunks nobody will read.
+        for _, future in pending:
+            future.cancel()
+
+
+def _card_filename(record):
+    code = re.sub(r"[^\w.-]+", "_", record.get("emp_code") or "")
+    return f"{record['emp_id']}-{code}.jpg" if code else f"{record['emp_id']}.jpg"
+
+
+def zip_stream(cards):
+    """A ZIP with one JPEG per card. JPEGs do not compress, so entries are stored."""
+    sink = ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as archive:
+        for record, jpeg in cards:
+            archive.writestr(_card_filename(record), jpeg)
+            yield sink.drain()
+    yield sink.drain()
+
+
+class _PdfWriter:
+    """Tracks object numbers and byte offsets while a PDF is written front to back."""
+
+    CATALOG, PAGES = 1, 2
+
+    def __init__(self):
+        self.position = 0
+        self.offsets = {}
+        self.next_number = 3
+
+    def reserve(self):
+        number = self.next_number
+        self.next_number += 1
+        return number
+
+    def raw(self, data):
+        self.position += len(data)
+        return data
+
+    def obj(self, number, body, stream=None):
+        parts = [f"{number} 0 obj\n".encode(), body]
+        if stream is not None:
+            parts += [b"\nstream\n", stream, b"\nendstream"]
+        parts.append(b"\nendobj\n")
+        self.offsets[number] = self.position
+        return self.raw(b"".join(parts))
+
+    def trailer(self):
+        size = self.next_number
+        lines = [f"xref\n0 {size}\n".encode(), b"0000000000 65535 f \n"]
+        lines += [f"{self.offsets[number]:010d} 00000 n \n".encode() for number in range(1, size)]
+        xref = self.position
+        lines.append(f"trailer\n<< /Size {size} /Root {self.CATALOG} 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+        return self.raw(b"".join(lines))
+
+
+def pdf_stream(cards, sheet="card"):
+    """A PDF of the cards laid out per ``sheet``; each card JPEG is embedded unchanged."""
+    (page_width, page_height), slots = SHEETS[sheet]
+    width, height = idcards.CARD_SIZE
+    pdf = _PdfWriter()
+    yield pdf.raw(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    pages = []
+    images = []
+
+    def finish_page():
+        content = "".join(
+            f"q {CARD_PT[0]:.2f} 0 0 {CARD_PT[1]:.2f} {x:.2f} {y:.2f} cm /Im{i} Do Q\n"
+            for i, ((x, y), _) in enumerate(zip(slots, images))
+        ).encode()
+        content_number, page_number = pdf.reserve(), pdf.reserve()
+        xobjects = " ".join(f"/Im{i} {number} 0 R" for i, number in enumerate(images))
+        data = pdf.obj(content_number, f"<< /Length {len(content)} >>".encode(), content)
+        data += pdf.obj(
+            page_number,
+            (
+                f"<< /Type /Page /Parent {pdf.PAGES} 0 R /MediaBox [0 0 {page_width:.2f} {page_height:.2f}] "
+                f"/Resources << /XObject << {xobjects} >> >> /Contents {content_number} 0 R >>"
+            ).encode(),
+        )
+        pages.append(page_number)
+        images.clear()
+        return data
+
+    for _, jpeg in cards:
+        number = pdf.reserve()
+        images.append(number)
+        header = (
+            f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} /ColorSpace /DeviceRGB "
+            f"/BitsPerComponent 8 /Filter /DCTDecode /Length {len(jpeg)} >>"
+        )
+        data = pdf.obj(number, header.encode(), jpeg)
+        if len(images) == len(slots):
+            data += finish_page()
+        yield data
+    if images:
+        yield finish_page()
+
+    kids = " ".join(f"{number} 0 R" for number in pages)
+    yield pdf.obj(pdf.PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    yield pdf.obj(pdf.CATALOG, f"<< /Type /Catalog /Pages {pdf.PAGES} 0 R >>".encode())
+    yield pdf.trailer()
+
+
+def id_card_stream(queryset, fmt="pdf", sheet="card", on_card=None):
+    cards = render(iter_records(queryset))
+    if on_card is not None:
+        cards = _observed(cards, on_card)
+    return pdf_stream(cards, sheet) if fmt == "pdf" else zip_stream(cards)
+
+
+def _observed(cards, on_card):
+    for card in cards:
+        yield card
+        on_card(card[0])
+
+
+def id_card_response(queryset, fmt="pdf", sheet="card", filename="id-cards"):
+    content_type, extension = FORMATS[fmt]
+    response = StreamingHttpResponse(id_card_stream(queryset, fmt, sheet), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{extension}"'
+    return response
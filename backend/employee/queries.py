@@ -0,0 +1,124 @@
+"""Read-side helpers for EmpPersonal: column projection, filters and keyset pagination."""
+
+from django.db.models import F
+
+from .models import SIDE_FIELDS, EmpPersonal
+
+DEFAULT_LIST_FIELDS = (
+    "emp_id",
+    "emp_code",
+    "emp_name",
+    "card_no",
+    "sex",
+    "present_dist",
+    "contractual",
+)
+
+# Query parameter -> model field for the simple equality filters.
+FILTER_FIELDS = {
+    "district": "present_dist",
+    "sex": "sex",
+    "contractual": "contractual",
+}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+SELECTABLE_FIELDS = (*(f.attname for f in EmpPersonal._meta.concrete_fields), *SIDE_FIELDS)
+
+
+class QueryParamError(ValueError):
+    """Raised for query parameters that cannot be applied."""
+
+
+def parse_fields(raw, default=DEFAULT_LIST_FIELDS):
+    """Turn a comma-separated ``fields`` parameter into a validated column list.
+
+    ``emp_id`` is always included because it is the pagination key.
+    """
+    if not raw:
+        return list(default)
+    fields = []
+    for name in raw.split(","):
+        name = name.strip()
+        if not name or name in fields:
+            continue
+        if name not in SELECTABLE_FIELDS:
+            raise QueryParamError(f"Unknown field: {name}")
+        fields.append(name)
+    if "emp_id" not in fields:
+        fields.insert(0, "emp_id")
+    return fields
+
+
+def field_lookup(name):
+    """ORM lookup for a selectable field; side-table columns are reached through their relation."""
+    relation = SIDE_FIELDS.get(name)
+    return name if relation is None else f"{relation}__{name}"
+
+
+def select_values(queryset, fields):
+    """``queryset.values(*fields)``, joining only the side tables that ``fields`` touch."""
+    side = {name: F(field_lookup(name)) for name in fields if name in SIDE_FIELDS}
+    return queryset.values(*(name for name in fields if name not in side), **side)
+
+
+def apply_filters(queryset, params):
+    for param, field_name in FILTER_FIELDS.items():
+        value = (params.get(param) or "").strip()
+        if not value:
+            continue
+        if field_name == "contractual":
+            value = value.upper()
+        queryset = queryset.filter(**{field_name: value})
+    return queryset
+
+
+def parse_cursor(raw, name="after", key="emp_id"):
+    if raw in (None, ""):
+        return None
+    try:
+        cursor = int(raw)
+    except (TypeError, ValueError):
+        raise QueryParamError(f"{name} must be an integer {key}.") from None
+    if cursor < 0:
+        raise QueryParamError(f"{name} must be an integer {key}.")
+    return cursor
+
+
+def parse_ids(raw, maximum):
+    """Turn a comma-separated ``ids`` parameter into a list of at most ``maximum`` emp_ids."""
+    if not raw:
+        return []
+    try:
+        ids = sorted({int(value) for value in raw.split(",") if value.strip()})
+    except ValueError:
+        raise QueryParamError("ids must be comma-separated emp_ids.") from None
+    if len(ids) > maximum:
+        raise QueryParamError(f"At most {maximum} ids can be given.")
+    return ids
+
+
+def parse_limit(raw, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    if raw in (None, ""):
+        return default
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise QueryParamError("limit must be an integer.") from None
+    return max(1, min(limit, maximum))
+
+
+def keyset_page(queryset, fields, after=None, limit=DEFAULT_PAGE_SIZE):
+    """Return ``(rows, next_cursor)`` for the page of rows with ``emp_id > after``.
+
+    Seeks on the primary key instead of using OFFSET, so the cost of a page does
+    not depend on how deep it is.
+    """
+    if after is not None:
+        queryset = queryset.filter(emp_id__gt=after)
+    rows = list(select_values(queryset.order_by("emp_id"), fields)[: limit + 1])
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, rows[-1]["emp_id"]
+    return rows, None
@@ -0,0 +1,232 @@
+"""Request schema for EmpPersonal writes, compiled once from the model.
+
+``EMPLOYEE_SCHEMA`` holds one coercer per writable scalar field, derived from
+``EmpPersonal._meta`` and its side tables (type, ``max_length``, ``choices``,
+extra validators) and ``EMPLOYEE_REQUIRED_FIELDS``. ``validate`` coerces a payload in a single pass
+and reports every field error at once in ``ValidationError.message_dict``
+shape; ``build`` turns the cleaned values into an unsaved instance. File
+fields are not part of the schema; uploads are handled by ``employee.uploads``.
+"""
+
+from datetime import date, datetime
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.validators import MaxLengthValidator
+from django.db import models
+from django.db.models.base import ModelState
+from django.db.models.signals import post_init, pre_init
+
+from .models import EMPLOYEE_REQUIRED_FIELDS, SIDE_TABLES, EmpPersonal
+
+# Stamped by the views from the request user, never taken from the payload.
+SYSTEM_FIELDS = ("photo_added_by", "updated_by")
+
+# date_of_birth also accepts the legacy "01-Jan-1990" spelling.
+DATE_INPUT_FORMATS = ("%d-%b-%Y",)
+
+REQUIRED_MESSAGE = "This field is required."
+
+
+class _Invalid(Exception):
+    def __init__(self, message):
+        self.message = message
+
+
+def _text(value):
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise _Invalid("Enter a text value.")
+    return str(value)
+
+
+def _integer(value):
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+    if isinstance(value, bool):
+        raise _Invalid("Enter a whole number.")
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise _Invalid("Enter a whole number.")
+        return int(value)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise _Invalid("Enter a whole number.") from None
+
+
+def _date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise _Invalid("Enter a valid date.")
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        pass
+    for fmt in DATE_INPUT_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise _Invalid("Enter a valid date (YYYY-MM-DD).")
+
+
+def _compile_field(field, required):
+    """Return ``(name, max_length, required, coerce)`` for one model field.
+
+    ``coerce`` is None for plain text fields (no choices or extra validators),
+    which ``EmployeeSchema.validate`` handles inline; otherwise ``coerce(raw)``
+    returns the cleaned value or raises _Invalid.
+    """
+    if isinstance(field, models.DateField):
+        parse = _date
+    elif isinstance(field, models.IntegerField):
+        parse = _integer
+    else:
+        parse = _text
+
+    max_length = field.max_length if isinstance(field, models.CharField) else None
+    # Choices match case-insensitively and are stored as the canonical key ("Male" -> "male").
+    choices = {str(key).lower(): key for key, _ in field.flatchoices} if field.choices else None
+    invalid_choice = "Select a valid choice. %r is not one of the available choices."
+    validators = [v for v in field.validators if not isinstance(v, MaxLengthValidator)]
+    default = field.get_default() if field.has_default() else None
+
+    if parse is _text and choices is None and not validators and default is None:
+        return field.name, max_length, required, None
+
+    def coerce(raw):
+        value = None if raw is None else parse(raw)
+        if value is None:
+            if required:
+                raise _Invalid(REQUIRED_MESSAGE)
+            return default
+        if choices is not None:
+            try:
+                value = choices[value.lower()]
+            except KeyError:
+                raise _Invalid(invalid_choice % value) from None
+        elif max_length is not None and len(value) > max_length:
+            raise _Invalid(_too_long(max_length, value))
+        for validator in validators:
+            try:
+                validator(value)
+            except ValidationError as exc:
+                raise _Invalid(exc.messages[0]) from None
+        return value
+
+    return field.name, max_length, required, coerce
+
+
+def _too_long(max_length, value):
+    return f"Ensure this value has at most {max_length} characters (it has {len(value)})."
+
+
+class EmployeeSchema:
+    def __init__(self, model, required_fields=(), exclude=(), side_models=()):
+        """``side_models`` are one-to-one tables whose columns ``model`` exposes as properties."""
+        self.model = model
+        side_fields = [field for side in side_models for field in side._meta.concrete_fields if not field.primary_key]
+        fields = [
+            field
+            for field in (*model._meta.concrete_fields, *side_fields)
+            if field.editable
+            and not field.primary_key
+            and not isinstance(field, models.FileField)
+            and not getattr(field, "auto_now", False)
+            and not getattr(field, "auto_now_add", False)
+            and field.name not in exclude
+        ]
+        names = {field.name for field in fields}
+        self.required = frozenset(name for name in required_fields if name in names)
+        self.fields = tuple(_compile_field(field, field.name in self.required) for field in fields)
+        self.field_names = tuple(name for name, *_ in self.fields)
+
+        # build() starts every instance from a copy of this attribute dict
+        # rather than running Model.__init__ over ~100 fields.
+        concrete = model._meta.concrete_fields
+        if any(field.has_default() and callable(field.default) for field in concrete):
+            raise ImproperlyConfigured(f"{model.__name__} has callable field defaults; build() cannot pre-compute them.")
+        # Side-table columns have no attname here; build() sets them through the properties.
+        self._attnames = {field.name: field.attname for field in fields if field not in side_fields}
+        self._prototype = {field.attname: field.get_default() for field in concrete}
+
+    def validate(self, data, partial=False):
+        """Coerce ``data`` and return ``(cleaned, errors)``; ``errors`` maps field -> [messages].
+
+        With ``partial`` only the keys present in ``data`` are checked and returned.
+        """
+        cleaned = {}
+        errors = {}
+        get = data.get
+        for name, max_length, required, coerce in self.fields:
+            if partial and name not in data:
+                continue
+            raw = get(name)
+            if coerce is not None:
+                try:
+                    cleaned[name] = coerce(raw)
+                except _Invalid as exc:
+                    errors[name] = [exc.message]
+                continue
+            if raw.__class__ is not str and raw is not None:
+                try:
+                    raw = _text(raw)
+                except _Invalid as exc:
+                    errors[name] = [exc.message]
+                    continue
+            value = raw.strip() if raw else None
+            if not value:
+                if required:
+                    errors[name] = [REQUIRED_MESSAGE]
+                else:
+                    cleaned[name] = None
+            elif len(value) > max_length:
+                errors[name] = [_too_long(max_length, value)]
+            else:
+                cleaned[name] = value
+        return cleaned, errors
+
+    def validate_many(self, records, partial=False):
+        """Validate an iterable of payloads, returning a list of ``(cleaned, errors)`` in order."""
+        validate = self.validate
+        return [validate(data, partial) for data in records]
+
+    def build(self, cleaned, **extra):
+        """Return an unsaved model instance holding ``cleaned`` plus ``extra`` attributes.
+
+        Equivalent to ``model(**cleaned, **extra)`` (init signals included) for
+        the schema's fields and plain concrete attributes.
+        """
+        model = self.model
+        pre_init.send(sender=model, args=(), kwargs={})
+        instance = model.__new__(model)
+        attrs = instance.__dict__
+        attrs.update(self._prototype)
+        attnames = self._attnames
+        side = []
+        for name, value in cleaned.items():
+            attname = attnames.get(name)
+            if attname is None:
+                side.append((name, value))
+            else:
+                attrs[attname] = value
+        attrs.update(extra)
+        attrs["_state"] = ModelState()
+        for name, value in side:
+            setattr(instance, name, value)
+        post_init.send(sender=model, instance=instance)
+        return instance
+
+
+EMPLOYEE_SCHEMA = EmployeeSchema(
+    EmpPersonal, EMPLOYEE_REQUIRED_FIELDS, exclude=SYSTEM_FIELDS, side_models=SIDE_TABLES.values()
+)
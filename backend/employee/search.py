@@ -0,0 +1,156 @@
+"""Indexed employee search backed by the EMP_SEARCH_KEY table.
+
+Every saved EmpPersonal gets a handful of normalized keys: identifier keys
+(emp code, card number, national/smart ID with punctuation stripped) and one key
+per name token. Lookups are then either an exact match or an index prefix scan
+on ``(kind, key)`` instead of an OR of ``LIKE '%x%'`` over the base table.
+The same rows hold the blocking keys ``employee.duplicates`` compares on.
+"""
+
+import re
+
+from django.db import transaction
+
+from . import bangla
+from .duplicates import BLOCKING_FIELDS, blocking_keys
+from .models import BANGLA_NAME_KEY_FIELDS, EmpPersonal, EmpSearchKey
+
+IDENTIFIER_FIELDS = ("emp_code", "card_no", "national_id", "smart_id")
+NAME_FIELDS = ("emp_name", "bang_emp_name", "father_name", "mother_name")
+INDEXED_FIELDS = ("emp_id",) + IDENTIFIER_FIELDS + NAME_FIELDS + tuple(f for f in BLOCKING_FIELDS if f not in IDENTIFIER_FIELDS + NAME_FIELDS)
+
+KEY_MAX_LENGTH = EmpSearchKey._meta.get_field("key").max_length
+MIN_PREFIX_LENGTH = 2
+
+_IDENTIFIER_STRIP = re.compile(r"[\s\-_/.]+")
+_TOKEN_SPLIT = re.compile(r"[\s.,;:'\"()\-_/]+")
+
+
+def normalize_identifier(value):
+    if not value:
+        return ""
+    return _IDENTIFIER_STRIP.sub("", str(value)).upper()[:KEY_MAX_LENGTH]
+
+
+def normalize_text(value):
+    return bangla.normalize(value)
+
+
+def name_tokens(value):
+    return [t[:KEY_MAX_LENGTH] for t in _TOKEN_SPLIT.split(normalize_text(value)) if t]
+
+
+def is_identifier_query(term):
+    """IDs and codes are a single word containing at least one digit."""
+    stripped = term.strip()
+    return bool(stripped) and not any(ch.isspace() for ch in stripped) and any(ch.isdigit() for ch in stripped)
+
+
+def keys_for(emp):
+    """Return the set of ``(kind, key)`` pairs for an employee."""
+    keys = set()
+    for field_name in IDENTIFIER_FIELDS:
+        key = normalize_identifier(getattr(emp, field_name))
+        if key:
+            keys.add((EmpSearchKey.KIND_IDENTIFIER, key))
+    for field_name in NAME_FIELDS:
+        for token in name_tokens(getattr(emp, field_name)):
+            keys.add((EmpSearchKey.KIND_NAME, token))
+    for key in blocking_keys(emp):
+        keys.add((EmpSearchKey.KIND_BLOCK, key))
+    return keys
+
+
+def index_employees(employees):
+    """Rewrite the search keys of ``employees`` (saved instances) in one transaction."""
+    employees = [emp for emp in employees if emp.pk is not None]
+    if not employees:
+        return
+    rows = [
+        EmpSearchKey(employee_id=emp.pk, kind=kind, key=key)
+        for emp in employees
+        for kind, key in keys_for(emp)
+    ]
+    with transaction.atomic():
+        EmpSearchKey.objects.filter(employee_id__in=[emp.pk for emp in employees]).delete()
+        EmpSearchKey.objects.bulk_create(rows, batch_size=1000)
+
+
+def reindex_queryset(queryset, chunk_size=1000):
+    """Rebuild keys for every row in ``queryset``, reading only the indexed columns.
+
+    Rows are read in ``emp_id`` keyset batches so memory stays bounded even where
+    the driver buffers whole result sets (MySQLdb).
+    """
+    queryset = queryset.only(*INDEXED_FIELDS).order_by("emp_id")
+    count, last_id = 0, None
+    while True:
+        page = queryset if last_id is None else queryset.filter(emp_id__gt=last_id)
+        batch = list(page[:chunk_size])
+        if not batch:
+            return count
+        index_employees(batch)
+        count += len(batch)
+        if len(batch) < chunk_size:
+            return count
+        last_id = batch[-1].emp_id
+
+
+def matching_ids(term):
+    """Return a queryset of ``employee_id`` values matching ``term`` (``None`` for a blank term)."""
+    term = (term or "").strip()
+    if not term:
+        return None
+    keys = EmpSearchKey.objects.values_list("employee_id", flat=True)
+
+    if is_identifier_query(term):
+        ident = normalize_identifier(term)
+        exact = keys.filter(kind=EmpSearchKey.KIND_IDENTIFIER, key=ident)
+        if exact.exists():
+            return exact
+        return keys.filter(kind=EmpSearchKey.KIND_IDENTIFIER, key__istartswith=ident)
+
+    tokens = [t for t in name_tokens(term) if len(t) >= MIN_PREFIX_LENGTH] or name_tokens(term)
+    ids = None
+    for token in tokens:
+        token_ids = keys.filter(kind=EmpSearchKey.KIND_NAME, key__istartswith=token)
+        ids = token_ids if ids is None else ids.filter(employee_id__in=token_ids)
+    return ids.distinct()
+
+
+def search_employees(term, queryset=None):
+    """Filter ``queryset`` (default: all employees) down to rows matching ``term``."""
+    if queryset is None:
+        queryset = EmpPersonal.objects.all()
+    ids = matching_ids(term)
+    if ids is None:
+        return queryset
+    return queryset.filter(emp_id__in=ids)
+
+
+def lookup_bangla_name(term, source="bang_emp_name", queryset=None, limit=50):
+    """Look up employees by a Bangla name field through its shadow key columns.
+
+    Bangla input is prefix-matched on the normalized column first; any input
+    (Bangla or romanized) is then matched on the phonetic key. Returns a list of
+    ``(match, emp_id)`` pairs, normalized matches first.
+    """
+    if queryset is None:
+        queryset = EmpPersonal.objects.all()
+    norm_field, phon_field = BANGLA_NAME_KEY_FIELDS[source]
+    found = []
+    seen = set()
+
+    norm = bangla.normalize(term)
+    if norm and bangla.has_bengali(norm):
+        ids = queryset.filter(**{f"{norm_field}__istartswith": norm}).order_by("emp_id")
+        for emp_id in ids.values_list("emp_id", flat=True)[:limit]:
+            seen.add(emp_id)
+            found.append(("normalized", emp_id))
+
+    phon = bangla.phonetic_key(term)
+    if phon and len(found) < limit:
+        ids = queryset.filter(**{f"{phon_field}__istartswith": phon}).exclude(emp_id__in=seen).order_by("emp_id")
+        for emp_id in ids.values_list("emp_id", flat=True)[: limit - len(found)]:
+            found.append(("phonetic", emp_id))
+    return found
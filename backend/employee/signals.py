@@ -0,0 +1,31 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .changes import record_deletion
+from .models import EmpPersonal, allocate_change_seq
+from .search import INDEXED_FIELDS, index_employees
+
+
+@receiver(post_save, sender=EmpPersonal, dispatch_uid="employee_search_index")
+def update_search_keys(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(INDEXED_FIELDS):
+        return
+    index_employees([instance])
+
+
+# Attribute holding the change_seq taken for a row about to be deleted.
+DELETION_CHANGE_SEQ = "_deletion_change_seq"
+
+
+@receiver(pre_delete, sender=EmpPersonal, dispatch_uid="employee_change_feed_deletion_seq")
+def allocate_deletion_seq(sender, instance, using, **kwargs):
+    # Sent inside the delete's transaction before any row is deleted, so the
+    # counter is locked before the rows like on every other write path.
+    instance.__dict__[DELETION_CHANGE_SEQ] = allocate_change_seq(using)
+
+
+@receiver(post_delete, sender=EmpPersonal, dispatch_uid="employee_change_feed_tombstone")
+def leave_tombstone(sender, instance, using, **kwargs):
+    record_deletion(instance.pk, using, instance.__dict__.pop(DELETION_CHANGE_SEQ, None))
@@ -0,0 +1,299 @@
+"""Deterministic synthetic EmpPersonal data for load and scaling tests.
+
+Rows are generated in fixed-size blocks; each block has its own RNG seeded from
+``(seed, block)``, so row ``i`` is the same for a given seed no matter how many
+workers or what batch size produced it. ``generate_block`` runs inside worker
+processes (see the ``generate_employees`` command): it builds the rows, fills
+the Bangla name keys, optionally draws placeholder photos, and bulk-inserts
+them on the worker's own connection. Models are imported inside functions so
+spawned workers can unpickle these callables before ``django.setup()`` runs.
+"""
+
+import os
+import random
+from datetime import date, timedelta
+
+BLOCK_SIZE = 10_000
+
+# DOBs are drawn against a fixed date so output never depends on when it runs;
+# everyone is at least 19 on it, so validate_minimum_age holds from then on.
+REFERENCE_DATE = date(2025, 1, 1)
+MIN_AGE_DAYS = 19 * 365
+MAX_AGE_DAYS = 60 * 365
+
+PHOTO_DIR = "employees/synthetic"
+
+MALE_NAMES = [
+    ("Mohammad", "মোহাম্মদ"), ("Abdul", "আব্দুল"), ("Rahim", "রহিম"), ("Karim", "করিম"), ("Jamal", "জামাল"),
+    ("Kamal", "কামাল"), ("Rafiq", "রফিক"), ("Shafiq", "শফিক"), ("Habib", "হাবিব"), ("Sumon", "সুমন"),
+    ("Rakib", "রাকিব"), ("Hasan", "হাসান"), ("Mahmud", "মাহমুদ"), ("Anwar", "আনোয়ার"), ("Sohel", "সোহেল"),
+    ("Milon", "মিলন"), ("Shahin", "শাহিন"), ("Alamgir", "আলমগীর"), ("Ripon", "রিপন"), ("Tanvir", "তানভীর"),
+]
+FEMALE_NAMES = [
+    ("Fatema", "ফাতেমা"), ("Ayesha", "আয়েশা"), ("Nasrin", "নাসরিন"), ("Shirin", "শিরিন"), ("Rehana", "রেহানা"),
+    ("Sharmin", "শারমিন"), ("Jannat", "জান্নাত"), ("Moushumi", "মৌসুমী"), ("Rupa", "রুপা"), ("Sumaiya", "সুমাইয়া"),
+    ("Taslima", "তাসলিমা"), ("Rokeya", "রোকেয়া"), ("Salma", "সালমা"), ("Mitu", "মিতু"), ("Lipi", "লিপি"),
+    ("Parvin", "পারভীন"), ("Shapla", "শাপলা"), ("Hasina", "হাসিনা"), ("Kulsum", "কুলসুম"), ("Nazma", "নাজমা"),
+]
+SURNAMES = [
+    ("Hossain", "হোসেন"), ("Rahman", "রহমান"), ("Islam", "ইসলাম"), ("Ahmed", "আহমেদ"), ("Uddin", "উদ্দিন"),
+    ("Chowdhury", "চৌধুরী"), ("Sarkar", "সরকার"), ("Mia", "মিয়া"), ("Sheikh", "শেখ"), ("Talukder", "তালুকদার"),
+    ("Mondal", "মন্ডল"), ("Biswas", "বিশ্বাস"), ("Khan", "খান"), ("Molla", "মোল্লা"), ("Bhuiyan", "ভূঁইয়া"),
+]
+FEMALE_SURNAMES = [("Khatun", "খাতুন"), ("Begum", "বেগম"), ("Akter", "আক্তার"), ("Sultana", "সুলতানা")]
+
+# district -> police stations, each (English, Bangla)
+DISTRICTS = {
+    ("Dhaka", "ঢাকা"): [("Mirpur", "মিরপুর"), ("Uttara", "উত্তরা"), ("Savar", "সাভার"), ("Keraniganj", "কেরানীগঞ্জ")],
+    ("Gazipur", "গাজীপুর"): [("Tongi", "টঙ্গী"), ("Kaliakair", "কালিয়াকৈর"), ("Sreepur", "শ্রীপুর"), ("Kapasia", "কাপাসিয়া")],
+    ("Narayanganj", "নারায়ণগঞ্জ"): [("Fatullah", "ফতুল্লা"), ("Rupganj", "রূপগঞ্জ"), ("Sonargaon", "সোনারগাঁও")],
+    ("Mymensingh", "ময়মনসিংহ"): [("Trishal", "ত্রিশাল"), ("Bhaluka", "ভালুকা"), ("Muktagacha", "মুক্তাগাছা")],
+    ("Chattogram", "চট্টগ্রাম"): [("Patiya", "পটিয়া"), ("Hathazari", "হাটহাজারী"), ("Sitakunda", "সীতাকুণ্ড")],
+    ("Cumilla", "কুমিল্লা"): [("Daudkandi", "দাউদকান্দি"), ("Chandina", "চান্দিনা"), ("Laksam", "লাকসাম")],
+    ("Rangpur", "রংপুর"): [("Mithapukur", "মিঠাপুকুর"), ("Pirganj", "পীরগঞ্জ"), ("Badarganj", "বদরগঞ্জ")],
+    ("Bogura", "বগুড়া"): [("Sherpur", "শেরপুর"), ("Shibganj", "শিবগঞ্জ"), ("Dhunat", "ধুনট")],
+    ("Khulna", "খুলনা"): [("Dumuria", "ডুমুরিয়া"), ("Rupsha", "রূপসা"), ("Paikgachha", "পাইকগাছা")],
+    ("Sylhet", "সিলেট"): [("Beanibazar", "বিয়ানীবাজার"), ("Golapganj", "গোলাপগঞ্জ"), ("Companiganj", "কোম্পানীগঞ্জ")],
+}
+DISTRICT_KEYS = list(DISTRICTS)
+VILLAGES = [
+    ("Charpara", "চরপাড়া"), ("Notun Bazar", "নতুন বাজার"), ("Purbo Para", "পূর্ব পাড়া"), ("Kandirpar", "কান্দিরপাড়"),
+    ("Baliadanga", "বালিয়াডাঙ্গা"), ("Shantinagar", "শান্তিনগর"), ("Bhatpara", "ভাটপাড়া"), ("Dakshinkhan", "দক্ষিণখান"),
+]
+RELIGIONS = ["islam"] * 18 + ["hindu", "buddhist", "christian"]
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-"]
+EDUCATION = ["PSC", "JSC", "SSC", "HSC", "BA", "BSc", "BBA", "MA"]
+# Prime, so index -> NID digits is a bijection within each length.
+NID_MULTIPLIER = 7_919_263
+MOBILE_PREFIXES = ["013", "014", "015", "016", "017", "018", "019"]
+
+
+def blocks(count, start=0):
+    """Yield ``(block, first_index, size)`` covering indexes ``start .. start + count``."""
+    index, end = start, start + count
+    while index < end:
+        block = index // BLOCK_SIZE
+        size = min(end, (block + 1) * BLOCK_SIZE) - index
+        yield block, index, size
+        index += size
+
+
+def _mobile(rng):
+    return rng.choice(MOBILE_PREFIXES) + f"{rng.randrange(10**8):08d}"
+
+
+def _national_id(rng, dob, index):
+    """Smart-card NIDs are 10 digits; older cards 13, or 17 with the birth year prefixed.
+
+    The digits are a permutation of ``index`` so NIDs never collide (national_id is a unique key).
+    """
+    kind = rng.random()
+    if kind < 0.6:
+        return f"{10**9 + index * NID_MULTIPLIER % (9 * 10**9)}"
+    serial = 10**12 + index * NID_MULTIPLIER % (9 * 10**12)
+    if kind < 0.85:
+        return f"{serial}"
+    return f"{dob.year}{serial}"
+
+
+def init_worker():
+    import django
+
+    django.setup()
+
+
+def build_row(index, rng):
+    """Field values for row ``index`` (everything but ``emp_id`` and the derived name keys)."""
+    female = rng.random() < 0.45
+    first, bang_first = rng.choice(FEMALE_NAMES if female else MALE_NAMES)
+    surname, bang_surname = rng.choice(FEMALE_SURNAMES if female and rng.random() < 0.5 else SURNAMES)
+    father_first, bang_father_first = rng.choice(MALE_NAMES)
+    father_surname, bang_father_surname = rng.choice(SURNAMES)
+    mother_first, bang_mother_first = rng.choice(FEMALE_NAMES)
+    mother_surname, bang_mother_surname = rng.choice(FEMALE_SURNAMES)
+    married = rng.random() < 0.6
+    husband = rng.choice(MALE_NAMES) + rng.choice(SURNAMES) if female and married else None
+
+    present_dist = rng.choice(DISTRICT_KEYS)
+    present_ps = rng.choice(DISTRICTS[present_dist])
+    permanent_dist = present_dist if rng.random() < 0.4 else rng.choice(DISTRICT_KEYS)
+    permanent_ps = rng.choice(DISTRICTS[permanent_dist])
+    present_vill, permanent_vill = rng.choice(VILLAGES), rng.choice(VILLAGES)
+    dob = REFERENCE_DATE - timedelta(days=rng.randrange(MIN_AGE_DAYS, MAX_AGE_DAYS))
+    children = married and rng.random() < 0.7
+
+    return dict(
+        emp_code=f"E{index:08d}",
+        card_no=f"{index:08d}",
+        emp_name=f"{first} {surname}",
+        bang_emp_name=f"{bang_first} {bang_surname}",
+        father_name=f"{father_first} {father_surname}",
+        bang_father_name=f"{bang_father_first} {bang_father_surname}",
+        mother_name=f"{mother_first} {mother_surname}",
+        bang_mother_name=f"{bang_mother_first} {bang_mother_surname}",
+        husband_name=f"{husband[0]} {husband[2]}" if husband else None,
+        bang_husband_name=f"{husband[1]} {husband[3]}" if husband else None,
+        date_of_birth=dob,
+        sex="female" if female else "male",
+        religion=rng.choice(RELIGIONS),
+        blood_group=rng.choice(BLOOD_GROUPS),
+        marital_status="married" if married else "single",
+        child_male=rng.randrange(3) if children else 0,
+        child_female=rng.randrange(3) if children else 0,
+        contact_no=_mobile(rng),
+        emergency_cell=_mobile(rng),
+        national_id=_national_id(rng, dob, index),
+        birth_certificate_no=f"{dob.year}{rng.randrange(10**12, 10**13)}" if rng.random() < 0.3 else None,
+        contractual="Y" if rng.random() < 0.15 else "N",
+        education=rng.choice(EDUCATION),
+        nationality="Bangladeshi",
+        present_vill=present_vill[0],
+        bang_present_vill=present_vill[1],
+        present_ps=present_ps[0],
+        bang_present_ps=present_ps[1],
+        present_dist=present_dist[0],
+        bang_present_dist=present_dist[1],
+        present_address=f"{present_vill[0]}, {present_ps[0]}, {present_dist[0]}",
+        parmanent_vill=permanent_vill[0],
+        bang_permanent_vill=permanent_vill[1],
+        parmanent_ps=permanent_ps[0],
+        bang_permanent_ps=permanent_ps[1],
+        parmanent_dist=permanent_dist[0],
+        bang_permanent_dist=permanent_dist[1],
+        permanent_address=f"{permanent_vill[0]}, {permanent_ps[0]}, {permanent_dist[0]}",
+        present_postal_code=f"{rng.randrange(1000, 9999)}",
+        permanent_postal_code=f"{rng.randrange(1000, 9999)}",
+    )
+
+
+def build_employee(index, rng):
+    from .models import EmpPersonal
+
+    emp = EmpPersonal(**build_row(index, rng))
+    emp.refresh_name_keys()
+    return emp
+
+
+def iter_block(seed, block, first_index, size):
+    """Yield ``(index, row, photo_draw)`` for ``first_index .. first_index + size`` of ``block``.
+
+    Rows before ``first_index`` in the block are still drawn (and dropped) so the
+    RNG stream, and thus every row, is independent of where a run starts.
+    """
+    rng = random.Random(f"{seed}:{block}")
+    for index in range(block * BLOCK_SIZE, first_index + size):
+        row = build_row(index, rng)
+        photo_draw = rng.random()
+        if index >= first_index:
+            yield index, row, photo_draw
+
+
+def draw_photo(path, index):
+    from PIL import Image, ImageDraw
+
+    hue = (index * 37) % 256
+    image = Image.new("RGB", (240, 320), (200, 210 - hue // 4, 180 + hue // 4))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((60, 50, 180, 190), fill=(120 + hue // 3, 90, 70))
+    draw.rectangle((40, 200, 200, 320), fill=(40, 60 + hue // 2, 90))
+    image.save(path, "JPEG", quality=80)
+
+
+def _insert_sql(connection, model, columns):
+    quote = connection.ops.quote_name
+    return "INSERT INTO {} ({}) VALUES ({})".format(
+        quote(model._meta.db_table),
+        ", ".join(quote(column) for column in columns),
+        ", ".join(["%s"] * len(columns)),
+    )
+
+
+def generate_block(seed, block, first_index, size, first_emp_id, change_seq, batch_size=2000, photo_ratio=0.0, media_root=None, index_keys=True):
+    """Build and insert one block of rows; returns ``(rows, photos)``. Runs in a worker process.
+
+    Row ``index`` gets ``emp_id = first_emp_id + (index - first_index)``, so
+    workers write disjoint id ranges and can insert the search keys alongside
+    without reading ids back. Inserts use ``executemany`` on a raw cursor:
+    Django's ``bulk_create`` splits each batch into ~10-row statements on SQLite
+    (999-parameter limit for ~90 columns) and builds a model per row.
+
+    Every row is stamped with ``change_seq``, which the parent allocates once for
+    the whole load: allocating per flush would hold the counter lock across each
+    batch's inserts and make the parallel workers take turns. Rows committed
+    under an already-committed value can slip behind a change-feed cursor taken
+    mid-load, so feed consumers do a full resync after seeding.
+    """
+    from types import SimpleNamespace
+
+    from django.db import connection, transaction
+
+    from . import bangla
+    from .models import BANGLA_NAME_KEY_FIELDS, SIDE_FIELDS, SIDE_TABLES, EmpPersonal, EmpSearchKey
+    from .search import INDEXED_FIELDS, keys_for
+
+    photo_dir = os.path.join(media_root, PHOTO_DIR) if photo_ratio and media_root else None
+    if photo_dir:
+        os.makedirs(photo_dir, exist_ok=True)
+
+    generated = list(build_row(0, random.Random(0)))
+    row_fields = [name for name in generated if name not in SIDE_FIELDS]
+    side_columns = {
+        relation: [name for name in generated if SIDE_FIELDS.get(name) == relation] for relation in SIDE_TABLES
+    }
+    side_columns = {relation: names for relation, names in side_columns.items() if names}
+    name_key_columns = [(source, key) for source, keys in BANGLA_NAME_KEY_FIELDS.items() for key in keys]
+    columns = ["emp_id", *row_fields, *(key for _, key in name_key_columns), "emp_photo", "change_seq"]
+    key_lengths = {key: EmpPersonal._meta.get_field(key).max_length for _, key in name_key_columns}
+    adapt_date = connection.ops.adapt_datefield_value
+    emp_sql = _insert_sql(connection, EmpPersonal, columns)
+    side_sql = {
+        relation: _insert_sql(connection, SIDE_TABLES[relation], ["emp_id", *names])
+        for relation, names in side_columns.items()
+    }
+    key_sql = _insert_sql(connection, EmpSearchKey, ["emp_id", "kind", "key"])
+
+    def flush(emp_batch, side_batches, key_batch):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(emp_sql, [[*values, change_seq] for values in emp_batch])
+            for relation, batch in side_batches.items():
+                if batch:
+                    cursor.executemany(side_sql[relation], batch)
+            if key_batch:
+                cursor.executemany(key_sql, key_batch)
+
+    emp_batch, key_batch, rows, photos = [], [], 0, 0
+    side_batches = {relation: [] for relation in side_columns}
+    for index, row, photo_draw in iter_block(seed, block, first_index, size):
+        emp_id = first_emp_id + (index - first_index)
+        values = [emp_id]
+        for column in row_fields:
+            value = row[column]
+            values.append(adapt_date(value) if column == "date_of_birth" else value)
+        for source, key in name_key_columns:
+            text = row[source]
+            derived = bangla.normalize(text) if key.endswith("_norm") else bangla.phonetic_key(text)
+            values.append(derived[: key_lengths[key]] or None)
+        photo = None
+        if photo_dir and photo_draw < photo_ratio:
+            photo = f"{PHOTO_DIR}/{row['emp_code']}.jpg"
+            draw_photo(os.path.join(media_root, photo), index)
+            photos += 1
+        values.append(photo)
+        emp_batch.append(values)
+        for relation, names in side_columns.items():
+            side_values = [row[name] for name in names]
+            if any(side_values):
+                side_batches[relation].append([emp_id, *side_values])
+        if index_keys:
+            indexed = SimpleNamespace(**{field: row.get(field) for field in INDEXED_FIELDS})
+            key_batch.extend((emp_id, kind, key) for kind, key in keys_for(indexed))
+        if len(emp_batch) >= batch_size:
+            flush(emp_batch, side_batches, key_batch)
+            rows += len(emp_batch)
+            emp_batch, key_batch = [], []
+            side_batches = {relation: [] for relation in side_columns}
+    if emp_batch:
+        flush(emp_batch, side_batches, key_batch)
+        rows += len(emp_batch)
+    connection.close()
+    return rows, photos
@@ -0,0 +1,144 @@
+"""Employee operations that run as background jobs (see ``jobs.queue``)."""
+
+import io
+import tempfile
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+
+from jobs.queue import PermanentJobError, enqueue, task
+
+from . import duplicates, imaging, printing
+from .exports import FORMATS, export_stream
+from .importer import DEFAULT_BATCH_SIZE, ImportFormatError, import_employees, iter_rows
+from .models import EmpPersonal
+from .queries import apply_filters
+
+IMPORT_UPLOAD_DIR = "imports"
+EXPORT_DIR = "exports"
+ID_CARD_DIR = "id-cards"
+DUPLICATE_DIR = "duplicates"
+# Thumbnails are what users wait on; bulk imports/exports can queue behind them.
+DERIVATIVES_PRIORITY = 10
+
+
+def queue_import(upload, user_id=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Store ``upload`` in MEDIA storage and queue its import; returns the Job."""
+    name = default_storage.save(f"{IMPORT_UPLOAD_DIR}/{upload.name}", upload)
+    # One attempt only: a retry would insert the rows of the first attempt again.
+    return enqueue(
+        "employee.import",
+        {"name": name, "filename": upload.name, "batch_size": batch_size},
+        user_id=user_id,
+        max_attempts=1,
+    )
+
+
+def queue_export(fields, fmt="csv", filters=None, user_id=None):
+    return enqueue("employee.export", {"fields": list(fields), "format": fmt, "filters": filters or {}}, user_id=user_id)
+
+
+def queue_id_cards(ids=None, filters=None, fmt="pdf", sheet="card", user_id=None):
+    return enqueue(
+        "employee.id_cards",
+        {"ids": list(ids or []), "filters": filters or {}, "format": fmt, "sheet": sheet},
+        user_id=user_id,
+    )
+
+
+def queue_duplicate_scan(threshold=None, user_id=None):
+    return enqueue("employee.duplicates", {"threshold": threshold}, user_id=user_id)
+
+
+@task("employee.import")
+def import_file(job, name, filename, batch_size=DEFAULT_BATCH_SIZE):
+    """Import a CSV/XLSX upload stored under ``name``; the result is the ImportReport."""
+    if not default_storage.exists(name):
+        raise PermanentJobError(f"Uploaded file {name} no longer exists.")
+
+    def progress(report):
+        job.progress(report.total, message=f"{report.created} imported, {report.failed} failed")
+
+    try:
+        with default_storage.open(name, "rb") as fileobj:
+            report = import_employees(iter_rows(fileobj, filename), user_id=job.user_id, batch_size=batch_size, progress=progress)
+    except ImportFormatError as exc:
+        if exc.report is None:
+            raise PermanentJobError(str(exc)) from exc
+        raise PermanentJobError(f"{exc} Imported {exc.report.created} of {exc.report.total} rows before the error.") from exc
+    finally:
+        # Imports get a single attempt (see queue_import), so the upload is no longer needed.
+        default_storage.delete(name)
+    return report.as_dict()
+
+
+@task("employee.export")
+def export_file(job, fields, format="csv", filters=None):
+    """Write the (filtered) roster to MEDIA storage; the result carries its URL."""
+    queryset = apply_filters(EmpPersonal.objects.all(), filters or {})
+    total = queryset.count()
+    done = 0
+    job.progress(0, total)
+
+    def on_batch(rows):
+        nonlocal done
+        done += rows
+        job.progress(done, total)
+
+    name = f"{EXPORT_DIR}/employees-{job.id}.{FORMATS[format][1]}"
+    with tempfile.TemporaryFile() as spool:
+        for chunk in export_stream(queryset, fields, format, on_batch=on_batch):
+            spool.write(chunk)
+        spool.seek(0)
+        # A retry replaces the file of an earlier attempt.
+        default_storage.delete(name)
+        name = default_storage.save(name, File(spool))
+    return {"name": name, "url": default_storage.url(name), "rows": done}
+
+
+@task("employee.id_cards")
+def id_cards_file(job, ids=None, filters=None, format="pdf", sheet="card"):
+    """Render ID cards into one PDF/ZIP in MEDIA storage; the result carries its URL."""
+    queryset = printing.select_employees(ids, filters)
+    total = queryset.count()
+    done = 0
+    job.progress(0, total)
+
+    def on_card(record):
+        nonlocal done
+        done += 1
+        if done % 100 == 0 or done == total:
+            job.progress(done, total)
+
+    name = f"{ID_CARD_DIR}/id-cards-{job.id}.{printing.FORMATS[format][1]}"
+    with tempfile.TemporaryFile() as spool:
+        for chunk in printing.id_card_stream(queryset, format, sheet, on_card=on_card):
+            spool.write(chunk)
+        spool.seek(0)
+        default_storage.delete(name)
+        name = default_storage.save(name, File(spool))
+    return {"name": name, "url": default_storage.url(name), "cards": done}
+
+
+@task("employee.duplicates")
+def duplicate_report(job, threshold=None):
+    """Scan the whole table for probable duplicates into a CSV in MEDIA storage."""
+
+    def on_progress(done, total):
+        job.progress(done, total, message="blocking keys compared")
+
+    name = f"{DUPLICATE_DIR}/duplicates-{job.id}.csv"
+    with tempfile.TemporaryFile() as spool:
+        text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        pairs = duplicates.write_report(duplicates.find_duplicates(threshold, on_progress=on_progress), text)
+        text.flush()
+        text.detach()
+        spool.seek(0)
+        default_storage.delete(name)
+        name = default_storage.save(name, File(spool))
+    return {"name": name, "url": default_storage.url(name), "pairs": pairs}
+
+
+@task("employee.derivatives")
+def build_derivatives(job, photo_path=None, signature_path=None, sizes=(128, 384)):
+    return imaging.build_derivatives(photo_path, signature_path, tuple(sizes))
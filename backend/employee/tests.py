@@ -1,3 +1,1158 @@
-from django.test import TestCase
+import csv
+import importlib
+import io
+import json
+import os
+import random
+import re
+import shutil
+import tempfile
+import zipfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import StopUpload
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from jobs.worker import WorkerPool
+from openpyxl import load_workbook
+from PIL import Image
+
+from . import audit, bangla, derivatives, duplicates, synthetic
+from .exports import export_response
+from .models import EmpAddressDetail, EmpAuditEntry, EmpChangeSequence, EmpContactDetail, EmpEducationDetail, EmpIdempotencyKey, EmpPersonal, EmpSearchKey, EmpTombstone
+from .schema import EMPLOYEE_SCHEMA
+from .search import lookup_bangla_name, normalize_identifier, search_employees
+from .uploads import EmployeeImageUploadHandler
+from .upsert import missing_unique_constraints, reset_upsert_keys, upsert_keys
+from .views import _update_employee
+
+
+def valid_payload(index=1):
+    row = synthetic.build_row(index, random.Random(index))
+    row["date_of_birth"] = row["date_of_birth"].isoformat()
+    return {name: str(value) for name, value in row.items() if value is not None}
+
+
+class EmployeeSchemaTests(SimpleTestCase):
+    def test_valid_payload_is_coerced(self):
+        data = {**valid_payload(), "sex": "Female", "contractual": "y", "child_male": " 2 ", "remarks": "  "}
+        cleaned, errors = EMPLOYEE_SCHEMA.validate(data)
+        self.assertEqual(errors, {})
+        self.assertEqual(cleaned["sex"], "female")
+        self.assertEqual(cleaned["contractual"], "Y")
+        self.assertEqual(cleaned["child_male"], 2)
+        self.assertIsNone(cleaned["remarks"])
+        self.assertNotIn("updated_by", cleaned)
+
+    def test_all_field_errors_are_reported_together(self):
+        data = {**valid_payload(), "emp_name": "x" * 65, "sex": "unknown", "child_female": "two", "e_mail": "nope"}
+        del data["national_id"]
+        _, errors = EMPLOYEE_SCHEMA.validate(data)
+        self.assertEqual(set(errors), {"emp_name", "sex", "child_female", "e_mail", "national_id"})
+
+    def test_partial_validates_only_present_fields(self):
+        cleaned, errors = EMPLOYEE_SCHEMA.validate({"contact_no": "01711000000", "emp_code": ""}, partial=True)
+        self.assertEqual(cleaned, {"contact_no": "01711000000"})
+        self.assertEqual(errors, {"emp_code": ["This field is required."]})
+
+    def test_build_matches_model_constructor(self):
+        cleaned, _ = EMPLOYEE_SCHEMA.validate(valid_payload())
+        built = EMPLOYEE_SCHEMA.build(cleaned, updated_by=7)
+        expected = EmpPersonal(**cleaned, updated_by=7)
+        for field in EmpPersonal._meta.concrete_fields:
+            self.assertEqual(getattr(built, field.attname), getattr(expected, field.attname), field.name)
+        self.assertTrue(built._state.adding)
+
+
+class EmployeeTableMixin:
+    """Creates the unmanaged EMP_PERSONAL table for the duration of the test class."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with connection.schema_editor() as editor:
+            editor.create_model(EmpPersonal)
+
+    @classmethod
+    def tearDownClass(cls):
+        with connection.schema_editor() as editor:
+            editor.delete_model(EmpPersonal)
+        super().tearDownClass()
+
+    def tearDown(self):
+        # Unmanaged tables are not flushed between TransactionTestCase tests.
+        EmpPersonal.objects.all().delete()
+        # Buffered audit entries go in while this test's tables still exist.
+        audit.flush()
+        super().tearDown()
+
+
+class UpdateEmployeeTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("editor", password="pw")
+        self.client.force_login(self.user)
+        self.emp = synthetic.build_employee(1, random.Random(1))
+        self.emp.save()
+
+    def patch(self, emp_id, body):
+        return self.client.patch(f"/api/employee/{emp_id}/", json.dumps(body), content_type="application/json")
+
+    def updated_columns(self, queries):
+        updates = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "EMP_PERSONAL"')]
+        self.assertEqual(len(updates), 1, updates)
+        assignments = updates[0].split(" SET ", 1)[1].split(" WHERE ", 1)[0]
+        return set(re.findall(r'"(\w+)" = ', assignments))
+
+    def test_update_writes_only_changed_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.patch(self.emp.emp_id, {"contact_no": "01911000000", "nationality": "Bangladeshi"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated_fields"], ["contact_no"])
+        self.assertEqual(self.updated_columns(ctx.captured_queries), {"contact_no", "updated_by", "updated_date", "change_seq"})
+        # One narrow read: no deferred-field reloads, no search reindex.
+        reads = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT") and '"EMP_PERSONAL"' in q["sql"]]
+        self.assertEqual(len(reads), 1, reads)
+        self.assertNotIn("bang_present_vill", reads[0])
+        self.assertFalse([q for q in ctx.captured_queries if '"EMP_SEARCH_KEY"' in q["sql"]])
+
+        emp = EmpPersonal.objects.get(emp_id=self.emp.emp_id)
+        self.assertEqual(emp.contact_no, "01911000000")
+        self.assertEqual(emp.updated_by, self.user.id)
+        self.assertEqual(emp.bang_present_vill, self.emp.bang_present_vill)
+
+    def test_bangla_name_update_includes_its_keys(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.patch(self.emp.emp_id, {"bang_emp_name": "করিম সরকার"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            self.updated_columns(ctx.captured_queries),
+            {"bang_emp_name", "bang_emp_name_norm", "bang_emp_name_phon", "updated_by", "updated_date", "change_seq"},
+        )
+
+    def test_unchanged_payload_does_not_write(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.patch(self.emp.emp_id, {"contact_no": self.emp.contact_no})
+        self.assertEqual(response.json()["message"], "No changes.")
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "EMP_PERSONAL"')])
+        # The sequence value taken up front is rolled back, not skipped.
+        self.assertEqual(EmpPersonal.objects.get(emp_id=self.emp.emp_id).change_seq, EmpChangeSequence.objects.get().value)
+
+    def test_invalid_and_unknown_fields_are_rejected(self):
+        response = self.patch(self.emp.emp_id, {"sex": "robot", "emp_photo": "x.jpg", "emp_id": 5})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["errors"]), {"sex", "emp_photo", "emp_id"})
+        self.assertEqual(self.patch(self.emp.emp_id + 1, {"contact_no": "1"}).status_code, 404)
+
+    def test_taking_another_employees_unique_key_is_a_conflict(self):
+        other = synthetic.build_employee(2, random.Random(2))
+        other.save()
+        for name in ("emp_code", "national_id"):
+            response = self.patch(self.emp.emp_id, {name: getattr(other, name)})
+            self.assertEqual(response.status_code, 409, name)
+            self.assertFalse(response.json()["success"])
+        emp = EmpPersonal.objects.get(emp_id=self.emp.emp_id)
+        self.assertEqual((emp.emp_code, emp.national_id), (self.emp.emp_code, self.emp.national_id))
+        self.assertEqual(self.patch(self.emp.emp_id, {"contact_no": "01911000000"}).status_code, 200)
+
+
+class UpsertEmployeeTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        reset_upsert_keys()
+        self.user = get_user_model().objects.create_user("hris", password="pw")
+        self.client.force_login(self.user)
+
+    def post(self, body, **headers):
+        return self.client.post("/api/employee/upsert/", json.dumps(body), content_type="application/json", **headers)
+
+    def test_repeated_push_updates_in_place(self):
+        first = self.post(valid_payload())
+        self.assertEqual(first.status_code, 200, first.content)
+        second = self.post({**valid_payload(), "contact_no": "01511000000"})
+        self.assertEqual(second.json()["emp_id"], first.json()["emp_id"])
+        self.assertEqual(EmpPersonal.objects.count(), 1)
+        emp = EmpPersonal.objects.get()
+        self.assertEqual(emp.contact_no, "01511000000")
+        self.assertTrue(emp.search_keys.filter(kind="id", key=normalize_identifier(emp.emp_code)).exists())
+
+    def test_batch_is_one_insert_and_reports_bad_records(self):
+        records = [valid_payload(i) for i in range(1, 4)]
+        records.append({**valid_payload(4), "sex": "robot"})
+        records.append({**valid_payload(1), "remarks": "pushed twice"})
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post(records)
+        inserts = [q for q in ctx.captured_queries if q["sql"].startswith('INSERT INTO "EMP_PERSONAL"')]
+        self.assertEqual(len(inserts), 1)
+        report = response.json()["report"]
+        self.assertEqual((report["total"], report["upserted"], report["failed"]), (5, 4, 1))
+        self.assertEqual(report["errors"][0]["index"], 3)
+        self.assertEqual(EmpPersonal.objects.count(), 3)
+        self.assertEqual(EmpPersonal.objects.get(emp_code=records[0]["emp_code"]).remarks, "pushed twice")
+
+    def test_national_id_is_the_fallback_key(self):
+        payload = valid_payload()
+        self.post(payload)
+        response = self.post({**{k: v for k, v in payload.items() if k != "emp_code"}, "contact_no": "01311000000"})
+        self.assertEqual(response.status_code, 200, response.content)
+        emp = EmpPersonal.objects.get()
+        self.assertEqual((emp.emp_code, emp.contact_no), (payload["emp_code"], "01311000000"))
+
+    def test_national_id_of_another_employee_is_a_conflict(self):
+        existing = valid_payload(1)
+        self.post(existing)
+        clash = {**valid_payload(2), "national_id": existing["national_id"]}
+        for conflict_target in (True, False):
+            # Without a conflict target (MySQL) the clash is caught before the write.
+            with mock.patch.object(connection.features, "supports_update_conflicts_with_target", conflict_target):
+                report = self.post([clash]).json()["report"]
+            self.assertEqual((report["upserted"], report["failed"]), (0, 1), conflict_target)
+            emp = EmpPersonal.objects.get()
+            self.assertEqual((emp.emp_code, emp.emp_name), (existing["emp_code"], existing["emp_name"]))
+        self.assertIn("national_id", report["errors"][0]["errors"])
+
+    def test_idempotency_key_replays_the_first_response(self):
+        headers = {"HTTP_IDEMPOTENCY_KEY": "push-1"}
+        payload = valid_payload()
+        first = self.client.post("/api/employee/save/", json.dumps(payload), content_type="application/json", **headers)
+        retry = self.client.post("/api/employee/save/", json.dumps(payload), content_type="application/json", **headers)
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual((retry.status_code, retry.content), (201, first.content))
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(EmpPersonal.objects.count(), 1)
+
+        other = {**payload, "emp_code": "X1"}
+        reused = self.client.post("/api/employee/save/", json.dumps(other), content_type="application/json", **headers)
+        self.assertEqual(reused.status_code, 422)
+        self.assertEqual(EmpIdempotencyKey.objects.count(), 1)
+
+    def test_multipart_fingerprint_covers_fields_and_file_content(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = self.settings(MEDIA_ROOT=media_root, EMPLOYEE_DERIVATIVES_VIA_JOBS=True)
+        media.enable()
+        self.addCleanup(media.disable)
+        buffer = io.BytesIO()
+        Image.new("RGB", (40, 50), (120, 80, 60)).save(buffer, "JPEG")
+        headers = {"HTTP_IDEMPOTENCY_KEY": "photo-1"}
+
+        def save(contact_no="01711000000", trailer=b"A"):
+            photo = SimpleUploadedFile("p.jpg", buffer.getvalue() + trailer, content_type="image/jpeg")
+            return self.client.post("/api/employee/save/", {**valid_payload(), "contact_no": contact_no, "emp_photo": photo}, **headers)
+
+        first = save()
+        self.assertEqual(first.status_code, 201, first.content)
+        self.assertEqual(save()["Idempotent-Replayed"], "true")
+        # Same Content-Length each time: only the fingerprint tells these apart.
+        self.assertEqual(save(contact_no="01711000001").status_code, 422)
+        self.assertEqual(save(trailer=b"B").status_code, 422)
+        self.assertEqual(EmpPersonal.objects.count(), 1)
+
+    def test_duplicate_save_is_a_conflict(self):
+        self.client.post("/api/employee/save/", json.dumps(valid_payload()), content_type="application/json")
+        again = self.client.post("/api/employee/save/", json.dumps(valid_payload()), content_type="application/json")
+        self.assertEqual(again.status_code, 409)
+
+
+class ListEmployeesTests(EmployeeTableMixin, TransactionTestCase):
+    url = "/api/employee/"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("lister", password="pw")
+        self.client.force_login(self.user)
+        employees = [synthetic.build_employee(i, random.Random(i)) for i in range(1, 6)]
+        for emp in employees:
+            # Identical values in every listed column: only emp_id tells the rows apart.
+            emp.emp_name, emp.present_dist, emp.sex, emp.contractual = "Same Name", "Dhaka", "male", "N"
+        EmpPersonal.objects.bulk_create(employees)
+        self.ids = sorted(EmpPersonal.objects.values_list("emp_id", flat=True))
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def walk(self, after=None, **params):
+        seen = []
+        while True:
+            page = self.get(**params, **({"after": after} if after is not None else {}))
+            seen.extend(row["emp_id"] for row in page["results"])
+            after = page["next_cursor"]
+            if after is None:
+                return seen
+
+    def test_pages_are_contiguous_across_ties(self):
+        self.assertEqual(self.walk(limit=2), self.ids)
+        self.assertEqual(self.walk(limit=2, district="Dhaka", sex="male"), self.ids)
+        # A page that ends exactly on the last row has no next page.
+        self.assertIsNone(self.get(limit=5)["next_cursor"])
+        page = self.get(limit=2)
+        self.assertEqual(page["next_cursor"], self.ids[1])
+
+    def test_cursor_is_stable_under_concurrent_writes(self):
+        first = self.get(limit=2)
+        # Deleting a row already seen does not shift the next page, as an offset would.
+        EmpPersonal.objects.filter(emp_id=self.ids[0]).delete()
+        added = synthetic.build_employee(9, random.Random(9))
+        added.save()
+        rest = self.walk(limit=2, after=first["next_cursor"])
+        self.assertEqual(rest, [*self.ids[2:], added.emp_id])
+
+    def test_projection_and_invalid_parameters(self):
+        row = self.get(limit=1, fields="emp_code,contact_no")["results"][0]
+        self.assertEqual(list(row), ["emp_id", "emp_code", "contact_no"])
+        for params in ({"after": "x"}, {"after": "-1"}, {"limit": "ten"}, {"fields": "password"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertFalse(response.json()["success"])
+        self.assertEqual(self.get(after=self.ids[-1])["results"], [])
+
+
+class SearchKeyTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("searcher", password="pw")
+        self.client.force_login(self.user)
+        self.karim = self.employee(1, emp_code="HR-0042", emp_name="Karim Sarkar")
+        self.karima = self.employee(2, emp_code="HR-0421", emp_name="Karima Begum")
+
+    def employee(self, index, **values):
+        emp = synthetic.build_employee(index, random.Random(index))
+        for name, value in values.items():
+            setattr(emp, name, value)
+        emp.save()
+        return emp
+
+    def keys(self, emp, kind):
+        return set(EmpSearchKey.objects.filter(employee_id=emp.pk, kind=kind).values_list("key", flat=True))
+
+    def search(self, term):
+        return sorted(search_employees(term).values_list("emp_id", flat=True))
+
+    def test_keys_follow_save_update_and_delete(self):
+        self.assertIn("HR0042", self.keys(self.karim, "id"))
+        self.assertTrue({"karim", "sarkar"} <= self.keys(self.karim, "name"))
+
+        response = self.client.patch(
+            f"/api/employee/{self.karim.pk}/", json.dumps({"emp_name": "Rahim Sarkar", "emp_code": "HR-0043"}), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        names, identifiers = self.keys(self.karim, "name"), self.keys(self.karim, "id")
+        self.assertIn("rahim", names)
+        self.assertNotIn("karim", names)
+        self.assertEqual(("HR0043" in identifiers, "HR0042" in identifiers), (True, False))
+
+        self.karim.delete()
+        self.assertFalse(EmpSearchKey.objects.filter(employee_id=self.karim.pk).exists())
+        self.assertTrue(EmpSearchKey.objects.filter(employee_id=self.karima.pk).exists())
+
+    def test_prefix_lookups(self):
+        both = sorted([self.karim.pk, self.karima.pk])
+        self.assertEqual(self.search("kar"), both)
+        self.assertEqual(self.search("KARIMA"), [self.karima.pk])
+        # Every token must match, each as a prefix.
+        self.assertEqual(self.search("kari sar"), [self.karim.pk])
+        self.assertEqual(self.search("karim nobody"), [])
+        # Identifiers ignore punctuation; an exact match wins over longer codes sharing the prefix.
+        self.assertEqual(self.search("hr-0042"), [self.karim.pk])
+        self.assertEqual(self.search("hr/004"), [self.karim.pk])
+        self.assertEqual(self.search("HR0"), both)
+        self.assertEqual(self.search("HR-9"), [])
+
+        response = self.client.get("/api/employee/search/", {"q": "kar", "fields": "emp_code"})
+        self.assertEqual(response.json()["results"], [{"emp_id": pk, "emp_code": code} for pk, code in zip(both, ("HR-0042", "HR-0421"))])
+        self.assertEqual(self.client.get("/api/employee/search/").status_code, 400)
+
+
+class BanglaNameTests(EmployeeTableMixin, TransactionTestCase):
+    # (typed variant, canonical spelling)
+    VARIANTS = (
+        ("\u09b8\u09a1\u09bc\u0995", "\u09b8\u09dc\u0995"),  # nukta typed separately
+        ("\u09b0\u200d\u09b9\u09bf\u200c\u09ae", "\u09b0\u09b9\u09bf\u09ae"),  # stray ZWJ/ZWNJ
+        ("\u09b6\u09b0\u09a4\u09cd", "\u09b6\u09b0\u09ce"),  # khanda-ta as ta + hasanta
+        ("\u09c7\u0995\u09b0\u09be\u09ae\u09a4", "\u0995\u09c7\u09b0\u09be\u09ae\u09a4"),  # e-kar typed first
+        ("\u09ae\u09c7\u09be\u09b9\u09be\u09ae\u09cd\u09ae\u09a6", "\u09ae\u09cb\u09b9\u09be\u09ae\u09cd\u09ae\u09a6"),  # o-kar in two parts
+        ("\u09ac\u09be\u09a1\u09bc\u09bf  \u09e7\u09e8", "\u09ac\u09be\u09dc\u09bf 12"),  # Bengali digits, spacing
+    )
+
+    def test_variant_spellings_share_keys(self):
+        for typed, canonical in self.VARIANTS:
+            self.assertEqual(bangla.normalize(typed), bangla.normalize(canonical), canonical)
+            self.assertEqual(bangla.phonetic_key(typed), bangla.phonetic_key(canonical), canonical)
+        self.assertEqual(bangla.phonetic_key("\u09b0\u09b9\u09bf\u09ae \u0989\u09a6\u09cd\u09a6\u09bf\u09a8"), bangla.phonetic_key("Rahim Uddin"))
+
+    def test_shadow_columns_find_variant_spellings(self):
+        user = get_user_model().objects.create_user("bangla", password="pw")
+        self.client.force_login(user)
+        # Rahim Uddin, stored as typed on a keyboard that inserts a ZWJ.
+        stored = "\u09b0\u200d\u09b9\u09bf\u09ae \u0989\u09a6\u09cd\u09a6\u09bf\u09a8"
+        emp = synthetic.build_employee(1, random.Random(1))
+        emp.bang_emp_name = stored
+        emp.save()
+        other = synthetic.build_employee(2, random.Random(2))
+        other.bang_emp_name = "\u0995\u09b0\u09bf\u09ae"
+        other.save()
+
+        row = EmpPersonal.objects.values("bang_emp_name_norm", "bang_emp_name_phon").get(emp_id=emp.emp_id)
+        self.assertEqual(row, {"bang_emp_name_norm": bangla.normalize(stored), "bang_emp_name_phon": "RHMDN"})
+        self.assertEqual(lookup_bangla_name("\u09b0\u09b9\u09bf"), [("normalized", emp.emp_id)])
+        self.assertEqual(lookup_bangla_name("rahim"), [("phonetic", emp.emp_id)])
+        self.assertEqual(lookup_bangla_name("\u09b0\u09be\u09b9\u09bf\u09ae"), [("phonetic", emp.emp_id)])
+
+        response = self.client.get("/api/employee/lookup/bangla/", {"q": "Rahim Uddin", "fields": "emp_code"})
+        self.assertEqual(response.json()["results"], [{"emp_id": emp.emp_id, "emp_code": emp.emp_code, "match": "phonetic"}])
+        self.assertEqual(self.client.get("/api/employee/lookup/bangla/", {"q": "x", "field": "emp_name"}).status_code, 400)
+
+
+@override_settings(EMPLOYEE_DERIVATIVES_VIA_JOBS=True, EMPLOYEE_THUMBNAIL_SIZES=(128, 384))
+class DerivativeTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = self.settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = get_user_model().objects.create_user("scanner", password="pw")
+        self.client.force_login(self.user)
+
+    def upload(self, name, image, fmt):
+        buffer = io.BytesIO()
+        image.save(buffer, fmt)
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type=f"image/{fmt.lower()}")
+
+    def test_photo_thumbnails_and_clean_signature(self):
+        signature = Image.new("RGB", (1600, 500), (250, 250, 245))
+        signature.paste((20, 20, 20), (200, 150, 1400, 260))
+        response = self.client.post(
+            "/api/employee/save/",
+            {
+                **valid_payload(),
+                "emp_photo": self.upload("p.jpg", Image.new("RGB", (1200, 900), (120, 80, 60)), "JPEG"),
+                "emp_signature": self.upload("s.png", signature, "PNG"),
+            },
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        emp_id = response.json()["emp_id"]
+        # Queued, not built on the request path.
+        self.assertEqual(self.client.get(f"/api/employee/{emp_id}/images/").json()["derivatives"], {})
+
+        WorkerPool(workers=0).run(burst=True)
+        emp = EmpPersonal.objects.get(emp_id=emp_id)
+        names = derivatives.derivative_names(emp)
+        for size, dimensions in ((128, (128, 96)), (384, (384, 288))):
+            for ext, fmt in (("webp", "WEBP"), ("jpg", "JPEG")):
+                with Image.open(os.path.join(self.media_root, names[f"photo_{size}_{ext}"])) as thumb:
+                    self.assertEqual((thumb.format, thumb.size), (fmt, dimensions))
+        with Image.open(os.path.join(self.media_root, names["signature_clean"])) as clean:
+            # Cropped to the ink, then scaled down to the maximum width.
+            self.assertEqual((clean.format, clean.mode, clean.width), ("PNG", "1", 600))
+            self.assertLess(clean.height, 100)
+        self.assertEqual(set(self.client.get(f"/api/employee/{emp_id}/images/").json()["derivatives"]), set(names))
+
+
+@override_settings(EMPLOYEE_UPLOAD_MAX_FILE_BYTES=20_000, EMPLOYEE_UPLOAD_MAX_REQUEST_BYTES=50_000, EMPLOYEE_DERIVATIVES_VIA_JOBS=True)
+class UploadLimitTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = self.settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = get_user_model().objects.create_user("uploader", password="pw")
+        self.client.force_login(self.user)
+
+    def image(self, fmt="PNG", size=(40, 50), noise=0):
+        image = Image.frombytes("RGB", size, random.Random(1).randbytes(size[0] * size[1] * 3)) if noise else Image.new("RGB", size)
+        buffer = io.BytesIO()
+        image.save(buffer, fmt)
+        return buffer.getvalue()
+
+    def save(self, content, name="p.png"):
+        photo = SimpleUploadedFile(name, content, content_type="image/png")
+        return self.client.post("/api/employee/save/", {**valid_payload(), "emp_photo": photo})
+
+    def incoming(self):
+        directory = os.path.join(self.media_root, "employees", ".incoming")
+        return os.listdir(directory) if os.path.isdir(directory) else []
+
+    def test_oversized_file_stops_the_upload(self):
+        handler = EmployeeImageUploadHandler()
+        handler.new_file("emp_photo", "p.png", "image/png", None)
+        with self.assertRaises(StopUpload):
+            handler.receive_data_chunk(b"\0" * 20_001, 0)
+        self.assertEqual(handler.error.status, 413)
+        handler.upload_interrupted()
+
+        big = self.image(size=(100, 100), noise=True)
+        self.assertGreater(len(big), 20_000)
+        response = self.save(big)
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("emp_photo exceeds 20000 bytes", response.json()["message"])
+        self.assertEqual(self.incoming(), [])
+        # Content-Length alone rules out a body over the request limit before it is read.
+        too_long = self.client.post("/api/employee/save/", {"emp_photo": SimpleUploadedFile("p.png", b"\0" * 60_000)})
+        self.assertEqual(too_long.status_code, 413)
+        self.assertFalse(EmpPersonal.objects.exists())
+
+    def test_non_images_are_rejected(self):
+        for content, name in ((b"%PDF-1.4 " * 100, "p.png"), (self.image("GIF"), "p.gif")):
+            response = self.save(content, name)
+            self.assertEqual(response.status_code, 400, name)
+            self.assertFalse(response.json()["success"])
+        self.assertEqual(self.incoming(), [])
+        self.assertFalse(EmpPersonal.objects.exists())
+
+        saved = self.save(self.image("JPEG"), "renamed.png")
+        self.assertEqual(saved.status_code, 201, saved.content)
+        # The stored name follows the sniffed format, not the client's extension.
+        self.assertTrue(EmpPersonal.objects.get().emp_photo.name.endswith(".jpg"))
+
+
+class StreamingExportTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("exporter", password="pw")
+        self.client.force_login(self.user)
+        employees = [synthetic.build_employee(i, random.Random(i)) for i in range(1, 6)]
+        employees[0].emp_name = 'Quote "Comma", Name'
+        EmpPersonal.objects.bulk_create(employees)
+        self.rows = list(EmpPersonal.objects.order_by("emp_id").values_list("emp_id", "emp_code", "emp_name", "bang_emp_name"))
+
+    def test_batches_cross_the_chunk_boundary(self):
+        fields = ["emp_id", "emp_code", "emp_name", "bang_emp_name"]
+        response = export_response(EmpPersonal.objects.all(), fields, "csv", chunk_size=2)
+        self.assertTrue(response.streaming)
+        chunks = iter(response.streaming_content)
+        with CaptureQueriesContext(connection) as ctx:
+            header = next(chunks)
+        # The header goes out before the first query.
+        self.assertEqual((header, ctx.captured_queries), ("\ufeffemp_id,emp_code,emp_name,bang_emp_name\r\n".encode(), []))
+        with CaptureQueriesContext(connection) as ctx:
+            body = [chunk for chunk in chunks]
+        # 2 + 2 + 1 rows; the short last batch ends the export without another query.
+        self.assertEqual(len(body), 3)
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertIn('"emp_id" > ', ctx.captured_queries[1]["sql"])
+        exported = list(csv.reader(io.StringIO(b"".join([header, *body]).decode("utf-8-sig"))))
+        self.assertEqual(exported[1:], [[str(v) for v in row] for row in self.rows])
+
+        # Exactly one full batch: the next (empty) page is read to find the end.
+        with CaptureQueriesContext(connection) as ctx:
+            b"".join(export_response(EmpPersonal.objects.filter(emp_id__in=[r[0] for r in self.rows[:2]]), fields, chunk_size=2).streaming_content)
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_endpoint_streams_csv_and_xlsx(self):
+        response = self.client.get("/api/employee/export/", {"format": "csv", "fields": "emp_code,bang_emp_name"})
+        self.assertEqual((response.status_code, response["Content-Type"]), (200, "text/csv; charset=utf-8"))
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="employees.csv"')
+        lines = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode("utf-8-sig"))))
+        self.assertEqual(lines, [["emp_id", "emp_code", "bang_emp_name"], *([str(r[0]), r[1], r[3]] for r in self.rows)])
+
+        response = self.client.get("/api/employee/export/", {"format": "xlsx", "fields": "emp_code,emp_name"})
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="employees.xlsx"')
+        sheet = load_workbook(io.BytesIO(b"".join(response.streaming_content)), read_only=True).active
+        self.assertEqual(list(sheet.iter_rows(values_only=True)), [("emp_id", "emp_code", "emp_name"), *(r[:3] for r in self.rows)])
+
+        self.assertEqual(self.client.get("/api/employee/export/", {"format": "pdf"}).status_code, 400)
+
+
+class SyntheticEmployeesTests(EmployeeTableMixin, TransactionTestCase):
+    def rows(self, seed, first_index, size):
+        return [row for _, row, _ in synthetic.iter_block(seed, first_index // synthetic.BLOCK_SIZE, first_index, size)]
+
+    def stored(self):
+        return list(EmpPersonal.objects.order_by("emp_id").values())
+
+    def test_fixed_seed_gives_the_same_rows(self):
+        self.assertEqual(self.rows(7, 0, 20), self.rows(7, 0, 20))
+        self.assertNotEqual(self.rows(7, 0, 20), self.rows(8, 0, 20))
+        # A run that starts part way through a block draws the same rows as a full one.
+        self.assertEqual(self.rows(7, 15, 5), self.rows(7, 0, 20)[15:])
+        self.assertEqual(list(synthetic.blocks(5, start=synthetic.BLOCK_SIZE - 2)), [(0, synthetic.BLOCK_SIZE - 2, 2), (1, synthetic.BLOCK_SIZE, 3)])
+
+        runs = []
+        for _ in range(2):
+            self.assertEqual(synthetic.generate_block(7, 0, 0, 12, first_emp_id=100, change_seq=3, batch_size=5), (12, 0))
+            runs.append((self.stored(), sorted(EmpSearchKey.objects.values_list("employee_id", "kind", "key"))))
+            EmpPersonal.objects.all().delete()
+        self.assertEqual(runs[0], runs[1])
+        self.assertEqual([row["emp_id"] for row in runs[0][0]], list(range(100, 112)))
+        self.assertEqual({row["change_seq"] for row in runs[0][0]}, {3})
+        self.assertEqual([row["emp_code"] for row in runs[0][0]], [row["emp_code"] for row in self.rows(7, 0, 12)])
+
+
+class ImportEmployeesTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("importer", password="pw")
+        self.client.force_login(self.user)
+
+    def csv_bytes(self, rows, trailer=b""):
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=sorted(set().union(*rows)))
+        writer.writeheader()
+        writer.writerows(rows)
+        # Blank lines are skipped; they push the trailer past the decoder's first read.
+        return out.getvalue().encode("utf-8") + (b"\r\n" * 10000 + trailer if trailer else b"")
+
+    def post(self, content, name="staff.csv", **data):
+        return self.client.post("/api/employee/import/", {"file": SimpleUploadedFile(name, content), **data})
+
+    def test_import_reports_created_and_failed_rows(self):
+        rows = [valid_payload(1), {**valid_payload(2), "sex": "robot"}, valid_payload(3)]
+        response = self.post(self.csv_bytes(rows), batch_size="2")
+        self.assertEqual(response.status_code, 200)
+        report = response.json()["report"]
+        self.assertEqual((report["total"], report["created"], report["failed"]), (3, 2, 1))
+        self.assertEqual(report["errors"], [{"row": 3, "errors": {"sex": mock.ANY}}])
+        self.assertEqual(set(EmpPersonal.objects.values_list("emp_code", flat=True)), {rows[0]["emp_code"], rows[2]["emp_code"]})
+        self.assertEqual(EmpPersonal.objects.get(emp_code=rows[0]["emp_code"]).updated_by, self.user.id)
+
+        self.assertEqual(self.post(b"x", name="staff.txt").status_code, 400)
+        self.assertEqual(self.post(b"x", batch_size="many").status_code, 400)
+
+    def test_unreadable_tail_keeps_and_reports_committed_rows(self):
+        rows = [valid_payload(i) for i in range(1, 4)]
+        response = self.post(self.csv_bytes(rows, trailer=b"\xff\xfe,bad\r\n"), batch_size="2")
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertIn("UTF-8", body["message"])
+        self.assertEqual((body["report"]["total"], body["report"]["created"]), (3, 3))
+        self.assertEqual(EmpPersonal.objects.count(), 3)
+
+    def test_management_command(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, "staff.csv")
+        with open(path, "wb") as fileobj:
+            fileobj.write(self.csv_bytes([valid_payload(1), {**valid_payload(2), "emp_name": ""}]))
+        out, err = io.StringIO(), io.StringIO()
+        call_command("import_employees", path, "--user-id", str(self.user.id), stdout=out, stderr=err)
+        self.assertIn("Imported 1 of 2 rows (1 failed).", out.getvalue())
+        self.assertIn("Row 3:", err.getvalue())
+        self.assertEqual(EmpPersonal.objects.get().updated_by, self.user.id)
+
+        with open(path, "wb") as fileobj:
+            fileobj.write(self.csv_bytes([valid_payload(3)], trailer=b"\xff\r\n"))
+        with self.assertRaisesMessage(CommandError, "Imported 1 of 1 rows before the error."):
+            call_command("import_employees", path, stdout=io.StringIO())
+        with self.assertRaises(CommandError):
+            call_command("import_employees", os.path.join(directory, "missing.csv"))
+        self.assertEqual(EmpPersonal.objects.count(), 2)
+
+
+class SideTableTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        reset_upsert_keys()
+        self.user = get_user_model().objects.create_user("clerk", password="pw")
+        self.client.force_login(self.user)
+
+    def post(self, url, body):
+        return self.client.post(url, json.dumps(body), content_type="application/json")
+
+    def test_cold_columns_live_in_side_tables(self):
+        payload = {**valid_payload(), "emrg_address": "Mirpur 10", "sob": "BRAC"}
+        emp_id = self.post("/api/employee/save/", payload).json()["emp_id"]
+        self.assertEqual(EmpContactDetail.objects.get(pk=emp_id).emrg_address, "Mirpur 10")
+        self.assertEqual(EmpEducationDetail.objects.get(pk=emp_id).sob, "BRAC")
+
+        with CaptureQueriesContext(connection) as ctx:
+            emp = EmpPersonal.objects.get(pk=emp_id)
+        self.assertNotIn("bang_present_vill", ctx.captured_queries[0]["sql"])
+        with self.assertNumQueries(1):
+            self.assertEqual(emp.bang_present_vill, payload["bang_present_vill"])
+            self.assertEqual(emp.bang_permanent_dist, payload["bang_permanent_dist"])
+
+        rows = self.client.get("/api/employee/", {"fields": "emp_code,emrg_address,ref_relation"}).json()["results"]
+        self.assertEqual(rows, [{"emp_id": emp_id, "emp_code": payload["emp_code"], "emrg_address": "Mirpur 10", "ref_relation": None}])
+
+    def test_patch_writes_only_the_side_table(self):
+        emp = synthetic.build_employee(1, random.Random(1))
+        emp.save()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                f"/api/employee/{emp.emp_id}/", json.dumps({"ref_relation": "Uncle"}), content_type="application/json"
+            )
+        self.assertEqual(response.json()["updated_fields"], ["ref_relation"])
+        writes = [q["sql"].split(" SET ")[0] for q in ctx.captured_queries if q["sql"].startswith(("UPDATE", "INSERT"))]
+        self.assertEqual(writes, ['UPDATE "EMP_CHANGE_SEQ"', 'UPDATE "EMP_PERSONAL"', 'UPDATE "EMP_CONTACT_DETAIL"'])
+        self.assertEqual(EmpContactDetail.objects.get(pk=emp.emp_id).ref_relation, "Uncle")
+
+    def test_bulk_writes_and_upserts_replace_side_rows(self):
+        records = [{**valid_payload(i), "ref_contact_name": f"Ref {i}"} for i in (1, 2)]
+        report = self.post("/api/employee/upsert/", records).json()["report"]
+        self.assertEqual(EmpContactDetail.objects.filter(ref_contact_name__startswith="Ref").count(), 2)
+
+        del records[0]["ref_contact_name"], records[0]["emergency_cell"]
+        self.post("/api/employee/upsert/", records)
+        first = report["results"][0]["emp_id"]
+        self.assertFalse(EmpContactDetail.objects.filter(pk=first).exists())
+        self.assertEqual(EmpPersonal.objects.get(pk=first).ref_contact_name, None)
+        self.assertEqual(EmpAddressDetail.objects.count(), 2)
+
+
+    def test_moved_columns_are_restored_backwards_and_dropped_on_demand(self):
+        emp_id = self.post("/api/employee/save/", {**valid_payload(), "emrg_address": "Mirpur 10", "sob": "BRAC"}).json()["emp_id"]
+        migration = importlib.import_module("employee.migrations.0013_drop_side_columns")
+        apps = MigrationLoader(connection).project_state(("employee", "0012_side_tables")).apps
+        with connection.schema_editor() as editor:
+            migration.restore_columns(apps, editor)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT emrg_address, sob FROM "EMP_PERSONAL" WHERE emp_id = %s', [emp_id])
+            self.assertEqual(cursor.fetchone(), ("Mirpur 10", "BRAC"))
+
+        EmpContactDetail.objects.filter(pk=emp_id).delete()
+        with self.assertRaises(CommandError):
+            call_command("drop_moved_employee_columns", stdout=io.StringIO())
+        EmpContactDetail.objects.create(employee_id=emp_id, emrg_address="Mirpur 10")
+        call_command("drop_moved_employee_columns", stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            columns = {column.name for column in connection.introspection.get_table_description(cursor, "EMP_PERSONAL")}
+        self.assertFalse(columns & set(migration.MOVED_COLUMNS))
+
+
+@override_settings(EMPLOYEE_AUDIT_FLUSH_INTERVAL=0)
+class AuditTrailTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        reset_upsert_keys()
+        self.user = get_user_model().objects.create_user("auditor", password="pw")
+        self.client.force_login(self.user)
+        self.emp = synthetic.build_employee(1, random.Random(1))
+        self.emp.save()
+
+    def patch(self, body):
+        return self.client.patch(f"/api/employee/{self.emp.emp_id}/", json.dumps(body), content_type="application/json")
+
+    def history(self, **params):
+        return self.client.get(f"/api/employee/{self.emp.emp_id}/history/", params).json()
+
+    def test_changes_are_recorded_per_field(self):
+        self.patch({"contact_no": "01911000000", "nationality": self.emp.nationality, "ref_relation": "Uncle"})
+        [entry] = self.history()["results"]
+        self.assertEqual(entry["action"], "update")
+        self.assertEqual(entry["source"], "api")
+        self.assertEqual(entry["changed_by"], self.user.id)
+        self.assertEqual(
+            entry["changes"], {"contact_no": [self.emp.contact_no, "01911000000"], "ref_relation": [None, "Uncle"]}
+        )
+
+        payload = valid_payload(2)
+        emp_id = self.client.post("/api/employee/save/", json.dumps(payload), content_type="application/json").json()["emp_id"]
+        created = EmpAuditEntry.objects.get(emp_id=emp_id)
+        self.assertEqual(created.action, "create")
+        self.assertEqual(created.changes["emp_code"], [None, payload["emp_code"]])
+        self.assertEqual(created.changes["date_of_birth"], [None, payload["date_of_birth"]])
+
+    def test_entries_are_written_behind_and_only_after_commit(self):
+        with override_settings(EMPLOYEE_AUDIT_FLUSH_INTERVAL=3600):
+            self.patch({"contact_no": "01911000000"})
+            self.assertFalse(EmpAuditEntry.objects.exists())
+            self.assertEqual(audit._buffer.pending(), 1)
+            # Reading the history flushes what this process still holds.
+            self.assertEqual(len(self.history()["results"]), 1)
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            _update_employee(self.emp.emp_id, {"contact_no": "01711000000"}, self.user.id)
+            raise RuntimeError
+        self.assertEqual(audit.flush(), 0)
+        self.assertEqual(EmpAuditEntry.objects.count(), 1)
+
+    def test_flusher_closes_connections_only_after_writing(self):
+        buffer = audit.AuditBuffer()
+        with mock.patch.object(audit.connections, "close_all") as close_all:
+            buffer._background_flush()
+            close_all.assert_not_called()
+            buffer._pending.append((self.emp.emp_id, "update", "api", self.user.id, timezone.now(), {"remarks": [None, "x"]}))
+            buffer._background_flush()
+        close_all.assert_called_once_with()
+        self.assertEqual(EmpAuditEntry.objects.count(), 1)
+
+    def test_history_is_paginated_newest_first(self):
+        for number in ("01711000001", "01711000002", "01711000003"):
+            self.patch({"contact_no": number})
+        page = self.history(limit=2)
+        self.assertEqual([entry["changes"]["contact_no"][1] for entry in page["results"]], ["01711000003", "01711000002"])
+        rest = self.history(limit=2, before=page["next_cursor"])
+        self.assertEqual([entry["changes"]["contact_no"][1] for entry in rest["results"]], ["01711000001"])
+        self.assertIsNone(rest["next_cursor"])
+        self.assertEqual(self.client.get(f"/api/employee/{self.emp.emp_id}/history/?before=x").status_code, 400)
+
+
+class DuplicateDetectionTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("registrar", password="pw")
+        self.client.force_login(self.user)
+        self.original = {**valid_payload(1), "national_id": "1234567890123"}
+        response = self.save(self.original)
+        self.original_id = response.json()["emp_id"]
+        self.assertEqual(response.json()["possible_duplicates"], [])
+
+    def save(self, payload):
+        return self.client.post("/api/employee/save/", json.dumps(payload), content_type="application/json")
+
+    def test_keys_fold_id_formats_and_scripts(self):
+        self.assertEqual(duplicates.normalize_id("1985 1234-567890123"), "1234567890123")
+        self.assertEqual(duplicates.name_key("Md. Rahim Uddin"), duplicates.name_key("মোঃ রহিম উদ্দিন"))
+        self.assertEqual(duplicates.name_key("Mohammad Rahim Uddin"), "RHMDN")
+
+    def test_save_warns_about_probable_duplicates(self):
+        original = self.original
+        reregistered = {
+            **valid_payload(2),
+            "emp_name": "Md. " + original["emp_name"],
+            # Old 13-digit NID re-entered in its 17-digit form (birth year prefixed).
+            "national_id": original["date_of_birth"][:4] + original["national_id"],
+            **{name: original[name] for name in ("date_of_birth", "sex", "father_name", "mother_name", "bang_father_name", "bang_mother_name")},
+        }
+        # Same parents, different name and birthday: a sibling, not a duplicate.
+        sibling = {**valid_payload(3), **{name: original[name] for name in ("father_name", "mother_name", "bang_father_name", "bang_mother_name")}}
+        sibling_response = self.save(sibling)
+        self.assertEqual(sibling_response.json()["possible_duplicates"], [])
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.save(reregistered)
+        self.assertEqual(response.status_code, 201, response.content)
+        [match] = response.json()["possible_duplicates"]
+        self.assertEqual(match["emp_id"], self.original_id)
+        self.assertEqual(match["score"], 1.0)
+        self.assertEqual(set(match["reasons"]), {"identifier", "name", "date_of_birth", "father", "mother"})
+        # The check itself is two indexed reads: the shared blocking keys, then the candidates' rows by primary key.
+        selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len([sql for sql in selects if 'FROM "EMP_SEARCH_KEY"' in sql]), 1)
+        self.assertEqual(len([sql for sql in selects if 'FROM "EMP_PERSONAL"' in sql and '"EMP_PERSONAL"."emp_id" IN' in sql]), 1)
+
+        new_id = response.json()["emp_id"]
+        results = self.client.get(f"/api/employee/{new_id}/duplicates/").json()["results"]
+        self.assertEqual([r["emp_id"] for r in results], [self.original_id])
+        self.assertEqual(self.client.get("/api/employee/999999/duplicates/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/employee/{new_id}/duplicates/?min_score=2").status_code, 400)
+
+        out = io.StringIO()
+        call_command("find_duplicates", stdout=out, stderr=io.StringIO())
+        rows = list(csv.reader(io.StringIO(out.getvalue())))
+        self.assertEqual(rows, [["emp_id", "other_id", "score", "reasons"], [str(self.original_id), str(new_id), "1.00", " ".join(match["reasons"])]])
+
+        with self.settings(EMPLOYEE_DUPLICATE_CHECK_ON_SAVE=False):
+            self.assertEqual(self.save({**reregistered, "emp_code": "X2", "national_id": "9876543210"}).json()["possible_duplicates"], [])
+
+
+class ChangeFeedTests(EmployeeTableMixin, TransactionTestCase):
+    url = "/api/employee/changes/"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("payroll", password="pw")
+        self.client.force_login(self.user)
+        EmpPersonal.objects.bulk_create([synthetic.build_employee(i, random.Random(i)) for i in range(1, 4)])
+        self.ids = sorted(EmpPersonal.objects.values_list("emp_id", flat=True))
+
+    def pull(self, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        response = self.client.get(self.url, {"fields": "emp_code,contact_no", **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_pages_through_changes_and_deletions(self):
+        # The three rows share one change_seq (one bulk insert); emp_id orders them.
+        first = self.pull(limit=2)
+        self.assertEqual(first["fields"], ["emp_id", "emp_code", "contact_no"])
+        self.assertEqual([row[0] for row in first["changed"]], self.ids[:2])
+        self.assertTrue(first["has_more"])
+        second = self.pull(first["next_cursor"], limit=2)
+        self.assertEqual(([row[0] for row in second["changed"]], second["has_more"]), ([self.ids[2]], False))
+        cursor = second["next_cursor"]
+        self.assertEqual(self.pull(cursor)["next_cursor"], cursor)
+
+        self.client.patch(f"/api/employee/{self.ids[1]}/", json.dumps({"contact_no": "01911000000"}), content_type="application/json")
+        EmpPersonal.objects.filter(emp_id=self.ids[2]).update(remarks="moved")
+        EmpPersonal.objects.filter(emp_id=self.ids[0]).delete()
+        batch = self.pull(cursor)
+        self.assertEqual(batch["changed"], [[self.ids[1], mock.ANY, "01911000000"], [self.ids[2], mock.ANY, mock.ANY]])
+        self.assertEqual(batch["deleted"], [self.ids[0]])
+        self.assertEqual(self.pull(batch["next_cursor"])["changed"], [])
+
+        # A row changed again is sent once, at its latest position.
+        EmpPersonal.objects.get(emp_id=self.ids[1]).save()
+        self.assertEqual([row[0] for row in self.pull(cursor)["changed"]], [self.ids[2], self.ids[1]])
+
+    def test_pruned_tombstones_expire_old_cursors(self):
+        cursor = self.pull()["next_cursor"]
+        EmpPersonal.objects.filter(emp_id=self.ids[0]).delete()
+        EmpTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=120))
+        call_command("prune_employee_tombstones", stdout=io.StringIO())
+        self.assertFalse(EmpTombstone.objects.exists())
+
+        response = self.client.get(self.url, {"since": cursor})
+        self.assertEqual((response.status_code, response.json()["resync"]), (410, True))
+        fresh = self.pull()
+        self.assertEqual([row[0] for row in fresh["changed"]], self.ids[1:])
+        self.assertEqual(self.client.get(self.url, {"since": "x"}).status_code, 400)
+
+    def test_update_matching_nothing_does_not_allocate(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(EmpPersonal.objects.filter(emp_id=0).update(remarks="none"), 0)
+        self.assertFalse([q for q in ctx.captured_queries if "EMP_CHANGE_SEQ" in q["sql"]])
+        self.assertEqual(EmpPersonal.objects.filter(emp_id=self.ids[0]).update(remarks="one"), 1)
+
+    def test_counter_is_locked_before_the_rows(self):
+        def first_touch(queries):
+            statements = [q["sql"] for q in queries if "EMP_CHANGE_SEQ" in q["sql"] or '"EMP_PERSONAL"' in q["sql"]]
+            return statements[0]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.patch(f"/api/employee/{self.ids[1]}/", json.dumps({"contact_no": "01911000000"}), content_type="application/json")
+        self.assertIn("EMP_CHANGE_SEQ", first_touch(ctx.captured_queries))
+        emp = EmpPersonal.objects.get(emp_id=self.ids[0])
+        with CaptureQueriesContext(connection) as ctx:
+            emp.delete()
+        self.assertIn("EMP_CHANGE_SEQ", first_touch(ctx.captured_queries))
+        self.assertEqual(EmpTombstone.objects.get(emp_id=self.ids[0]).change_seq, EmpChangeSequence.objects.get().value)
+
+
+class ConditionalGetTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("viewer", password="pw")
+        self.client.force_login(self.user)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = self.settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        os.makedirs(os.path.join(self.media_root, "employees"))
+        Image.new("RGB", (60, 80), (120, 80, 60)).save(os.path.join(self.media_root, "employees", "p.jpg"))
+        emp = synthetic.build_employee(1, random.Random(1))
+        emp.emp_photo = "employees/p.jpg"
+        emp.save()
+        self.emp = emp
+
+    def test_employee_etag_changes_with_each_write(self):
+        url = f"/api/employee/{self.emp.emp_id}/"
+        response = self.client.get(url, {"fields": "emp_code,contact_no"})
+        self.assertEqual(response.json()["employee"], {"emp_id": self.emp.emp_id, "emp_code": self.emp.emp_code, "contact_no": self.emp.contact_no})
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        etag = response["ETag"]
+        self.assertNotEqual(self.client.get(url)["ETag"], etag)
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(url, {"fields": "emp_code,contact_no"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((cached.status_code, cached["ETag"]), (304, etag))
+        self.assertNotIn("EMP_CODE", " ".join(q["sql"] for q in queries).upper())
+
+        self.client.patch(url, json.dumps({"contact_no": "01911000000"}), content_type="application/json")
+        fresh = self.client.get(url, {"fields": "emp_code,contact_no"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((fresh.status_code, fresh.json()["employee"]["contact_no"]), (200, "01911000000"))
+        self.assertNotEqual(fresh["ETag"], etag)
+        self.assertEqual(self.client.get("/api/employee/999999/").status_code, 404)
+
+    def test_image_revalidation_and_versioned_urls(self):
+        photo_url = self.client.get(f"/api/employee/{self.emp.emp_id}/images/").json()["urls"]["photo"]
+        response = self.client.get(photo_url)
+        with open(os.path.join(self.media_root, "employees", "p.jpg"), "rb") as original:
+            self.assertEqual(b"".join(response.streaming_content), original.read())
+        self.assertEqual(response["Cache-Control"], "private, max-age=31536000, immutable")
+        self.assertTrue(photo_url.endswith(f"?v={response['ETag'].strip(chr(34))}"))
+
+        plain_url = photo_url.split("?")[0]
+        with mock.patch("django.core.files.storage.FileSystemStorage.open") as opened:
+            self.assertEqual(self.client.get(plain_url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+            self.assertEqual(self.client.get(plain_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code, 304)
+        opened.assert_not_called()
+
+        Image.new("RGB", (60, 80), (10, 200, 10)).save(os.path.join(self.media_root, "employees", "p.jpg"))
+        os.utime(os.path.join(self.media_root, "employees", "p.jpg"), (1, 1))
+        stale = self.client.get(photo_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual((stale.status_code, stale["Cache-Control"]), (200, "private, no-cache"))
+        self.assertEqual(self.client.get(f"/api/employee/{self.emp.emp_id}/images/signature/").status_code, 404)
+
+
+class BackgroundJobTests(EmployeeTableMixin, TransactionTestCase):
+    def setUp(self):
+        reset_upsert_keys()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = self.settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = get_user_model().objects.create_user("importer", password="pw")
+        self.client.force_login(self.user)
+
+    def run_jobs(self):
+        WorkerPool(workers=0).run(burst=True)
+
+    def test_import_runs_in_a_job(self):
+        rows = [valid_payload(1), {**valid_payload(2), "sex": "robot"}]
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=sorted(set(rows[0]) | set(rows[1])))
+        writer.writeheader()
+        writer.writerows(rows)
+        upload = SimpleUploadedFile("staff.csv", out.getvalue().encode("utf-8"), content_type="text/csv")
+
+        response = self.client.post("/api/employee/import/", {"file": upload, "background": "1"})
+        self.assertEqual(response.status_code, 202)
+        status_url = response.json()["status_url"]
+        self.assertFalse(EmpPersonal.objects.exists())
+
+        self.run_jobs()
+        job = self.client.get(status_url).json()["job"]
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual((job["result"]["created"], job["result"]["failed"]), (1, 1))
+        self.assertEqual(job["progress"]["done"], 2)
+        self.assertEqual(EmpPersonal.objects.get().emp_code, rows[0]["emp_code"])
+        self.assertEqual(os.listdir(os.path.join(self.media_root, "imports")), [])
+
+        bad = SimpleUploadedFile("staff.txt", b"x")
+        self.assertEqual(self.client.post("/api/employee/import/", {"file": bad, "background": "1"}).status_code, 400)
+
+    def test_export_runs_in_a_job(self):
+        EmpPersonal.objects.bulk_create([synthetic.build_employee(i, random.Random(i)) for i in range(1, 4)])
+        response = self.client.post("/api/employee/export/jobs/?format=csv&fields=emp_code")
+        self.assertEqual(response.status_code, 202)
+
+        self.run_jobs()
+        job = self.client.get(response.json()["status_url"]).json()["job"]
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["progress"], {"done": 3, "total": 3, "percent": 100.0, "message": ""})
+        with open(os.path.join(self.media_root, job["result"]["name"]), encoding="utf-8-sig") as exported:
+            lines = exported.read().splitlines()
+        self.assertEqual(lines[0], "emp_id,emp_code")
+        self.assertEqual(len(lines), 4)
+
+
+@override_settings(EMPLOYEE_ID_CARD_WORKERS=0)
+class IdCardTests(EmployeeTableMixin, TransactionTestCase):
+    url = "/api/employee/id-cards/"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("printer", password="pw")
+        self.client.force_login(self.user)
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = self.settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        os.makedirs(os.path.join(self.media_root, "employees"))
+        Image.new("RGB", (600, 800), (120, 80, 60)).save(os.path.join(self.media_root, "employees", "p.jpg"))
+        emps = [synthetic.build_employee(i, random.Random(i)) for i in range(1, 4)]
+        emps[0].emp_photo = "employees/p.jpg"
+        emps[1].emp_photo = "employees/missing.jpg"
+        EmpPersonal.objects.bulk_create(emps)
+        self.ids = sorted(EmpPersonal.objects.values_list("emp_id", flat=True))
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        return response, b"".join(response.streaming_content) if response.streaming else None
+
+    def assertValidPdf(self, data, pages):
+        xref = int(data.rsplit(b"startxref\n", 1)[1].split()[0])
+        lines = data[xref:].split(b"\n")
+        self.assertEqual(lines[0], b"xref")
+        count = int(lines[1].split()[1])
+        for number in range(1, count):
+            offset = int(lines[2 + number][:10])
+            self.assertTrue(data[offset:].startswith(f"{number} 0 obj".encode()), number)
+        self.assertIn(b"/Type /Pages /Kids [", data)
+        self.assertIn(f"/Count {pages} >>".encode(), data)
+
+    def test_pdf_and_zip(self):
+        response, pdf = self.get(ids=",".join(map(str, self.ids)))
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertValidPdf(pdf, pages=3)
+        self.assertEqual(pdf.count(b"/Subtype /Image /Width 1011 /Height 638"), 3)
+
+        _, sheet = self.get(ids=",".join(map(str, self.ids)), sheet="a4")
+        self.assertValidPdf(sheet, pages=1)
+
+        _, archive = self.get(ids=str(self.ids[0]), format="zip")
+        with zipfile.ZipFile(io.BytesIO(archive)) as cards:
+            [name] = cards.namelist()
+            self.assertTrue(name.startswith(f"{self.ids[0]}-"))
+            with Image.open(io.BytesIO(cards.read(name))) as card:
+                self.assertEqual(card.size, (1011, 638))
+                # The photo box holds the employee's photo, not the blank template.
+                pixel = card.convert("RGB").getpixel((170, 300))
+                self.assertTrue(all(abs(a - b) <= 4 for a, b in zip(pixel, (120, 80, 60))), pixel)
+
+    def test_limits_and_jobs(self):
+        with self.settings(EMPLOYEE_ID_CARD_MAX_SYNC=2):
+            self.assertEqual(self.get()[0].status_code, 400)
+        self.assertEqual(self.get(ids="999999")[0].status_code, 404)
+        self.assertEqual(self.get(ids="a,b")[0].status_code, 400)
+
+        response = self.client.post(f"{self.url}jobs/", json.dumps({"ids": self.ids[:2], "format": "zip"}), content_type="application/json")
+        self.assertEqual(response.status_code, 202)
+        WorkerPool(workers=0).run(burst=True)
+        job = self.client.get(response.json()["status_url"]).json()["job"]
+        self.assertEqual((job["status"], job["result"]["cards"]), ("succeeded", 2))
+        with zipfile.ZipFile(os.path.join(self.media_root, job["result"]["name"])) as cards:
+            self.assertEqual(len(cards.namelist()), 2)
+
+
+class AdminChangelistTests(EmployeeTableMixin, TransactionTestCase):
+    url = "/admin/employee/emppersonal/"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(self.user)
+        EmpPersonal.objects.bulk_create([synthetic.build_employee(i, random.Random(i)) for i in range(1, 251)])
+        self.ids = sorted(EmpPersonal.objects.values_list("emp_id", flat=True), reverse=True)
+
+    def employee_queries(self, queries):
+        return [q["sql"] for q in queries if 'FROM "EMP_PERSONAL"' in q["sql"]]
+
+    def test_pages_are_keyset_addressed(self):
+        with CaptureQueriesContext(connection) as ctx:
+            first = self.client.get(self.url)
+        cl = first.context["cl"]
+        self.assertEqual([emp.pk for emp in cl.result_list], self.ids[:100])
+        self.assertEqual(cl.next_page_url, f"?after={self.ids[99]}")
+        selects = self.employee_queries(ctx.captured_queries)
+        self.assertFalse([sql for sql in selects if "OFFSET" in sql or "bang_present_vill" in sql], selects)
+        self.assertFalse([sql for sql in selects if sql.startswith('SELECT COUNT(*) AS "__count" FROM "EMP_PERSONAL"')])
+
+        last = self.client.get(self.url + f"?after={self.ids[199]}").context["cl"]
+        self.assertEqual([emp.pk for emp in last.result_list], self.ids[200:])
+        self.assertIsNone(last.next_page_url)
+        back = self.client.get(self.url + last.previous_page_url).context["cl"]
+        self.assertEqual([emp.pk for emp in back.result_list], self.ids[100:200])
+
+    def test_filtered_count_is_capped(self):
+        with mock.patch("employee.changelist.COUNT_CAP", 10):
+            cl = self.client.get(self.url + "?sex__exact=male").context["cl"]
+        self.assertEqual(cl.result_count_display, "10+")
+        sorted_cl = self.client.get(self.url + "?o=2").context["cl"]
+        self.assertIsNone(sorted_cl.next_page_url)
+        self.assertEqual(sorted_cl.paginator.num_pages, 3)
+
+
+class EnsureEmployeeIndexesTests(TransactionTestCase):
+    def setUp(self):
+        # A legacy EMP_PERSONAL: same columns, none of the unique indexes.
+        with mock.patch.multiple(EmpPersonal._meta, constraints=[], indexes=[]), connection.schema_editor() as editor:
+            editor.create_model(EmpPersonal)
+        self.addCleanup(self.drop_table)
+
+    def drop_table(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(EmpPersonal)
+        reset_upsert_keys()
+
+    def test_creates_missing_indexes(self):
+        self.assertEqual(len(missing_unique_constraints()), 2)
+        stdout = io.StringIO()
+        call_command("ensure_employee_indexes", stdout=stdout)
+        self.assertIn("Created emp_personal_present_dist_idx.", stdout.getvalue())
+        self.assertEqual(missing_unique_constraints(), [])
+        self.assertEqual(upsert_keys(), ("emp_code", "national_id"))
+
+    def test_refuses_when_existing_rows_collide(self):
+        EmpPersonal.objects.bulk_create([EmpPersonal(emp_code="E1", national_id="1"), EmpPersonal(emp_code="E1")])
+        stderr = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command("ensure_employee_indexes", stdout=io.StringIO(), stderr=stderr)
+        self.assertIn("E1 (2 rows)", stderr.getvalue())
+        self.assertEqual([c.name for c in missing_unique_constraints()], ["emp_personal_emp_code_uniq"])
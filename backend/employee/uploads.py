@@ -0,0 +1,199 @@
+"""Streaming upload handling for employee photo/signature uploads.
+
+``EmployeeImageUploadHandler`` replaces Django's memory/temp-file handlers on the
+employee endpoints. Chunks are written straight into a temp file inside MEDIA
+storage (so saving the ImageField is a rename, not a copy), per-file and
+per-request byte limits are enforced while the body is still being read, and
+the image header is checked from the first chunks without decoding pixels.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import time
+import warnings
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopUpload
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FIELDS = ("emp_photo", "emp_signature")
+ALLOWED_FORMATS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp"}
+HEADER_SNIFF_LIMIT = 256 * 1024
+INCOMING_DIR = "employees/.incoming"
+
+
+def upload_limits():
+    return {
+        "file": getattr(settings, "EMPLOYEE_UPLOAD_MAX_FILE_BYTES", 10 * 2**20),
+        "request": getattr(settings, "EMPLOYEE_UPLOAD_MAX_REQUEST_BYTES", 24 * 2**20),
+        "pixels": getattr(settings, "EMPLOYEE_UPLOAD_MAX_PIXELS", 50_000_000),
+    }
+
+
+class UploadRejected(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class StreamedUploadedFile(UploadedFile):
+    """An upload already written to a temp file inside MEDIA storage."""
+
+    def __init__(self, file, name, content_type, size, charset, content_type_extra=None, image_format=None, digest=None):
+        super().__init__(file, name, content_type, size, charset, content_type_extra)
+        self.image_format = image_format
+        self.digest = digest  # SHA-256 of the content, computed while it streamed in
+
+    def temporary_file_path(self):
+        return self.file.name
+
+    def close(self):
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            # Storage already moved the file into place.
+            pass
+
+
+class EmployeeImageUploadHandler(FileUploadHandler):
+    """Stream image uploads to disk, enforcing limits and sniffing headers as chunks arrive."""
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.limits = upload_limits()
+        self.error = None
+        self.total_bytes = 0
+        self.files_received = 0
+        self.started = time.monotonic()
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        if field_name not in IMAGE_FIELDS:
+            raise SkipFile()
+        if self.content_length and self.content_length > self.limits["file"]:
+            self._abort(f"{field_name} exceeds {self.limits['file']} bytes.", 413)
+        directory = default_storage.path(INCOMING_DIR)
+        os.makedirs(directory, exist_ok=True)
+        self.file = tempfile.NamedTemporaryFile(suffix=".upload", dir=directory)
+        self.file_size = 0
+        self.header = io.BytesIO()
+        self.image_format = None
+        self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.file_size += len(raw_data)
+        self.total_bytes += len(raw_data)
+        if self.file_size > self.limits["file"]:
+            self._abort(f"{self.field_name} exceeds {self.limits['file']} bytes.", 413)
+        if self.total_bytes > self.limits["request"]:
+            self._abort(f"Request body exceeds {self.limits['request']} bytes.", 413)
+        if self.image_format is None:
+            self._sniff(raw_data)
+        self.file.write(raw_data)
+        self.sha256.update(raw_data)
+        return None
+
+    def _sniff(self, raw_data):
+        """Identify the image from its header bytes; Image.open is lazy and decodes no pixels."""
+        self.header.write(raw_data)
+        self.header.seek(0)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", Image.DecompressionBombWarning)
+                with Image.open(self.header) as image:
+                    image_format, (width, height) = image.format, image.size
+        except (Image.DecompressionBombWarning, Image.DecompressionBombError):
+            self._abort(f"{self.field_name} has too many pixels.", 400)
+        except Exception:
+            if self.header.tell() >= HEADER_SNIFF_LIMIT or self.file_size >= HEADER_SNIFF_LIMIT:
+                self._abort(f"{self.field_name} is not a readable image.", 400)
+            self.header.seek(0, io.SEEK_END)
+            return
+        if image_format not in ALLOWED_FORMATS:
+            self._abort(f"{self.field_name} must be a JPEG, PNG or WebP image.", 400)
+        if width * height > self.limits["pixels"]:
+            self._abort(f"{self.field_name} has too many pixels.", 400)
+        self.image_format = image_format
+        self.header = None
+
+    def file_complete(self, file_size):
+        if self.image_format is None:
+            self._abort(f"{self.field_name} is not a readable image.", 400)
+        self.file.flush()
+        self.file.seek(0)
+        self.files_received += 1
+        uploaded = StreamedUploadedFile(
+            self.file,
+            self._file_name(),
+            self.content_type,
+            file_size,
+            self.charset,
+            self.content_type_extra,
+            image_format=self.image_format,
+            digest=self.sha256.hexdigest(),
+        )
+        # MultiPartParser closes ``handler.file`` on errors; the finished file now belongs to FILES.
+        del self.file
+        return uploaded
+
+    def _file_name(self):
+        # Trust the sniffed format over the client's extension.
+        root, _ = os.path.splitext(self.file_name or "upload")
+        return root + ALLOWED_FORMATS[self.image_format]
+
+    def upload_interrupted(self):
+        if getattr(self, "file", None) is not None:
+            self.file.close()
+            del self.file
+
+    def upload_complete(self):
+        elapsed = time.monotonic() - self.started
+        if self.request is not None:
+            self.request.upload_stats = {
+                "bytes": self.total_bytes,
+                "files": self.files_received,
+                "seconds": elapsed,
+                "rejected": self.error is not None,
+            }
+        logger.info(
+            "employee upload: %d bytes in %d file(s), %.3fs%s",
+            self.total_bytes,
+            self.files_received,
+            elapsed,
+            f" (rejected: {self.error.message})" if self.error else "",
+        )
+
+    def _abort(self, message, status):
+        self.error = UploadRejected(message, status)
+        raise StopUpload(connection_reset=True)
+
+
+def install_upload_handler(request):
+    """Use the streaming handler for this request; must run before POST/FILES are read.
+
+    Raises UploadRejected straight away when Content-Length already exceeds the
+    per-request limit, so oversized bodies are never read. Calling it again for
+    the same request returns the handler installed the first time.
+    """
+    installed = getattr(request, "_employee_upload_handler", None)
+    if installed is not None:
+        return installed
+    limit = upload_limits()["request"]
+    try:
+        content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        content_length = 0
+    if content_length > limit:
+        raise UploadRejected(f"Request body exceeds {limit} bytes.", 413)
+    handler = EmployeeImageUploadHandler(request)
+    request.upload_handlers = [handler]
+    request._employee_upload_handler = handler
+    return handler
@@ -0,0 +1,195 @@
+"""Idempotent EmpPersonal upserts keyed on ``emp_code`` (``national_id`` as a fallback).
+
+Each batch is written with ``bulk_create(update_conflicts=True)``, i.e. one
+``INSERT ... ON DUPLICATE KEY UPDATE`` (MySQL) or ``INSERT ... ON CONFLICT DO
+UPDATE`` statement per key column, so pushing the same records again updates
+them in place instead of inserting duplicates. It needs the unique indexes
+declared in ``EmpPersonal.Meta.constraints``; the table is unmanaged, so they
+are created by ``manage.py ensure_employee_indexes`` rather than a migration.
+"""
+
+import threading
+from dataclasses import dataclass, field
+
+from django.db import DatabaseError, connection, transaction
+
+from .models import BANGLA_NAME_KEY_FIELDS, SIDE_FIELDS, UPSERT_KEYS, EmpPersonal
+from .schema import EMPLOYEE_SCHEMA, REQUIRED_MESSAGE
+
+MAX_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# Everything a full record sync may overwrite; photo_added_by/photo_added_date and the images are kept.
+# Side-table columns are replaced by EmpPersonalQuerySet.bulk_create.
+UPDATE_FIELDS = (
+    *(name for name in EMPLOYEE_SCHEMA.field_names if name not in SIDE_FIELDS),
+    *(key for keys in BANGLA_NAME_KEY_FIELDS.values() for key in keys),
+    "updated_by",
+    "updated_date",
+)
+
+_keys_lock = threading.Lock()
+_available_keys = None
+
+
+class UpsertUnavailable(Exception):
+    """Raised when EMP_PERSONAL has no unique index on ``emp_code``."""
+
+
+def missing_unique_constraints():
+    """Unique constraints declared on EmpPersonal that the database does not have yet."""
+    with connection.cursor() as cursor:
+        existing = connection.introspection.get_constraints(cursor, EmpPersonal._meta.db_table)
+    unique_columns = {tuple(info["columns"]) for info in existing.values() if info["unique"]}
+    return [
+        constraint
+        for constraint in EmpPersonal._meta.constraints
+        if tuple(EmpPersonal._meta.get_field(name).column for name in constraint.fields) not in unique_columns
+    ]
+
+
+def upsert_keys():
+    """The UPSERT_KEYS backed by a unique index, introspected once per process."""
+    global _available_keys
+    with _keys_lock:
+        if _available_keys is None:
+            missing = {name for constraint in missing_unique_constraints() for name in constraint.fields}
+            _available_keys = tuple(key for key in UPSERT_KEYS if key not in missing)
+        return _available_keys
+
+
+def reset_upsert_keys():
+    global _available_keys
+    with _keys_lock:
+        _available_keys = None
+
+
+@dataclass
+class UpsertReport:
+    total: int = 0
+    upserted: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    emp_ids: dict = field(default_factory=dict)  # record index -> emp_id
+    failed_indexes: set = field(default_factory=set)
+
+    def add_error(self, index, errors):
+        self.failed += 1
+        self.failed_indexes.add(index)
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"index": index, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "upserted": self.upserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "results": [{"index": index, "emp_id": emp_id} for index, emp_id in sorted(self.emp_ids.items())],
+        }
+
+
+def _key_for(cleaned, errors, keys):
+    """Return the key column a record is matched on (clearing the emp_code error if the NID can stand in)."""
+    if cleaned.get("emp_code"):
+        return "emp_code"
+    if "national_id" in keys and cleaned.get("national_id") and errors == {"emp_code": [REQUIRED_MESSAGE]}:
+        # No emp_code yet (e.g. a new hire without a code): match on the NID instead.
+        errors.clear()
+        return "national_id"
+    return None
+
+
+def _cross_key_conflicts(key, group, keys, report):
+    """Drop (and report) records whose other unique keys belong to a different employee.
+
+    MySQL's ``ON DUPLICATE KEY UPDATE`` fires on any unique index, not just
+    ``key``: a record whose national_id is another employee's would overwrite
+    that employee's row. Databases with a conflict target raise instead.
+    """
+    others = [name for name in keys if name != key]
+    clashes = set()
+    for other in others:
+        values = {getattr(emp, other) for _, emp in group if getattr(emp, other)}
+        owners = dict(EmpPersonal.objects.filter(**{f"{other}__in": values}).values_list(other, key)) if values else {}
+        for index, emp in group:
+            value = getattr(emp, other)
+            if not value:
+                continue
+            owner = owners.setdefault(value, getattr(emp, key))  # first record in the batch claims a new value
+            if owner != getattr(emp, key):
+                clashes.add(index)
+                report.add_error(index, {other: [f"Already used by the employee with {key} {owner}."]})
+    return [(index, emp) for index, emp in group if index not in clashes]
+
+
+def _write(key, group, report):
+    """Upsert ``group`` (a list of ``(index, emp)``) in one statement, isolating bad rows on failure.
+
+    Returns ``{key value: emp_id}`` for the rows written.
+    """
+    update_fields = [name for name in UPDATE_FIELDS if name != key and not (key == "national_id" and name == "emp_code")]
+    options = {"update_conflicts": True, "update_fields": update_fields}
+    if connection.features.supports_update_conflicts_with_target:
+        options["unique_fields"] = [key]
+
+    else:
+        group = _cross_key_conflicts(key, group, upsert_keys(), report)
+        if not group:
+            return {}
+
+    objs = [emp for _, emp in group]
+    try:
+        with transaction.atomic():
+            EmpPersonal.objects.bulk_create(objs, batch_size=len(objs), **options)
+        written = group
+    except DatabaseError:
+        written = []
+        for index, emp in group:
+            try:
+                with transaction.atomic():
+                    EmpPersonal.objects.bulk_create([emp], **options)
+                written.append((index, emp))
+            except DatabaseError as exc:
+                report.add_error(index, {"__all__": [str(exc)]})
+
+    values = [getattr(emp, key) for _, emp in written]
+    return dict(EmpPersonal.objects.filter(**{f"{key}__in": values}).values_list(key, "emp_id"))
+
+
+def upsert_employees(records, user_id=None):
+    """Validate ``records`` (full employee payloads) and insert or update them by key.
+
+    Returns an UpsertReport; ``errors`` and ``results`` refer to positions in ``records``.
+    """
+    keys = upsert_keys()
+    if "emp_code" not in keys:
+        raise UpsertUnavailable("EMP_PERSONAL has no unique index on emp_code; run manage.py ensure_employee_indexes.")
+
+    records = list(records)
+    report = UpsertReport(total=len(records))
+    groups = {}
+    matched = []  # (index, key, value) of every valid record
+    for index, (cleaned, errors) in enumerate(EMPLOYEE_SCHEMA.validate_many(records)):
+        key = _key_for(cleaned, errors, keys)
+        if errors:
+            report.add_error(index, errors)
+            continue
+        emp = EMPLOYEE_SCHEMA.build(cleaned, photo_added_by=user_id, updated_by=user_id)
+        # A key repeated within the batch: the last record wins, as it would across requests.
+        groups.setdefault(key, {})[cleaned[key]] = (index, emp)
+        matched.append((index, key, cleaned[key]))
+
+    emp_ids = {key: _write(key, list(group.values()), report) for key, group in groups.items()}
+    for index, key, value in matched:
+        emp_id = emp_ids[key].get(value)
+        if emp_id is not None:
+            report.upserted += 1
+            report.emp_ids[index] = emp_id
+        elif groups[key][value][0] != index:
+            report.add_error(index, {"__all__": [f"Superseded by record {groups[key][value][0]} (same {key}), which failed."]})
+        elif index not in report.failed_indexes:
+            # Never drop a record silently, whatever the database did with it.
+            report.add_error(index, {"__all__": [f"No employee with this {key} after the write."]})
+    return report
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.urls import path
+from . import async_views, views
+
+urlpatterns = [
+    path("", views.list_employees, name="list_employees"),
+    path("save/", (async_views if settings.ASYNC_VIEWS else views).save_employee, name="save_employee"),
+    path("upsert/", views.upsert_employees_view, name="upsert_employees"),
+    path("import/", views.import_employees_view, name="import_employees"),
+    path("changes/", views.employee_changes, name="employee_changes"),
+    path("export/", views.export_employees, name="export_employees"),
+    path("export/jobs/", views.export_employees_job, name="export_employees_job"),
+    path("id-cards/", views.id_cards, name="id_cards"),
+    path("id-cards/jobs/", views.id_cards_job, name="id_cards_job"),
+    path("duplicates/jobs/", views.duplicates_job, name="duplicates_job"),
+    path("search/", views.search_employees_view, name="search_employees"),
+    path("lookup/bangla/", views.bangla_name_lookup, name="bangla_name_lookup"),
+    path("<int:emp_id>/", views.employee_detail, name="employee_detail"),
+    path("<int:emp_id>/images/", views.employee_images, name="employee_images"),
+    path("<int:emp_id>/images/<str:role>/", views.employee_image, name="employee_image"),
+    path("<int:emp_id>/history/", views.employee_history, name="employee_history"),
+    path("<int:emp_id>/duplicates/", views.employee_duplicates, name="employee_duplicates"),
+]
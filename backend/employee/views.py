@@ -1,137 +1,85 @@
 import json
-from datetime import date, datetime
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.db import IntegrityError, router, transaction
+from django.http import JsonResponse, RawPostDataException
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_http_methods, require_POST, require_safe
 
-from .models import EmpPersonal
+from visorhr import media
+
+from . import audit, changes, conditional, duplicates
+from .derivatives import derivative_urls, image_names, schedule_derivatives
+from .exports import EXPORT_DEFAULT_FIELDS, FORMATS, export_response
+from .idempotency import idempotent
+from .importer import DEFAULT_BATCH_SIZE, ImportFormatError, import_employees, iter_rows
+from .models import BANGLA_NAME_KEY_FIELDS, SIDE_FIELDS, EmpAuditEntry, EmpPersonal, allocate_change_seq
+from .printing import FORMATS as ID_CARD_FORMATS, SHEETS as ID_CARD_SHEETS, id_card_response, select_employees
+from .queries import FILTER_FIELDS, QueryParamError, apply_filters, keyset_page, parse_cursor, parse_fields, parse_ids, parse_limit, select_values
+from .schema import EMPLOYEE_SCHEMA
+from .search import INDEXED_FIELDS, lookup_bangla_name, search_employees
+from .tasks import queue_duplicate_scan, queue_export, queue_id_cards, queue_import
+from .uploads import UploadRejected, install_upload_handler
+from .upsert import MAX_BATCH_SIZE as UPSERT_MAX_BATCH_SIZE, UpsertUnavailable, upsert_employees
 
 
 def _parse_json(request):
     try:
         return json.loads(request.body.decode("utf-8"))
-    except (json.JSONDecodeError, UnicodeDecodeError):
+    except (json.JSONDecodeError, UnicodeDecodeError, RawPostDataException):
+        # RawPostDataException: a multipart body already parsed (and not kept) as a form.
         return None
 
 
-@csrf_exempt
-@require_POST
-def save_employee(request):
-    if not request.user.is_authenticated:
-        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+def _read_employee_payload(request):
+    """Return ``(data, files)`` for a save request, or a JsonResponse describing the error."""
+    try:
+        upload_handler = install_upload_handler(request)
+    except UploadRejected as exc:
+        return JsonResponse({"success": False, "message": exc.message}, status=exc.status)
 
     data = None
     files = request.FILES
+    if upload_handler.error:
+        return JsonResponse({"success": False, "message": upload_handler.error.message}, status=upload_handler.error.status)
     if request.content_type and request.content_type.startswith("application/json"):
         data = _parse_json(request)
         if data is None:
             return JsonResponse({"success": False, "message": "Invalid JSON body."}, status=400)
     else:
         data = request.POST
+    return data, files
+
+
+def _invalid_employee_response(errors):
+    return JsonResponse({"success": False, "message": "Invalid employee data.", "errors": errors}, status=400)
 
-    def val(name):
-        raw = data.get(name)
-        if raw is None:
-            return None
-        if isinstance(raw, str):
-            stripped = raw.strip()
-            return stripped or None
-        return raw
-
-    def to_int(name):
-        v = val(name)
-        if v in (None, ""):
-            return None
-        try:
-            return int(v)
-        except (ValueError, TypeError):
-            return None
-
-    def to_date(name):
-        v = val(name)
-        if not v:
-            return None
-        try:
-            return date.fromisoformat(v)
-        except ValueError:
-            try:
-                parsed = datetime.strptime(v, "%d-%b-%Y")
-                return parsed.date()
-            except ValueError:
-                return None
-
-    emp = EmpPersonal()
-    simple_fields = [
-        "emp_code",
-        "emp_name",
-        "bang_emp_name",
-        "card_no",
-        "father_name",
-        "bang_father_name",
-        "mother_name",
-        "bang_mother_name",
-        "husband_name",
-        "bang_husband_name",
-        "sex",
-        "religion",
-        "blood_group",
-        "marital_status",
-        "nationality",
-        "town_of_birth",
-        "education",
-        "employement",
-        "passed_year",
-        "last_exp",
-        "curr_activity",
-        "sob",
-        "e_mail",
-        "contact_no",
-        "emergency_cell",
-        "emrg_cell_no",
-        "emrg_address",
-        "national_id",
-        "birth_certificate_no",
-        "smart_id",
-        "pasport_no",
-        "tin_no",
-        "nominee_cell_no",
-        "ref_contact_name",
-        "ref_relation",
-        "ref_address",
-        "present_vill",
-        "bang_present_vill",
-        "present_house",
-        "present_ps",
-        "bang_present_ps",
-        "present_dist",
-        "bang_present_dist",
-        "present_address",
-        "bang_present_post",
-        "present_postal_code",
-        "parmanent_house",
-        "parmanent_vill",
-        "bang_permanent_vill",
-        "parmanent_ps",
-        "bang_permanent_ps",
-        "parmanent_dist",
-        "bang_permanent_dist",
-        "permanent_address",
-        "parmenent_address",
-        "bang_permanent_post",
-        "permanent_postal_code",
-        "pre_house_owner",
-        "pre_house_owner_bang",
-        "remarks",
-    ]
-
-    for field_name in simple_fields:
-        setattr(emp, field_name, val(field_name))
-
-    emp.child_male = to_int("child_male")
-    emp.child_female = to_int("child_female")
-    emp.contractual = (val("contractual") or "N").upper()
-    emp.date_of_birth = to_date("date_of_birth")
+
+def _job_queued_response(job, message):
+    return JsonResponse(
+        {
+            "success": True,
+            "message": message,
+            "job_id": job.pk,
+            "status_url": reverse("job_status", args=[job.pk]),
+        },
+        status=202,
+    )
+
+
+def _duplicate_employee_response():
+    return JsonResponse(
+        {
+            "success": False,
+            "message": "An employee with this emp_code or national_id already exists; use /api/employee/upsert/ to update it.",
+        },
+        status=409,
+    )
+
+
+def _create_employee(cleaned, files, user_id):
+    emp = EMPLOYEE_SCHEMA.build(cleaned, photo_added_by=user_id, updated_by=user_id)
 
     photo = files.get("emp_photo")
     signature = files.get("emp_signature")
@@ -140,17 +88,584 @@ def save_employee(request):
     if signature:
         emp.emp_signature = signature
 
-    if not emp.photo_added_by:
-        emp.photo_added_by = request.user.id
-    emp.updated_by = request.user.id
-
     emp.save()
+    audit.record(
+        emp.emp_id,
+        audit.diff({}, {**cleaned, "emp_photo": emp.emp_photo, "emp_signature": emp.emp_signature}),
+        user_id=user_id,
+        action=EmpAuditEntry.ACTION_CREATE,
+    )
+    schedule_derivatives(emp, photo=bool(photo), signature=bool(signature))
+    return emp
+
 
+def _possible_duplicates(emp):
+    """Probable duplicates of a newly saved employee, for the save response (see ``employee.duplicates``)."""
+    if not getattr(settings, "EMPLOYEE_DUPLICATE_CHECK_ON_SAVE", True):
+        return []
+    return duplicates.candidates_for(emp)
+
+
+def _employee_saved_response(emp, possible_duplicates=()):
     return JsonResponse(
         {
           "success": True,
           "message": "Employee saved.",
           "emp_id": emp.emp_id,
+          "derivatives": derivative_urls(emp, only_existing=False),
+          "possible_duplicates": list(possible_duplicates),
         },
         status=201,
     )
+
+
+@csrf_exempt
+@require_POST
+@idempotent
+def save_employee(request):
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    payload = _read_employee_payload(request)
+    if isinstance(payload, JsonResponse):
+        return payload
+    data, files = payload
+
+    cleaned, errors = EMPLOYEE_SCHEMA.validate(data)
+    if errors:
+        return _invalid_employee_response(errors)
+    try:
+        emp = _create_employee(cleaned, files, request.user.id)
+    except IntegrityError:
+        return _duplicate_employee_response()
+    return _employee_saved_response(emp, _possible_duplicates(emp))
+
+
+@csrf_exempt
+@require_POST
+@idempotent
+def upsert_employees_view(request):
+    """Insert or update by ``emp_code`` (``national_id`` fallback): a JSON object, or a list of them."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    data = _parse_json(request)
+    single = isinstance(data, dict)
+    records = [data] if single else data
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        return JsonResponse({"success": False, "message": "Body must be an employee object or a list of them."}, status=400)
+    if not records:
+        return JsonResponse({"success": False, "message": "No employees to save."}, status=400)
+    if len(records) > UPSERT_MAX_BATCH_SIZE:
+        return JsonResponse(
+            {"success": False, "message": f"At most {UPSERT_MAX_BATCH_SIZE} employees per request."}, status=400
+        )
+
+    try:
+        report = upsert_employees(records, user_id=request.user.id)
+    except UpsertUnavailable as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=503)
+
+    if single:
+        if report.failed:
+            return _invalid_employee_response(report.errors[0]["errors"])
+        return JsonResponse({"success": True, "message": "Employee saved.", "emp_id": report.emp_ids[0]})
+    return JsonResponse(
+        {
+            "success": True,
+            "message": f"Saved {report.upserted} of {report.total} employees.",
+            "report": report.as_dict(),
+        }
+    )
+
+
+def _update_employee(emp_id, cleaned, user_id):
+    """Apply ``cleaned`` to employee ``emp_id``, writing only the columns that change.
+
+    Returns ``(emp, changed_fields)``, or ``(None, [])`` if the employee does not exist.
+    """
+    # Side-table columns are not selected here; their rows load on first access.
+    columns = {name for name in cleaned if name not in SIDE_FIELDS}
+    if columns & set(INDEXED_FIELDS):
+        # The search index is rebuilt from all indexed fields after the save.
+        columns.update(INDEXED_FIELDS)
+    using = router.db_for_write(EmpPersonal)
+    with transaction.atomic(using=using):
+        # The sequence counter is locked before the row, as on every other write path (see allocate_change_seq).
+        change_seq = allocate_change_seq(using)
+        emp = EmpPersonal.objects.select_for_update().only("emp_id", *columns).filter(emp_id=emp_id).first()
+        changed = [] if emp is None else [name for name, value in cleaned.items() if getattr(emp, name) != value]
+        if not changed:
+            # Nothing to write: give the sequence value back instead of leaving a gap.
+            transaction.set_rollback(True)
+            return emp, changed
+        before = {name: getattr(emp, name) for name in changed}
+        for name in changed:
+            setattr(emp, name, cleaned[name])
+        emp.updated_by = user_id
+        emp.save(update_fields=[*changed, "updated_by", "updated_date"], change_seq=change_seq)
+        audit.record(emp_id, audit.diff(before, cleaned, changed), user_id=user_id)
+    return emp, changed
+
+
+@csrf_exempt
+@require_http_methods(["GET", "HEAD", "PATCH"])
+def employee_detail(request, emp_id):
+    if request.method == "PATCH":
+        return update_employee(request, emp_id)
+    return get_employee(request, emp_id)
+
+
+def get_employee(request, emp_id):
+    """One employee: ``?fields=a,b`` (default: every exported field).
+
+    The strong ETag changes with every write to the row, so clients revalidate
+    with ``If-None-Match``; a 304 costs a primary-key read of ``change_seq``.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    try:
+        fields = parse_fields(request.GET.get("fields"), default=EXPORT_DEFAULT_FIELDS)
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    queryset = EmpPersonal.objects.filter(emp_id=emp_id)
+    versions = list(queryset.values_list("change_seq", flat=True)[:1])
+    if not versions:
+        return JsonResponse({"success": False, "message": "Employee not found."}, status=404)
+    etag = conditional.employee_etag(emp_id, versions[0], fields)
+    response = conditional.not_modified(request, etag)
+    if response is not None:
+        return conditional.with_validators(response, etag)
+
+    row = select_values(queryset, fields if "change_seq" in fields else [*fields, "change_seq"]).first()
+    if row is None:
+        return JsonResponse({"success": False, "message": "Employee not found."}, status=404)
+    # From the row actually read, in case it changed since the check above.
+    etag = conditional.employee_etag(emp_id, row["change_seq"], fields)
+    response = JsonResponse({"success": True, "employee": {name: row[name] for name in fields}})
+    return conditional.with_validators(response, etag)
+
+
+def update_employee(request, emp_id):
+    """Partial update: JSON body with any subset of the writable ``EmpPersonal`` fields."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    data = _parse_json(request)
+    if not isinstance(data, dict):
+        return JsonResponse({"success": False, "message": "Invalid JSON body."}, status=400)
+
+    cleaned, errors = EMPLOYEE_SCHEMA.validate(data, partial=True)
+    for name in data.keys() - set(EMPLOYEE_SCHEMA.field_names):
+        errors[name] = ["Unknown or read-only field."]
+    if errors:
+        return _invalid_employee_response(errors)
+    if not cleaned:
+        return JsonResponse({"success": False, "message": "No fields to update."}, status=400)
+
+    try:
+        emp, changed = _update_employee(emp_id, cleaned, request.user.id)
+    except IntegrityError:
+        return _duplicate_employee_response()
+    if emp is None:
+        return JsonResponse({"success": False, "message": "Employee not found."}, status=404)
+
+    return JsonResponse(
+        {
+            "success": True,
+            "message": "Employee updated." if changed else "No changes.",
+            "emp_id": emp.emp_id,
+            "updated_fields": changed,
+        }
+    )
+
+
+@csrf_exempt
+@require_POST
+def import_employees_view(request):
+    """Bulk-create employees from an uploaded CSV/XLSX file (multipart field ``file``).
+
+    With ``background=1`` the file is stored and imported by a job; the 202 response links its status.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    upload = request.FILES.get("file")
+    if not upload:
+        return JsonResponse({"success": False, "message": "A CSV or XLSX file is required."}, status=400)
+
+    try:
+        batch_size = int(request.POST.get("batch_size") or DEFAULT_BATCH_SIZE)
+    except ValueError:
+        return JsonResponse({"success": False, "message": "batch_size must be an integer."}, status=400)
+
+    if request.POST.get("background", "").lower() in ("1", "true", "yes"):
+        try:
+            iter_rows(upload.file, upload.name)  # checks the file type; the job reads the rows
+        except ImportFormatError as exc:
+            return JsonResponse({"success": False, "message": str(exc)}, status=400)
+        job = queue_import(upload, user_id=request.user.id, batch_size=batch_size)
+        return _job_queued_response(job, "Import queued.")
+
+    try:
+        rows = iter_rows(upload.file, upload.name)
+        report = import_employees(rows, user_id=request.user.id, batch_size=batch_size)
+    except ImportFormatError as exc:
+        if exc.report is None:
+            return JsonResponse({"success": False, "message": str(exc)}, status=400)
+        # Batches before the unreadable part are committed; say how many.
+        return JsonResponse(
+            {
+                "success": False,
+                "message": f"{exc} Imported {exc.report.created} of {exc.report.total} rows before the error.",
+                "report": exc.report.as_dict(),
+            },
+            status=400,
+        )
+
+    return JsonResponse(
+        {
+            "success": True,
+            "message": f"Imported {report.created} of {report.total} rows.",
+            "report": report.as_dict(),
+        }
+    )
+
+
+@require_GET
+def list_employees(request):
+    """Keyset-paginated employee list: ``?after=<emp_id>&limit=&fields=a,b&district=&sex=&contractual=``."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    params = request.GET
+    try:
+        fields = parse_fields(params.get("fields"))
+        after = parse_cursor(params.get("after"))
+        limit = parse_limit(params.get("limit"))
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    queryset = apply_filters(EmpPersonal.objects.all(), params)
+    rows, next_cursor = keyset_page(queryset, fields, after=after, limit=limit)
+    return JsonResponse(
+        {
+            "success": True,
+            "results": rows,
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@require_GET
+def employee_changes(request):
+    """Delta sync: rows changed and employees deleted after ``?since=<next_cursor>``, oldest first.
+
+    ``fields`` and ``limit`` (default 500, max 5000) as for the list. Rows come
+    back as value lists in ``fields`` order. Without ``since`` the feed starts at
+    the beginning, which also serves as the initial full sync.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    try:
+        cursor = changes.parse_cursor(request.GET.get("since"))
+        fields = parse_fields(request.GET.get("fields"), default=EXPORT_DEFAULT_FIELDS)
+        limit = parse_limit(request.GET.get("limit"), default=changes.DEFAULT_BATCH_SIZE, maximum=changes.MAX_BATCH_SIZE)
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    try:
+        batch = changes.changes_since(cursor, fields, limit)
+    except changes.CursorExpired:
+        return JsonResponse(
+            {"success": False, "message": "since is older than the deletions kept; sync again without since.", "resync": True},
+            status=410,
+        )
+    return JsonResponse({"success": True, **batch})
+
+
+@require_GET
+def search_employees_view(request):
+    """Indexed search: ``?q=<name, code, card no or ID>&limit=&fields=``."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    term = (request.GET.get("q") or "").strip()
+    if not term:
+        return JsonResponse({"success": False, "message": "q is required."}, status=400)
+    try:
+        fields = parse_fields(request.GET.get("fields"))
+        limit = parse_limit(request.GET.get("limit"))
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    rows = list(select_values(search_employees(term).order_by("emp_id"), fields)[:limit])
+    return JsonResponse({"success": True, "results": rows})
+
+
+@require_GET
+def bangla_name_lookup(request):
+    """Lookup on a Bangla name field: ``?q=<Bangla or romanized name>&field=bang_emp_name``."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    term = (request.GET.get("q") or "").strip()
+    source = request.GET.get("field") or "bang_emp_name"
+    if not term:
+        return JsonResponse({"success": False, "message": "q is required."}, status=400)
+    if source not in BANGLA_NAME_KEY_FIELDS:
+        return JsonResponse(
+            {"success": False, "message": f"field must be one of: {', '.join(BANGLA_NAME_KEY_FIELDS)}."},
+            status=400,
+        )
+    try:
+        fields = parse_fields(request.GET.get("fields"), default=("emp_id", "emp_code", "emp_name", source))
+        limit = parse_limit(request.GET.get("limit"))
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    matches = lookup_bangla_name(term, source, limit=limit)
+    found = select_values(EmpPersonal.objects.filter(emp_id__in=[m[1] for m in matches]), fields)
+    rows = {row["emp_id"]: row for row in found}
+    results = [dict(rows[emp_id], match=match) for match, emp_id in matches if emp_id in rows]
+    return JsonResponse({"success": True, "results": results})
+
+
+@require_GET
+def employee_images(request, emp_id):
+    """URLs of an employee's original photo/signature and of the derivatives generated so far."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    emp = EmpPersonal.objects.only("emp_id", "emp_photo", "emp_signature").filter(emp_id=emp_id).first()
+    if emp is None:
+        return JsonResponse({"success": False, "message": "Employee not found."}, status=404)
+
+    return JsonResponse(
+        {
+            "success": True,
+            "emp_id": emp.emp_id,
+            "photo": emp.emp_photo.url if emp.emp_photo else None,
+            "signature": emp.emp_signature.url if emp.emp_signature else None,
+            "derivatives": derivative_urls(emp),
+            "urls": _image_urls(emp),
+        }
+    )
+
+
+def _image_urls(emp):
+    """Content-addressed ``employee_image`` URLs of the files that exist, keyed by role."""
+    urls = {}
+    for role, name in image_names(emp).items():
+        version = conditional.file_version(name)
+        if version is not None:
+            urls[role] = f"{reverse('employee_image', args=[emp.emp_id, role])}?v={version.digest}"
+    return urls
+
+
+@require_safe
+def employee_image(request, emp_id, role):
+    """One image file of an employee: ``photo``, ``signature`` or a derivative role from ``images/``.
+
+    Revalidates with ``If-None-Match``/``If-Modified-Since`` without reading the
+    file. With ``?v=<digest>`` (the ``urls`` of ``images/``) the response may be
+    cached for a year; a stale ``v`` gets the current file, to be revalidated.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    column = "emp_signature" if role.startswith("signature") else "emp_photo"
+    stored = EmpPersonal.objects.filter(emp_id=emp_id).values_list(column, flat=True).first()
+    version = conditional.file_version(image_names(EmpPersonal(emp_id=emp_id, **{column: stored})).get(role))
+    if version is None:
+        return JsonResponse({"success": False, "message": "Image not found."}, status=404)
+
+    etag = conditional.file_etag(version)
+    immutable = request.GET.get("v") == version.digest
+    # Sent by the front server when MEDIA_SENDFILE is set, with Range support either way.
+    response = media.serve(request, version, etag)
+    return conditional.with_validators(response, etag, version.last_modified, immutable)
+
+
+@require_GET
+def employee_history(request, emp_id):
+    """Audit trail of an employee, newest first: ``?before=<entry id>&limit=``."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    try:
+        before = parse_cursor(request.GET.get("before"), name="before", key="entry id")
+        limit = parse_limit(request.GET.get("limit"), default=audit.DEFAULT_HISTORY_LIMIT, maximum=audit.MAX_HISTORY_LIMIT)
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    entries, next_cursor = audit.history(emp_id, before=before, limit=limit)
+    return JsonResponse(
+        {
+            "success": True,
+            "emp_id": emp_id,
+            "results": [
+                {
+                    "id": entry.id,
+                    "changed_at": entry.changed_at,
+                    "changed_by": entry.changed_by,
+                    "action": entry.action,
+                    "source": entry.source,
+                    "changes": entry.changes,
+                }
+                for entry in entries
+            ],
+            "next_cursor": next_cursor,
+        }
+    )
+
+
+@require_GET
+def employee_duplicates(request, emp_id):
+    """Probable duplicates of one employee, best first: ``?min_score=0.5&limit=10``."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    try:
+        threshold = _parse_score(request.GET.get("min_score"))
+        limit = parse_limit(request.GET.get("limit"), default=10, maximum=100)
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    emp = EmpPersonal.objects.only(*duplicates.SCORED_FIELDS).filter(emp_id=emp_id).first()
+    if emp is None:
+        return JsonResponse({"success": False, "message": "Employee not found."}, status=404)
+    return JsonResponse({"success": True, "emp_id": emp_id, "results": duplicates.candidates_for(emp, threshold, limit)})
+
+
+@csrf_exempt
+@require_POST
+def duplicates_job(request):
+    """Queue a scan of the whole table for probable duplicates (``?min_score=``); the job writes a CSV report."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    try:
+        threshold = _parse_score(request.GET.get("min_score"))
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    job = queue_duplicate_scan(threshold, user_id=request.user.id)
+    return _job_queued_response(job, "Duplicate scan queued.")
+
+
+def _parse_score(raw):
+    if raw in (None, ""):
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        raise QueryParamError("min_score must be a number between 0 and 1.") from None
+    if not 0 <= value <= 1:
+        raise QueryParamError("min_score must be a number between 0 and 1.")
+    return value
+
+
+@require_GET
+def export_employees(request):
+    """Stream the (filtered) roster: ``?format=csv|jsonl|xlsx&fields=a,b&district=&sex=&contractual=``."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    fmt = (request.GET.get("format") or "csv").lower()
+    if fmt not in FORMATS:
+        return JsonResponse({"success": False, "message": f"format must be one of: {', '.join(FORMATS)}."}, status=400)
+    try:
+        fields = parse_fields(request.GET.get("fields"), default=EXPORT_DEFAULT_FIELDS)
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    queryset = apply_filters(EmpPersonal.objects.all(), request.GET)
+    return export_response(queryset, fields, fmt)
+
+
+@csrf_exempt
+@require_POST
+def export_employees_job(request):
+    """Queue an export to a MEDIA file: same query params as ``export/``; poll the job for its URL."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    fmt = (request.GET.get("format") or "csv").lower()
+    if fmt not in FORMATS:
+        return JsonResponse({"success": False, "message": f"format must be one of: {', '.join(FORMATS)}."}, status=400)
+    try:
+        fields = parse_fields(request.GET.get("fields"), default=EXPORT_DEFAULT_FIELDS)
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    filters = {name: request.GET[name] for name in FILTER_FIELDS if request.GET.get(name)}
+    job = queue_export(fields, fmt, filters, user_id=request.user.id)
+    return _job_queued_response(job, "Export queued.")
+
+
+MAX_ID_CARD_IDS = 20_000
+
+
+def _id_card_params(params):
+    """``(ids, filters, format, sheet)`` from a request's parameters; raises QueryParamError."""
+    ids = params.get("ids")
+    if isinstance(ids, list):
+        ids = ",".join(map(str, ids))
+    ids = parse_ids(ids, MAX_ID_CARD_IDS)
+    fmt = (params.get("format") or "pdf").lower()
+    if fmt not in ID_CARD_FORMATS:
+        raise QueryParamError(f"format must be one of: {', '.join(ID_CARD_FORMATS)}.")
+    sheet = (params.get("sheet") or "card").lower()
+    if sheet not in ID_CARD_SHEETS:
+        raise QueryParamError(f"sheet must be one of: {', '.join(ID_CARD_SHEETS)}.")
+    filters = {name: str(params[name]) for name in FILTER_FIELDS if params.get(name)}
+    return ids, filters, fmt, sheet
+
+
+@require_GET
+def id_cards(request):
+    """Stream ID cards as one PDF or ZIP: ``?ids=1,2,3`` and/or ``district=&sex=&contractual=``, ``format=pdf|zip&sheet=card|a4``."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    try:
+        ids, filters, fmt, sheet = _id_card_params(request.GET)
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    queryset = select_employees(ids, filters)
+    max_sync = getattr(settings, "EMPLOYEE_ID_CARD_MAX_SYNC", 500)
+    count = queryset[: max_sync + 1].count()
+    if not count:
+        return JsonResponse({"success": False, "message": "No employees match."}, status=404)
+    if count > max_sync:
+        return JsonResponse(
+            {"success": False, "message": f"More than {max_sync} cards; use POST /api/employee/id-cards/jobs/."},
+            status=400,
+        )
+    return id_card_response(queryset, fmt, sheet)
+
+
+@csrf_exempt
+@require_POST
+def id_cards_job(request):
+    """Queue ID-card rendering to a MEDIA file; same parameters as ``id-cards/``, as a query string or JSON body."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    params = request.GET
+    if request.content_type == "application/json":
+        params = _parse_json(request)
+        if not isinstance(params, dict):
+            return JsonResponse({"success": False, "message": "Invalid JSON body."}, status=400)
+    try:
+        ids, filters, fmt, sheet = _id_card_params(params)
+    except QueryParamError as exc:
+        return JsonResponse({"success": False, "message": str(exc)}, status=400)
+
+    job = queue_id_cards(ids, filters, fmt, sheet, user_id=request.user.id)
+    return _job_queued_response(job, "ID cards queued.")
@@ -0,0 +1,31 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import WorkerPool
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs in a process pool until stopped (SIGINT/SIGTERM finish the jobs in flight first)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None, help="Pool size (default JOBS_WORKERS); 0 runs jobs in this process.")
+        parser.add_argument("--poll-interval", type=float, default=None, help="Seconds between polls when the queue is empty.")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due instead of waiting for more.")
+
+    def handle(self, *args, **options):
+        pool = WorkerPool(workers=options["workers"], poll_interval=options["poll_interval"])
+
+        def stop(signum, frame):
+            self.stdout.write("Stopping after the jobs in flight...")
+            pool.stop()
+
+        previous = {signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+        try:
+            mode = f"{pool.workers} worker processes" if pool.workers else "inline"
+            self.stdout.write(f"Worker {pool.name} started ({mode}).")
+            completed = pool.run(burst=options["burst"])
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f"Ran {completed} jobs."))
@@ -0,0 +1,22 @@
+"""Entry points of the ``run_workers`` pool processes.
+
+Spawned children unpickle these by module path before Django is set up, so this
+module must not import models at import time.
+"""
+
+import signal
+
+import django
+
+
+def initialize():
+    # Ctrl-C / SIGTERM reach the whole process group; the parent decides when the pool stops.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    django.setup()
+
+
+def run_job(job_id):
+    from .queue import run_job
+
+    run_job(job_id)
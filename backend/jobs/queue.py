@@ -0,0 +1,192 @@
+"""Database-backed background jobs; the JOBS_JOB table is the queue, no broker needed.
+
+* Handlers are registered with ``@task("app.name")`` in an app's ``tasks.py``,
+  which is imported at startup. A handler is called as
+  ``handler(job, **payload)`` and its return value (JSON) becomes the result.
+* ``enqueue`` inserts a row in the caller's transaction, so work for a save
+  that rolls back never runs.
+* ``manage.py run_workers`` claims rows with a conditional ``UPDATE``. That is
+  safe with several worker processes or hosts. Each claimed job runs in a process
+  pool, with the highest priority first and then the oldest.
+* A failing job is retried with exponential backoff until ``max_attempts``.
+  ``PermanentJobError`` fails it at once. A job whose worker stops sending
+  heartbeats for ``JOBS_LEASE_SECONDS`` is treated as a failed attempt.
+"""
+
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_tasks = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for failures a retry cannot fix (e.g. an unreadable file)."""
+
+
+def task(name):
+    """Register the decorated function as the handler for jobs of kind ``name``."""
+
+    def register(func):
+        _tasks[name] = func
+        return func
+
+    return register
+
+
+def autodiscover():
+    autodiscover_modules("tasks")
+
+
+def default_max_attempts():
+    return getattr(settings, "JOBS_MAX_ATTEMPTS", 3)
+
+
+def lease_seconds():
+    return getattr(settings, "JOBS_LEASE_SECONDS", 300)
+
+
+def retry_delay(attempt):
+    """Seconds to wait before retrying after failed attempt number ``attempt`` (1-based)."""
+    base = getattr(settings, "JOBS_RETRY_BACKOFF", 10)
+    return min(base * 2 ** (attempt - 1), getattr(settings, "JOBS_RETRY_BACKOFF_MAX", 3600))
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"[:64]
+
+
+def enqueue(kind, payload=None, priority=0, max_attempts=None, user_id=None, delay=0):
+    """Queue a ``kind`` job; it becomes visible to workers when the current transaction commits."""
+    if kind not in _tasks:
+        raise ValueError(f"No job handler registered for {kind!r}.")
+    return Job.objects.create(
+        kind=kind,
+        payload=payload or {},
+        priority=priority,
+        max_attempts=max_attempts or default_max_attempts(),
+        created_by=user_id,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def claim(worker, limit=1):
+    """Mark up to ``limit`` due jobs as running on ``worker`` and return their ids."""
+    now = timezone.now()
+    # Extra candidates, in case other workers win some of them.
+    candidates = list(
+        Job.objects.filter(status=Job.STATUS_QUEUED, run_after__lte=now)
+        .order_by("-priority", "id")
+        .values_list("id", flat=True)[: limit * 4]
+    )
+    claimed = []
+    for job_id in candidates:
+        if len(claimed) >= limit:
+            break
+        won = Job.objects.filter(id=job_id, status=Job.STATUS_QUEUED).update(
+            status=Job.STATUS_RUNNING,
+            worker=worker,
+            attempts=F("attempts") + 1,
+            started_at=now,
+            heartbeat_at=now,
+        )
+        if won:
+            claimed.append(job_id)
+    return claimed
+
+
+def _running(worker=None, **filters):
+    """Running jobs, limited to those claimed by ``worker`` when given.
+
+    A job requeued as stale may already be running again elsewhere; the worker
+    that lost it must not touch the new attempt.
+    """
+    running = Job.objects.filter(status=Job.STATUS_RUNNING, **filters)
+    return running if worker is None else running.filter(worker=worker)
+
+
+def heartbeat(job_ids, worker=None):
+    if job_ids:
+        _running(worker, id__in=job_ids).update(heartbeat_at=timezone.now())
+
+
+def fail(job_id, error, permanent=False, worker=None):
+    """Record a failed attempt of ``worker``'s run: requeue with backoff, or fail the job for good."""
+    job = Job.objects.only("attempts", "max_attempts").get(id=job_id)
+    now = timezone.now()
+    running = _running(worker, id=job_id)
+    if not permanent and job.attempts < job.max_attempts:
+        running.update(
+            status=Job.STATUS_QUEUED,
+            run_after=now + timedelta(seconds=retry_delay(job.attempts)),
+            worker="",
+            error=error,
+        )
+    else:
+        running.update(status=Job.STATUS_FAILED, finished_at=now, error=error)
+
+
+def requeue_stale():
+    """Fail the current attempt of running jobs whose worker has gone quiet; returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=lease_seconds())
+    stale = list(Job.objects.filter(status=Job.STATUS_RUNNING, heartbeat_at__lt=cutoff).values_list("id", "worker"))
+    for job_id, worker in stale:
+        fail(job_id, f"Worker {worker} stopped responding.", worker=worker)
+    return len(stale)
+
+
+class JobContext:
+    """What a handler gets as its first argument."""
+
+    def __init__(self, job):
+        self.id = job.pk
+        self.kind = job.kind
+        self.attempt = job.attempts
+        self.user_id = job.created_by
+
+    def progress(self, done, total=None, message=None):
+        """Report ``done`` of ``total`` units; also counts as a heartbeat."""
+        fields = {"progress_done": done, "heartbeat_at": timezone.now()}
+        if total is not None:
+            fields["progress_total"] = total
+        if message is not None:
+            fields["progress_message"] = message[:255]
+        Job.objects.filter(id=self.id).update(**fields)
+
+
+def run_job(job_id):
+    """Run a claimed job and record its outcome. Never raises; runs in the worker processes."""
+    close_old_connections()
+    try:
+        job = Job.objects.get(id=job_id)
+        handler = _tasks.get(job.kind)
+        if handler is None:
+            fail(job_id, f"No job handler registered for {job.kind!r}.", permanent=True, worker=job.worker)
+            return
+        try:
+            result = handler(JobContext(job), **job.payload)
+        except PermanentJobError as exc:
+            fail(job_id, str(exc), permanent=True, worker=job.worker)
+        except Exception:
+            logger.exception("Job %s (%s) failed on attempt %d.", job_id, job.kind, job.attempts)
+            fail(job_id, traceback.format_exc(), worker=job.worker)
+        else:
+            _running(job.worker, id=job_id).update(
+                status=Job.STATUS_SUCCEEDED, result=result, error="", finished_at=timezone.now()
+            )
+    except Exception:
+        logger.exception("Could not record the outcome of job %s.", job_id)
+    finally:
+        close_old_connections()
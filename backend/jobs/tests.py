@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .queue import PermanentJobError, claim, enqueue, fail, heartbeat, requeue_stale, run_job, task
+from .worker import WorkerPool
+
+calls = []
+
+
+@task("tests.record")
+def record(job, value):
+    job.progress(1, 2, "halfway")
+    calls.append(value)
+    return {"value": value}
+
+
+@task("tests.flaky")
+def flaky(job, failures):
+    if job.attempt <= failures:
+        raise RuntimeError(f"attempt {job.attempt} failed")
+    return job.attempt
+
+
+@task("tests.bad_input")
+def bad_input(job):
+    raise PermanentJobError("Nothing to do.")
+
+
+@task("tests.outlived_lease")
+def outlived_lease(job):
+    # While this (first) run is still going, it is declared stale and picked up by w2.
+    Job.objects.filter(pk=job.id).update(heartbeat_at=timezone.now() - timedelta(days=1))
+    requeue_stale()
+    Job.objects.filter(pk=job.id).update(run_after=timezone.now())
+    claim("w2")
+    return "late"
+
+
+@override_settings(JOBS_RETRY_BACKOFF=10, JOBS_RETRY_BACKOFF_MAX=15)
+class JobQueueTests(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def make_due(self, job):
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+
+    def test_higher_priority_runs_first(self):
+        low = enqueue("tests.record", {"value": "low"})
+        high = enqueue("tests.record", {"value": "high"}, priority=5)
+        later = enqueue("tests.record", {"value": "later"}, priority=9, delay=60)
+        self.assertEqual(claim("w1", limit=5), [high.pk, low.pk])
+        self.assertEqual(claim("w2"), [])
+
+        self.assertEqual(WorkerPool(workers=0).run(burst=True), 0)
+        Job.objects.filter(pk__in=[high.pk, low.pk]).update(status=Job.STATUS_QUEUED)
+        self.make_due(later)
+        self.assertEqual(WorkerPool(workers=0).run(burst=True), 3)
+        self.assertEqual(calls, ["later", "high", "low"])
+
+        job = Job.objects.get(pk=high.pk)
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.result, {"value": "high"})
+        self.assertEqual(job.as_dict()["progress"], {"done": 1, "total": 2, "percent": 50.0, "message": "halfway"})
+
+    def test_failures_are_retried_with_backoff(self):
+        job = enqueue("tests.flaky", {"failures": 2}, max_attempts=3)
+        for attempt, delay in ((1, 10), (2, 15)):
+            [job_id] = claim("w1")
+            with self.assertLogs("jobs.queue", "ERROR"):
+                run_job(job_id)
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (Job.STATUS_QUEUED, attempt))
+            self.assertIn(f"attempt {attempt} failed", job.error)
+            self.assertAlmostEqual((job.run_after - timezone.now()).total_seconds(), delay, delta=2)
+            self.assertEqual(claim("w1"), [])
+            self.make_due(job)
+
+        WorkerPool(workers=0).run(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result, job.error), (Job.STATUS_SUCCEEDED, 3, ""))
+
+    def test_exhausted_and_permanent_failures(self):
+        flaky_job = enqueue("tests.flaky", {"failures": 5}, max_attempts=1)
+        bad_job = enqueue("tests.bad_input", max_attempts=3)
+        with self.assertLogs("jobs.queue", "ERROR"):
+            WorkerPool(workers=0).run(burst=True)
+        flaky_job.refresh_from_db()
+        bad_job.refresh_from_db()
+        self.assertEqual(flaky_job.status, Job.STATUS_FAILED)
+        self.assertEqual((bad_job.status, bad_job.attempts, bad_job.error), (Job.STATUS_FAILED, 1, "Nothing to do."))
+        with self.assertRaises(ValueError):
+            enqueue("tests.unknown")
+
+    @override_settings(JOBS_LEASE_SECONDS=60)
+    def test_jobs_of_silent_workers_are_requeued(self):
+        job = enqueue("tests.record", {"value": "x"})
+        claim("w1")
+        self.assertEqual(requeue_stale(), 0)
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(seconds=61))
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_QUEUED, 1))
+        self.assertIn("w1 stopped responding", job.error)
+
+    def test_worker_that_lost_its_job_cannot_record_an_outcome(self):
+        job = enqueue("tests.outlived_lease")
+        claim("w1")
+        run_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.worker, job.attempts, job.result), (Job.STATUS_RUNNING, "w2", 2, None))
+
+        heartbeat([job.pk], worker="w1")
+        fail(job.pk, "late failure", worker="w1")
+        fresh = Job.objects.get(pk=job.pk)
+        self.assertEqual((fresh.status, fresh.heartbeat_at, fresh.error), (Job.STATUS_RUNNING, job.heartbeat_at, job.error))
+        fail(job.pk, "w2 failed", permanent=True, worker="w2")
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.STATUS_FAILED)
+
+    def test_status_endpoint(self):
+        owner = get_user_model().objects.create_user("owner", password="pw")
+        other = get_user_model().objects.create_user("other", password="pw")
+        job = enqueue("tests.record", {"value": "x"}, user_id=owner.id)
+        url = f"/api/jobs/{job.pk}/"
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.client.force_login(owner)
+        self.assertEqual(self.client.get(url).json()["job"]["status"], "queued")
+        WorkerPool(workers=0).run(burst=True)
+        body = self.client.get(url).json()["job"]
+        self.assertEqual((body["status"], body["result"], body["attempts"]), ("succeeded", {"value": "x"}, 1))
@@ -0,0 +1,20 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from .models import Job
+
+
+@require_GET
+def job_status(request, job_id):
+    """Status, progress and (once finished) result or error of a job the user submitted."""
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    queryset = Job.objects.filter(id=job_id)
+    if not request.user.is_staff:
+        queryset = queryset.filter(created_by=request.user.id)
+    job = queryset.first()
+    if job is None:
+        return JsonResponse({"success": False, "message": "Job not found."}, status=404)
+
+    return JsonResponse({"success": True, "job": job.as_dict()})
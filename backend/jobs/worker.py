@@ -0,0 +1,126 @@
+"""The loop behind ``manage.py run_workers``.
+
+Only the parent process claims jobs, and never more than there are free pool
+slots, so a busy host does not sit on work other hosts could run. The parent
+also sends the heartbeats for everything in flight, so handlers do not have to
+report progress just to keep their lease.
+"""
+
+import logging
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import process
+from .queue import claim, fail, heartbeat, lease_seconds, requeue_stale, run_job, worker_name
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    def __init__(self, workers=None, poll_interval=None, name=None):
+        self.workers = getattr(settings, "JOBS_WORKERS", 2) if workers is None else workers
+        self.poll_interval = getattr(settings, "JOBS_POLL_INTERVAL", 1.0) if poll_interval is None else poll_interval
+        self.name = name or worker_name()
+        self.stopping = False
+        self.completed = 0
+        self._executor = None
+        self._inflight = {}
+        self._next_sweep = 0
+        self._next_heartbeat = 0
+
+    def stop(self):
+        """Stop claiming; ``run`` returns once the jobs in flight are done."""
+        self.stopping = True
+
+    def run(self, burst=False):
+        """Run jobs until stopped (or, with ``burst``, until none are due); returns how many ran."""
+        try:
+            while True:
+                self._sweep()
+                if self.workers:
+                    busy = self._step()
+                else:
+                    busy = self._step_inline()
+                if not busy and (burst or self.stopping):
+                    return self.completed
+                if not busy:
+                    time.sleep(self.poll_interval)
+        finally:
+            self._shutdown()
+            close_old_connections()
+
+    def _sweep(self):
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._next_sweep = now + lease_seconds() / 2
+            requeued = requeue_stale()
+            if requeued:
+                logger.warning("Requeued %d jobs whose worker stopped responding.", requeued)
+
+    def _step_inline(self):
+        """workers=0: run one job in this process (debugging, tests)."""
+        if self.stopping:
+            return False
+        claimed = claim(self.name)
+        for job_id in claimed:
+            run_job(job_id)
+            self.completed += 1
+        return bool(claimed)
+
+    def _step(self):
+        free = self.workers - len(self._inflight)
+        if free and not self.stopping:
+            for job_id in claim(self.name, free):
+                self._submit(job_id)
+        if not self._inflight:
+            return False
+        done, _ = wait(self._inflight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+        for future in done:
+            self._collect(future)
+        now = time.monotonic()
+        if now >= self._next_heartbeat:
+            self._next_heartbeat = now + lease_seconds() / 5
+            heartbeat([job_id for job_id, _ in self._inflight.values()], worker=self.name)
+        return True
+
+    def _submit(self, job_id):
+        if self._executor is None:
+            # spawn: children start clean instead of inheriting this process's DB connections.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=process.initialize
+            )
+        try:
+            future = self._executor.submit(process.run_job, job_id)
+        except BrokenProcessPool:
+            self._discard(self._executor)
+            return self._submit(job_id)
+        self._inflight[future] = (job_id, self._executor)
+
+    def _collect(self, future):
+        job_id, executor = self._inflight.pop(future)
+        self.completed += 1
+        try:
+            future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM) and took the pool with it; every job in flight loses its attempt.
+            fail(job_id, "Worker process died.", worker=self.name)
+            self._discard(executor)
+        except Exception:
+            logger.exception("Job %s could not be run.", job_id)
+            fail(job_id, "Job could not be handed to a worker process.", worker=self.name)
+
+    def _discard(self, executor):
+        """Drop a broken pool; the next submit starts a fresh one."""
+        if executor is self._executor:
+            executor.shutdown(wait=False)
+            self._executor = None
+
+    def _shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
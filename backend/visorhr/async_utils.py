@@ -0,0 +1,62 @@
+"""Helpers for the async-native views served under ASGI.
+
+Django 4.1's ``csrf_exempt``/``require_POST`` wrap views in sync functions,
+which would turn an ``async def`` view back into a sync one, so the async views
+use the equivalents below. Password hashing runs in a small dedicated thread
+pool so PBKDF2 work neither blocks the event loop nor competes with the
+default executor that ``sync_to_async`` uses for ORM calls.
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.http import HttpResponseNotAllowed
+
+_hasher_pool = None
+_hasher_lock = threading.Lock()
+
+
+def async_csrf_exempt(view):
+    view.csrf_exempt = True
+    return view
+
+
+def async_require_http_methods(methods):
+    def decorator(view):
+        @functools.wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+
+        return inner
+
+    return decorator
+
+
+async_require_POST = async_require_http_methods(["POST"])
+
+
+def _get_hasher_pool():
+    global _hasher_pool
+    with _hasher_lock:
+        if _hasher_pool is None:
+            workers = getattr(settings, "PASSWORD_HASHER_THREADS", 4)
+            _hasher_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hasher")
+        return _hasher_pool
+
+
+async def run_in_hasher(func, *args):
+    """Run a CPU-bound password hashing call in the bounded hasher pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_hasher_pool(), functools.partial(func, *args))
+
+
+async def aget_user(request):
+    """Resolve ``request.user`` without touching the lazy object from the event loop."""
+    return await sync_to_async(get_user)(request)
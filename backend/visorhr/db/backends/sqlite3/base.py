@@ -0,0 +1,8 @@
+from django.db.backends.sqlite3 import base
+
+from visorhr.db.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    def ping_connection(self, connection):
+        connection.execute("SELECT 1").close()
@@ -0,0 +1,263 @@
+"""Process-wide connection pool shared by the pooled database backends.
+
+Django opens a connection per thread on first use and, with ``CONN_MAX_AGE = 0``,
+closes it when the request finishes. The pooled backends keep that lifecycle
+but route it through a ``ConnectionPool``: ``get_new_connection`` borrows an
+idle connection (or opens one while below ``SIZE``) and ``_close`` hands it
+back. Connections older than ``MAX_LIFETIME`` are retired, and with
+``PRE_PING`` a connection that sat idle is pinged before being handed out.
+
+Pool settings live under the ``POOL`` key of the ``DATABASES`` entry::
+
+    "POOL": {"SIZE": 10, "MAX_LIFETIME": 1800, "TIMEOUT": 30, "PRE_PING": True}
+"""
+
+import collections
+import logging
+import os
+import threading
+import time
+
+from django.db.utils import OperationalError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_OPTIONS = {
+    "SIZE": 10,
+    "MAX_LIFETIME": 1800,
+    "TIMEOUT": 30,
+    "PRE_PING": True,
+}
+
+COUNTERS = ("created", "reused", "waits", "timeouts", "expired", "ping_failed", "closed")
+
+# Connections returned more recently than this are handed out without a ping.
+PRE_PING_IDLE_SECONDS = 1.0
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class PooledConnection:
+    __slots__ = ("pool", "connection", "created_at", "returned_at")
+
+    def __init__(self, pool, connection):
+        self.pool = pool
+        self.connection = connection
+        self.created_at = self.returned_at = time.monotonic()
+
+
+class ConnectionPool:
+    def __init__(self, alias, size, max_lifetime, timeout, pre_ping):
+        self.alias = alias
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self.retired = False
+        self._idle = collections.deque()
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._counters = collections.Counter()
+        self._wait_seconds = 0.0
+        self._wait_max = 0.0
+
+    def acquire(self, connect, ping):
+        """Return a ``PooledConnection``, reusing an idle one when it is still healthy."""
+        entry = self._checkout()
+        while entry is not None:
+            if self._expired(entry):
+                self._discard(entry.connection, "expired")
+            elif self._healthy(entry, ping):
+                self._bump("reused")
+                return entry
+            else:
+                self._discard(entry.connection, "ping_failed")
+            # The slot is still ours; take another idle connection or open a new one.
+            with self._cond:
+                entry = self._idle.pop() if self._idle else None
+        try:
+            entry = PooledConnection(self, connect())
+        except BaseException:
+            self._release_slot()
+            raise
+        self._bump("created")
+        return entry
+
+    def release(self, entry, reusable=True):
+        if not reusable or self.retired or self._expired(entry):
+            self._discard(entry.connection, "closed")
+            self._release_slot()
+            return
+        entry.returned_at = time.monotonic()
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append(entry)
+            self._cond.notify()
+
+    def close_idle(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), collections.deque()
+        for entry in idle:
+            self._discard(entry.connection, "closed")
+
+    def stats(self):
+        with self._cond:
+            in_use, idle = self._in_use, len(self._idle)
+            wait_seconds, wait_max = self._wait_seconds, self._wait_max
+            counters = {name: self._counters[name] for name in COUNTERS}
+        return {
+            "size": self.size,
+            "in_use": in_use,
+            "idle": idle,
+            "wait_seconds_total": round(wait_seconds, 6),
+            "wait_seconds_max": round(wait_max, 6),
+            **counters,
+        }
+
+    def _checkout(self):
+        """Reserve a slot: return an idle entry, or None when the caller should connect."""
+        started = time.monotonic()
+        waited = False
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()  # LIFO keeps the warmest connections busy
+                    break
+                if self._in_use < self.size:
+                    entry = None
+                    break
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No connection available in the '{self.alias}' pool "
+                        f"({self.size} in use) after {self.timeout}s."
+                    )
+                waited = True
+                self._cond.wait(remaining)
+            self._in_use += 1
+            if waited:
+                elapsed = time.monotonic() - started
+                self._counters["waits"] += 1
+                self._wait_seconds += elapsed
+                self._wait_max = max(self._wait_max, elapsed)
+        return entry
+
+    def _release_slot(self):
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+    def _expired(self, entry):
+        return bool(self.max_lifetime) and time.monotonic() - entry.created_at > self.max_lifetime
+
+    def _healthy(self, entry, ping):
+        # Skipping the ping is safe only because release() discards connections returned after errors.
+        if not self.pre_ping or time.monotonic() - entry.returned_at < PRE_PING_IDLE_SECONDS:
+            return True
+        try:
+            ping(entry.connection)
+        except Exception:
+            return False
+        return True
+
+    def _bump(self, name):
+        with self._cond:
+            self._counters[name] += 1
+
+    def _discard(self, connection, reason):
+        self._bump(reason)
+        try:
+            connection.close()
+        except Exception:
+            logger.debug("Error closing pooled connection for '%s'", self.alias, exc_info=True)
+
+
+def pool_options(settings_dict):
+    return {**DEFAULT_POOL_OPTIONS, **(settings_dict.get("POOL") or {})}
+
+
+def _target(settings_dict):
+    return tuple(str(settings_dict.get(key)) for key in ("NAME", "HOST", "PORT", "USER"))
+
+
+def get_pool(alias, settings_dict):
+    """Return the pool for ``alias``, replacing it if the alias now points at another database."""
+    target = _target(settings_dict)
+    retired = None
+    with _pools_lock:
+        current = _pools.get(alias)
+        if current is not None and current[0] == target:
+            return current[1]
+        if current is not None:
+            # e.g. the test runner switching NAME to the test database.
+            retired = current[1]
+            retired.retired = True
+        options = pool_options(settings_dict)
+        pool = ConnectionPool(
+            alias,
+            size=int(options["SIZE"]),
+            max_lifetime=float(options["MAX_LIFETIME"] or 0),
+            timeout=float(options["TIMEOUT"]),
+            pre_ping=bool(options["PRE_PING"]),
+        )
+        _pools[alias] = (target, pool)
+    if retired is not None:
+        retired.close_idle()
+    return pool
+
+
+def pool_stats():
+    """Gauges and counters for every pool in this process, keyed by database alias."""
+    with _pools_lock:
+        pools = dict(_pools)
+    return {alias: pool.stats() for alias, (_, pool) in pools.items()}
+
+
+def close_pools():
+    with _pools_lock:
+        pools = [pool for _, pool in _pools.values()]
+        _pools.clear()
+    for pool in pools:
+        pool.close_idle()
+
+
+def _forget_pools_after_fork():
+    # The child must not reuse (or close, which would end the parent's session) inherited sockets.
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pools_after_fork)
+
+
+class PooledDatabaseWrapperMixin:
+    """Borrow connections from the alias's ``ConnectionPool`` instead of opening/closing them."""
+
+    _pool_entry = None
+
+    def ping_connection(self, connection):
+        raise NotImplementedError
+
+    def get_new_connection(self, conn_params):
+        connect = super().get_new_connection
+        pool = get_pool(self.alias, self.settings_dict)
+        entry = pool.acquire(lambda: connect(conn_params), self.ping_connection)
+        self._pool_entry = entry
+        return entry.connection
+
+    def _close(self):
+        entry, self._pool_entry = self._pool_entry, None
+        if entry is None or entry.connection is not self.connection:
+            return super()._close()
+        # Never hand out a connection that may still hold an open transaction, or one
+        # that raised a database error: Django closes those exactly when they are unusable.
+        reusable = not self.in_atomic_block and self.autocommit and not self.needs_rollback and not self.errors_occurred
+        entry.pool.release(entry, reusable=reusable)
@@ -0,0 +1,190 @@
+"""Authenticated serving of MEDIA files: Django checks access, the front server moves the bytes.
+
+``MEDIA_SENDFILE`` chooses how a file is sent once the request is allowed:
+
+- ``"nginx"``: an empty response with ``X-Accel-Redirect: <MEDIA_ACCEL_REDIRECT_PREFIX><name>``,
+  which nginx serves from an ``internal`` location aliased to MEDIA_ROOT.
+- ``"apache"``: ``X-Sendfile: <absolute path>`` for mod_xsendfile.
+- ``""`` (default): Django streams the file itself and answers single ``Range``
+  requests with 206. The open file is passed on, so WSGI servers with a
+  ``wsgi.file_wrapper`` (gunicorn, uWSGI) send it with ``sendfile()``.
+
+When the transfer is offloaded the front server also handles ``Range`` and
+sets ``ETag``/``Last-Modified`` from the file. It keeps ``Content-Type`` and
+``Cache-Control`` from the response.
+"""
+
+import mimetypes
+import posixpath
+import re
+from collections import namedtuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from jobs.models import Job
+
+# Readable by every signed-in user; anything else only by staff, or by the user whose job produced it.
+SHARED_PREFIXES = ("employees/",)
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+FileStat = namedtuple("FileStat", "name size last_modified")
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def sendfile_backend():
+    return getattr(settings, "MEDIA_SENDFILE", "")
+
+
+def accel_redirect_prefix():
+    return getattr(settings, "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+
+
+def clean_name(name):
+    """``name`` as a storage name, or None for anything outside MEDIA_ROOT or hidden (such as ``.incoming``)."""
+    if not name or "\\" in name or "\0" in name or name.startswith("/"):
+        return None
+    parts = posixpath.normpath(name).split("/")
+    if any(part.startswith(".") for part in parts):
+        return None
+    return "/".join(parts)
+
+
+def can_read(user, name):
+    if not user.is_authenticated:
+        return False
+    if user.is_staff or name.startswith(SHARED_PREFIXES):
+        return True
+    # Export, ID card and duplicate report files belong to whoever queued the job.
+    return Job.objects.filter(created_by=user.id, result__name=name).exists()
+
+
+def file_stat(name, storage=default_storage):
+    """The FileStat of the stored file ``name``, or None if there is no such file."""
+    try:
+        return FileStat(name, storage.size(name), int(storage.get_modified_time(name).timestamp()))
+    except (OSError, SuspiciousFileOperation):
+        return None
+
+
+def stat_etag(stat):
+    """Strong ETag from size and mtime, as nginx computes for static files."""
+    return f'"{stat.last_modified:x}-{stat.size:x}"'
+
+
+def byte_range(request, size, etag=None, last_modified=None):
+    """``(start, end)`` (inclusive) of a single-range request, or None to send the whole file.
+
+    Multiple ranges, malformed headers and ranges ending before they start are
+    ignored, as are ranges whose ``If-Range`` no longer matches the file. Raises
+    RangeNotSatisfiable for a range that starts past the end.
+    """
+    header = request.META.get("HTTP_RANGE", "").replace(" ", "")
+    match = _RANGE.match(header)
+    if match is None or match.groups() == ("", ""):
+        return None
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if if_range:
+        if if_range.startswith('"'):
+            if if_range != etag:
+                return None
+        elif last_modified is None or parse_http_date_safe(if_range) != last_modified:
+            return None
+    first, last = match.groups()
+    if first == "":
+        # A suffix: the last N bytes.
+        if int(last) == 0:
+            raise RangeNotSatisfiable()
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        # Syntactically invalid (RFC 9110, 14.1.1): ignore the header.
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+class _FileRange:
+    """Reads ``length`` bytes of an open file from its current position.
+
+    Exposes ``fileno`` so a WSGI server's sendfile() can send the range
+    directly; they stop at the response's Content-Length.
+    """
+
+    def __init__(self, fileobj, length):
+        self.fileobj = fileobj
+        self.remaining = length
+        self.name = getattr(fileobj, "name", "")
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.fileobj.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.fileobj.fileno()
+
+    def close(self):
+        self.fileobj.close()
+
+
+def file_response(request, stat, etag=None, storage=default_storage):
+    """The response sending ``stat.name``, handing it to the front server when configured."""
+    content_type = mimetypes.guess_type(stat.name)[0] or "application/octet-stream"
+    backend = sendfile_backend()
+    if backend == "nginx":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = accel_redirect_prefix() + quote(stat.name)
+        return response
+    if backend == "apache":
+        try:
+            path = storage.path(stat.name)
+        except NotImplementedError:
+            path = None
+        if path is not None:
+            response = HttpResponse(content_type=content_type)
+            response["X-Sendfile"] = path
+            return response
+
+    try:
+        requested = byte_range(request, stat.size, etag, stat.last_modified)
+    except RangeNotSatisfiable:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{stat.size}"
+        return response
+    fileobj = storage.open(stat.name, "rb")
+    if requested is None:
+        response = FileResponse(fileobj, content_type=content_type)
+    else:
+        start, end = requested
+        fileobj.seek(start)
+        response = FileResponse(_FileRange(fileobj, end - start + 1), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{stat.size}"
+        response["Content-Length"] = end - start + 1
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def serve(request, stat, etag):
+    """A 304/412 if the request's preconditions say so, else ``file_response``; both carry the validators.
+
+    ``stat`` is anything with ``name``, ``size`` and ``last_modified``; Cache-Control is the caller's.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=stat.last_modified)
+    if response is None:
+        response = file_response(request, stat, etag)
+    response.headers["ETag"] = etag
+    response.headers["Last-Modified"] = http_date(stat.last_modified)
+    return response
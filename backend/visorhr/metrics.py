@@ -0,0 +1,165 @@
+"""In-process request metrics, rendered in the Prometheus text format.
+
+``visorhr.middleware.MetricsMiddleware`` calls ``observe_request`` once per
+request with everything it measured; a single lock guards the per-route
+counters, so the cost per request is a dict lookup, a bisect and a few
+additions. Values are per process: with several workers, scrape each one (or
+aggregate in Prometheus).
+"""
+
+import bisect
+import threading
+
+from visorhr.db.pool import COUNTERS as POOL_EVENTS, pool_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "visorhr"
+
+
+class RouteStats:
+    __slots__ = (
+        "buckets",
+        "latency_sum",
+        "count",
+        "statuses",
+        "db_queries",
+        "db_seconds",
+        "response_bytes",
+        "upload_bytes",
+        "upload_files",
+        "uploads_rejected",
+    )
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.count = 0
+        self.statuses = {}
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.response_bytes = 0
+        self.upload_bytes = 0
+        self.upload_files = 0
+        self.uploads_rejected = 0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def observe_request(self, route, method, status, seconds, db_queries=0, db_seconds=0.0, response_bytes=0, upload_stats=None):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._routes.get((route, method))
+            if stats is None:
+                stats = self._routes[(route, method)] = RouteStats()
+            stats.buckets[bucket] += 1
+            stats.latency_sum += seconds
+            stats.count += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.db_queries += db_queries
+            stats.db_seconds += db_seconds
+            stats.response_bytes += response_bytes
+            if upload_stats:
+                stats.upload_bytes += upload_stats["bytes"]
+                stats.upload_files += upload_stats["files"]
+                stats.uploads_rejected += bool(upload_stats["rejected"])
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: {
+                    "buckets": list(stats.buckets),
+                    "latency_sum": stats.latency_sum,
+                    "count": stats.count,
+                    "statuses": dict(stats.statuses),
+                    "db_queries": stats.db_queries,
+                    "db_seconds": stats.db_seconds,
+                    "response_bytes": stats.response_bytes,
+                    "upload_bytes": stats.upload_bytes,
+                    "upload_files": stats.upload_files,
+                    "uploads_rejected": stats.uploads_rejected,
+                }
+                for key, stats in self._routes.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+
+registry = MetricsRegistry()
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# (metric suffix, type, help, snapshot key)
+ROUTE_COUNTERS = (
+    ("db_queries_total", "counter", "Database queries executed while handling requests.", "db_queries"),
+    ("db_query_seconds_total", "counter", "Time spent in database queries while handling requests.", "db_seconds"),
+    ("response_bytes_total", "counter", "Bytes in non-streaming response bodies.", "response_bytes"),
+    ("upload_bytes_total", "counter", "Bytes received in streamed employee image uploads.", "upload_bytes"),
+    ("upload_files_total", "counter", "Employee image files received.", "upload_files"),
+    ("uploads_rejected_total", "counter", "Employee image uploads rejected by size or format limits.", "uploads_rejected"),
+)
+
+
+def render_prometheus():
+    snapshot = sorted(registry.snapshot().items())
+    lines = []
+
+    def header(name, kind, help_text):
+        lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+
+    header("http_request_duration_seconds", "histogram", "Request latency by route.")
+    for (route, method), stats in snapshot:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats["buckets"]):
+            cumulative += count
+            lines.append(f"{PREFIX}_http_request_duration_seconds_bucket{_labels(route=route, method=method, le=bound)} {cumulative}")
+        labels = _labels(route=route, method=method)
+        lines.append(f"{PREFIX}_http_request_duration_seconds_sum{labels} {_format_number(stats['latency_sum'])}")
+        lines.append(f"{PREFIX}_http_request_duration_seconds_count{labels} {stats['count']}")
+
+    header("http_requests_total", "counter", "Requests by route and status code.")
+    for (route, method), stats in snapshot:
+        for status, count in sorted(stats["statuses"].items()):
+            lines.append(f"{PREFIX}_http_requests_total{_labels(route=route, method=method, status=status)} {count}")
+
+    for name, kind, help_text, key in ROUTE_COUNTERS:
+        header(name, kind, help_text)
+        for (route, method), stats in snapshot:
+            lines.append(f"{PREFIX}_{name}{_labels(route=route, method=method)} {_format_number(stats[key])}")
+
+    pools = sorted(pool_stats().items())
+    header("db_pool_connections", "gauge", "Pooled database connections by state.")
+    for alias, stats in pools:
+        for state in ("in_use", "idle"):
+            lines.append(f"{PREFIX}_db_pool_connections{_labels(alias=alias, state=state)} {stats[state]}")
+    header("db_pool_size", "gauge", "Maximum connections per pool.")
+    for alias, stats in pools:
+        lines.append(f"{PREFIX}_db_pool_size{_labels(alias=alias)} {stats['size']}")
+    header("db_pool_wait_seconds_total", "counter", "Time requests spent waiting for a pooled connection.")
+    for alias, stats in pools:
+        lines.append(f"{PREFIX}_db_pool_wait_seconds_total{_labels(alias=alias)} {_format_number(stats['wait_seconds_total'])}")
+    header("db_pool_wait_seconds_max", "gauge", "Longest wait for a pooled connection.")
+    for alias, stats in pools:
+        lines.append(f"{PREFIX}_db_pool_wait_seconds_max{_labels(alias=alias)} {_format_number(stats['wait_seconds_max'])}")
+    header("db_pool_events_total", "counter", "Pool lifecycle events.")
+    for alias, stats in pools:
+        for event in POOL_EVENTS:
+            lines.append(f"{PREFIX}_db_pool_events_total{_labels(alias=alias, event=event)} {stats[event]}")
+
+    return "\n".join(lines) + "\n"
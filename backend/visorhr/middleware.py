@@ -0,0 +1,107 @@
+import asyncio
+import contextvars
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from visorhr.metrics import registry
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+_current_timer = contextvars.ContextVar("visorhr_query_timer", default=None)
+
+
+class QueryTimer:
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+def time_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection; counts into the current request's timer."""
+    timer = _current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.seconds += time.perf_counter() - started
+        timer.queries += 1
+
+
+def install_query_timer(sender=None, connection=None, **kwargs):
+    # The wrapper list outlives reconnects (and pool checkouts), so only add it once.
+    if time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(time_query)
+
+
+class MetricsMiddleware:
+    """Record latency, status, DB query count/time, response and upload size per route.
+
+    Routes are labelled by their URL pattern (``api/employee/<int:emp_id>/images/``),
+    so label cardinality stays bounded. Place it first in ``MIDDLEWARE`` so the
+    timing covers the rest of the stack. Queries are attributed through a
+    context variable rather than wrapping connections per request, which keeps
+    the per-request cost to a few microseconds (``benchmarks/metrics_overhead.py``).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.excluded = tuple(getattr(settings, "METRICS_EXCLUDED_PATHS", ("/metrics",)))
+        connection_created.connect(install_query_timer, dispatch_uid="visorhr_metrics_query_timer")
+        for connection in connections.all(initialized_only=True):
+            install_query_timer(connection=connection)
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if request.path.startswith(self.excluded):
+            return self.get_response(request)
+        timer = QueryTimer()
+        token = _current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self._observe(request, response, time.perf_counter() - started, timer)
+        return response
+
+    async def __acall__(self, request):
+        if request.path.startswith(self.excluded):
+            return await self.get_response(request)
+        timer = QueryTimer()
+        token = _current_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+        self._observe(request, response, time.perf_counter() - started, timer)
+        return response
+
+    @staticmethod
+    def _observe(request, response, seconds, timer):
+        match = request.resolver_match
+        route = match.route if match is not None else UNMATCHED_ROUTE
+        size = 0 if response.streaming else len(response.content)
+        registry.observe_request(
+            route,
+            request.method,
+            response.status_code,
+            seconds,
+            db_queries=timer.queries,
+            db_seconds=timer.seconds,
+            response_bytes=size,
+            upload_stats=getattr(request, "upload_stats", None),
+        )
@@ -36,9 +36,11 @@ INSTALLED_APPS = [
     "corsheaders",
     "accounts",
     "employee",
+    "jobs",
 ]
 
 MIDDLEWARE = [
+    "visorhr.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -70,18 +72,45 @@ TEMPLATES = [
 WSGI_APPLICATION = "visorhr.wsgi.application"
 ASGI_APPLICATION = "visorhr.asgi.application"
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.mysql",
-        "NAME": os.environ.get("MYSQL_DATABASE", "visorDB"),
-        "USER": os.environ.get("MYSQL_USER", "root"),
-        "PASSWORD": os.environ.get("MYSQL_PASSWORD", "admin"),
-        "HOST": os.environ.get("MYSQL_HOST", "127.0.0.1"),
-        "PORT": os.environ.get("MYSQL_PORT", "3306"),
-        "OPTIONS": {"charset": "utf8mb4"},
-    }
+# Route the auth and employee save endpoints to their async-native views (enable under ASGI).
+ASYNC_VIEWS = os.environ.get("DJANGO_ASYNC_VIEWS", "False").lower() in ("true", "1", "yes")
+PASSWORD_HASHER_THREADS = int(os.environ.get("PASSWORD_HASHER_THREADS", "4"))
+
+# With DJANGO_DB_POOL=True connections are borrowed from a per-process pool
+# (visorhr/db/pool.py) and handed back when each request finishes; off by default.
+DB_POOL = os.environ.get("DJANGO_DB_POOL", "False").lower() in ("true", "1", "yes")
+DB_POOL_OPTIONS = {
+    "SIZE": int(os.environ.get("MYSQL_POOL_SIZE", "10")),
+    "MAX_LIFETIME": int(os.environ.get("MYSQL_POOL_MAX_LIFETIME", "1800")),
+    "TIMEOUT": float(os.environ.get("MYSQL_POOL_TIMEOUT", "30")),
+    "PRE_PING": os.environ.get("MYSQL_POOL_PRE_PING", "True").lower() in ("true", "1", "yes"),
 }
 
+# DJANGO_DB_ENGINE=sqlite runs against a local SQLite file (tests, quick local setups).
+if os.environ.get("DJANGO_DB_ENGINE", "mysql").lower() == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "visorhr.db.backends.sqlite3" if DB_POOL else "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            "POOL": DB_POOL_OPTIONS,
+            # A file rather than :memory:, so closing a connection really returns it to the pool.
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "visorhr.db.backends.mysql" if DB_POOL else "django.db.backends.mysql",
+            "NAME": os.environ.get("MYSQL_DATABASE", "visorDB"),
+            "USER": os.environ.get("MYSQL_USER", "root"),
+            "PASSWORD": os.environ.get("MYSQL_PASSWORD", "admin"),
+            "HOST": os.environ.get("MYSQL_HOST", "127.0.0.1"),
+            "PORT": os.environ.get("MYSQL_PORT", "3306"),
+            "OPTIONS": {"charset": "utf8mb4"},
+            "POOL": DB_POOL_OPTIONS,
+        }
+    }
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -98,4 +127,76 @@ STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+# Uploaded photos/signatures and job output files. /media/ is served by visorhr.views.serve_media,
+# which checks access and then hands the transfer to the front server per MEDIA_SENDFILE:
+# "nginx" (X-Accel-Redirect to MEDIA_ACCEL_REDIRECT_PREFIX, an `internal` location aliased to
+# MEDIA_ROOT), "apache" (X-Sendfile, mod_xsendfile) or "" to stream from Django with Range support.
+MEDIA_URL = "media/"
+MEDIA_ROOT = Path(os.environ.get("DJANGO_MEDIA_ROOT", BASE_DIR / "media"))
+MEDIA_SENDFILE = os.environ.get("MEDIA_SENDFILE", "")
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Employee photo/signature derivatives are built in a process pool after save.
+EMPLOYEE_DERIVATIVE_WORKERS = int(os.environ.get("EMPLOYEE_DERIVATIVE_WORKERS", "2"))
+EMPLOYEE_THUMBNAIL_SIZES = (128, 384)
+# Hand derivatives to the background job queue (manage.py run_workers) instead of that pool.
+EMPLOYEE_DERIVATIVES_VIA_JOBS = os.environ.get("EMPLOYEE_DERIVATIVES_VIA_JOBS", "False").lower() in ("true", "1", "yes")
+
+# ID-card printing (employee/printing.py): cards render in a pool of WORKERS processes. Bangla
+# names need a Bengali TTF (e.g. NotoSansBengali-Regular.ttf) and Pillow built with libraqm.
+# Requests for more than MAX_SYNC cards have to go through the background job endpoint.
+EMPLOYEE_ID_CARD_WORKERS = int(os.environ.get("EMPLOYEE_ID_CARD_WORKERS", str(os.cpu_count() or 1)))
+EMPLOYEE_ID_CARD_TITLE = os.environ.get("EMPLOYEE_ID_CARD_TITLE", "VisorHR")
+EMPLOYEE_ID_CARD_FONT = os.environ.get("EMPLOYEE_ID_CARD_FONT") or None
+EMPLOYEE_ID_CARD_BANGLA_FONT = os.environ.get("EMPLOYEE_ID_CARD_BANGLA_FONT") or None
+EMPLOYEE_ID_CARD_MAX_SYNC = int(os.environ.get("EMPLOYEE_ID_CARD_MAX_SYNC", "500"))
+
+# Byte/pixel limits enforced while employee image uploads are streamed in.
+EMPLOYEE_UPLOAD_MAX_FILE_BYTES = int(os.environ.get("EMPLOYEE_UPLOAD_MAX_FILE_BYTES", str(10 * 2**20)))
+EMPLOYEE_UPLOAD_MAX_REQUEST_BYTES = int(os.environ.get("EMPLOYEE_UPLOAD_MAX_REQUEST_BYTES", str(24 * 2**20)))
+EMPLOYEE_UPLOAD_MAX_PIXELS = 50_000_000
+
+# Seconds a stored Idempotency-Key response is replayed for (employee save/upsert).
+EMPLOYEE_IDEMPOTENCY_TTL = int(os.environ.get("EMPLOYEE_IDEMPOTENCY_TTL", str(24 * 3600)))
+
+# Employee audit entries are buffered in-process and written to EMP_AUDIT in batches:
+# every FLUSH_INTERVAL seconds (0 = at commit), or once BATCH_SIZE entries are waiting.
+EMPLOYEE_AUDIT_FLUSH_INTERVAL = float(os.environ.get("EMPLOYEE_AUDIT_FLUSH_INTERVAL", "2"))
+EMPLOYEE_AUDIT_BATCH_SIZE = int(os.environ.get("EMPLOYEE_AUDIT_BATCH_SIZE", "500"))
+EMPLOYEE_AUDIT_MAX_PENDING = int(os.environ.get("EMPLOYEE_AUDIT_MAX_PENDING", "10000"))
+
+# Probable duplicate employees (employee/duplicates.py): pairs sharing a blocking key and scoring at
+# least MIN_SCORE (0-1). With CHECK_ON_SAVE, POST /api/employee/save/ lists them in its response.
+EMPLOYEE_DUPLICATE_MIN_SCORE = float(os.environ.get("EMPLOYEE_DUPLICATE_MIN_SCORE", "0.5"))
+EMPLOYEE_DUPLICATE_CHECK_ON_SAVE = os.environ.get("EMPLOYEE_DUPLICATE_CHECK_ON_SAVE", "True").lower() in ("true", "1", "yes")
+
+# Days deleted employees stay in the change feed (/api/employee/changes/); prune_employee_tombstones
+# drops older ones, after which clients with an older cursor get 410 and resync.
+EMPLOYEE_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("EMPLOYEE_TOMBSTONE_RETENTION_DAYS", "90"))
+
+# Seconds the content hash (ETag) of an employee image file stays in the cache. Entries are keyed by
+# the file's size and modification time, so a replaced file is hashed again regardless.
+EMPLOYEE_FILE_DIGEST_CACHE_SECONDS = int(os.environ.get("EMPLOYEE_FILE_DIGEST_CACHE_SECONDS", str(7 * 24 * 3600)))
+
+# Background jobs (jobs app), run by `manage.py run_workers`. A failed attempt is retried after
+# RETRY_BACKOFF * 2**(attempt - 1) seconds (capped); a job whose worker sends no heartbeat for
+# LEASE_SECONDS counts as a failed attempt.
+JOBS_WORKERS = int(os.environ.get("JOBS_WORKERS", "2"))
+JOBS_POLL_INTERVAL = float(os.environ.get("JOBS_POLL_INTERVAL", "1"))
+JOBS_MAX_ATTEMPTS = int(os.environ.get("JOBS_MAX_ATTEMPTS", "3"))
+JOBS_RETRY_BACKOFF = int(os.environ.get("JOBS_RETRY_BACKOFF", "10"))
+JOBS_RETRY_BACKOFF_MAX = int(os.environ.get("JOBS_RETRY_BACKOFF_MAX", "3600"))
+JOBS_LEASE_SECONDS = int(os.environ.get("JOBS_LEASE_SECONDS", "300"))
+
+# How long the cached user-count/superadmin state behind check-user-exists lives. Saves and
+# deletes invalidate it in-process; with several processes use a shared cache (CACHES).
+BOOTSTRAP_STATE_CACHE_SECONDS = int(os.environ.get("BOOTSTRAP_STATE_CACHE_SECONDS", "300"))
+
+# Per-route latency/query metrics served at /metrics (Prometheus text format). With a token the
+# scraper must send "Authorization: Bearer <token>"; without one, only staff users and clients
+# in METRICS_ALLOWED_NETWORKS (by REMOTE_ADDR, so the proxy's address behind a proxy) may read it.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+metrics_networks = os.environ.get("METRICS_ALLOWED_NETWORKS", "127.0.0.1/32,::1/128")
+METRICS_ALLOWED_NETWORKS = [network.strip() for network in metrics_networks.split(",") if network.strip()]
@@ -0,0 +1,215 @@
+import os
+import shutil
+import tempfile
+from unittest import skipUnless
+from wsgiref.util import setup_testing_defaults
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import SimpleTestCase, TransactionTestCase
+from django.utils import timezone
+
+from jobs.models import Job
+from visorhr.db.pool import ConnectionPool, PooledDatabaseWrapperMixin, PoolTimeout, pool_stats
+from visorhr.metrics import registry
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def make_pool(self, **kwargs):
+        options = {"size": 2, "max_lifetime": 0, "timeout": 0.05, "pre_ping": False, **kwargs}
+        return ConnectionPool("test", **options)
+
+    def test_released_connection_is_reused(self):
+        pool = self.make_pool()
+        first = pool.acquire(FakeConnection, lambda conn: None)
+        pool.release(first)
+        second = pool.acquire(FakeConnection, lambda conn: None)
+        self.assertIs(second.connection, first.connection)
+        self.assertEqual(pool.stats()["created"], 1)
+        self.assertEqual(pool.stats()["reused"], 1)
+
+    def test_exhausted_pool_times_out(self):
+        pool = self.make_pool(size=1)
+        pool.acquire(FakeConnection, lambda conn: None)
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection, lambda conn: None)
+        stats = pool.stats()
+        self.assertEqual((stats["in_use"], stats["timeouts"]), (1, 1))
+
+    def test_expired_and_unreachable_connections_are_replaced(self):
+        pool = self.make_pool(max_lifetime=0.01)
+        entry = pool.acquire(FakeConnection, lambda conn: None)
+        entry.created_at -= 1
+        pool.release(entry)
+        self.assertTrue(entry.connection.closed)
+
+        pool = self.make_pool(pre_ping=True)
+        entry = pool.acquire(FakeConnection, lambda conn: None)
+        pool.release(entry)
+        entry.returned_at -= 60
+
+        def ping(conn):
+            raise OSError("gone away")
+
+        replacement = pool.acquire(FakeConnection, ping)
+        self.assertIsNot(replacement.connection, entry.connection)
+        self.assertEqual(pool.stats()["ping_failed"], 1)
+
+
+class _BaseWrapper:
+    def _close(self):
+        pass
+
+
+class FakeWrapper(PooledDatabaseWrapperMixin, _BaseWrapper):
+    alias = "test"
+    in_atomic_block = False
+    autocommit = True
+    needs_rollback = False
+    errors_occurred = False
+
+
+class PooledWrapperCloseTests(SimpleTestCase):
+    def test_connection_closed_after_errors_is_not_pooled(self):
+        pool = ConnectionPool("test", size=2, max_lifetime=0, timeout=0.05, pre_ping=True)
+        for errors, pooled in ((False, 1), (True, 0)):
+            pool.close_idle()
+            wrapper = FakeWrapper()
+            wrapper._pool_entry = pool.acquire(FakeConnection, lambda conn: None)
+            wrapper.connection = wrapper._pool_entry.connection
+            wrapper.errors_occurred = errors
+            wrapper._close()
+            self.assertEqual(pool.stats()["idle"], pooled)
+            self.assertEqual(wrapper.connection.closed, errors)
+
+
+@skipUnless(isinstance(connections["default"], PooledDatabaseWrapperMixin), "default database is not pooled")
+class PooledBackendTests(TransactionTestCase):
+    def get(self, path):
+        environ = {"PATH_INFO": path, "HTTP_HOST": "testserver"}
+        setup_testing_defaults(environ)
+        response = WSGIHandler()(environ, lambda status, headers: None)
+        body = b"".join(response)
+        response.close()  # fires request_finished, which closes (returns) the connection
+        return body
+
+    def test_connection_reused_across_requests(self):
+        raw_connections = []
+
+        def record(sender, connection, **kwargs):
+            raw_connections.append(connection.connection)
+
+        connection.close()
+        before = pool_stats()["default"]
+        connection_created.connect(record)
+        try:
+            for _ in range(5):
+                self.get("/api/health/db/")
+        finally:
+            connection_created.disconnect(record)
+        after = pool_stats()["default"]
+
+        self.assertEqual(len(raw_connections), 5)
+        self.assertTrue(all(raw is raw_connections[0] for raw in raw_connections))
+        self.assertLessEqual(after["created"] - before["created"], 1)
+        self.assertGreaterEqual(after["reused"] - before["reused"], 4)
+        self.assertEqual(after["in_use"], 0)
+
+
+class MetricsTests(TransactionTestCase):
+    def setUp(self):
+        registry.reset()
+
+    def test_requests_are_recorded_per_route(self):
+        self.client.get("/api/health/db/")
+        self.client.get("/api/health/db/")
+        self.client.get("/api/auth/login/")
+
+        snapshot = registry.snapshot()
+        health = snapshot[("api/health/db/", "GET")]
+        self.assertEqual(health["count"], 2)
+        self.assertEqual(health["statuses"], {200: 2})
+        self.assertGreaterEqual(health["db_queries"], 2)
+        self.assertGreater(health["response_bytes"], 0)
+        self.assertEqual(snapshot[("api/auth/login/", "GET")]["statuses"], {405: 1})
+
+        body = self.client.get("/metrics").content.decode()
+        self.assertIn('visorhr_http_request_duration_seconds_count{route="api/health/db/",method="GET"} 2', body)
+        self.assertIn('visorhr_http_request_duration_seconds_bucket{route="api/health/db/",method="GET",le="+Inf"} 2', body)
+        self.assertNotIn('route="metrics"', body)
+
+    def test_metrics_access(self):
+        # The test client connects from 127.0.0.1, inside the default METRICS_ALLOWED_NETWORKS.
+        self.assertEqual(self.client.get("/metrics").status_code, 200)
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.9").status_code, 403)
+        with self.settings(METRICS_ALLOWED_NETWORKS=["10.0.0.0/8"]):
+            self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="10.4.0.7").status_code, 200)
+            self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.client.force_login(get_user_model().objects.create_user("ops", password="pw", is_staff=True))
+        self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.9").status_code, 200)
+
+        self.client.logout()
+        with self.settings(METRICS_TOKEN="s3cret"):
+            self.assertEqual(self.client.get("/metrics").status_code, 401)
+            self.assertEqual(self.client.get("/metrics", REMOTE_ADDR="203.0.113.9", HTTP_AUTHORIZATION="Bearer s3cret").status_code, 200)
+
+
+class MediaServingTests(TransactionTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = self.settings(MEDIA_ROOT=self.media_root, MEDIA_SENDFILE="")
+        media.enable()
+        self.addCleanup(media.disable)
+        for name in ("employees/p.jpg", "employees/.incoming/tmp.upload", "exports/employees-1.csv"):
+            os.makedirs(os.path.dirname(os.path.join(self.media_root, name)), exist_ok=True)
+            with open(os.path.join(self.media_root, name), "wb") as fileobj:
+                fileobj.write(b"0123456789")
+        self.user = get_user_model().objects.create_user("clerk", password="pw")
+        self.client.force_login(self.user)
+
+    def get(self, name, **headers):
+        response = self.client.get(f"/media/{name}", **headers)
+        return response, b"".join(response.streaming_content) if response.streaming else response.content
+
+    def test_access_rules(self):
+        self.assertEqual(self.get("employees/p.jpg")[0]["Cache-Control"], "private, no-cache")
+        for name in ("employees/.incoming/tmp.upload", "employees/../exports/employees-1.csv", "exports/employees-1.csv", "employees/none.jpg"):
+            self.assertEqual(self.get(name)[0].status_code, 404, name)
+        Job.objects.create(kind="employee.export", run_after=timezone.now(), created_by=self.user.id, result={"name": "exports/employees-1.csv"})
+        self.assertEqual(self.get("exports/employees-1.csv")[0].status_code, 200)
+        self.client.logout()
+        self.assertEqual(self.get("employees/p.jpg")[0].status_code, 401)
+
+    def test_ranges_and_revalidation(self):
+        response, body = self.get("employees/p.jpg")
+        self.assertEqual((response.status_code, body, response["Accept-Ranges"]), (200, b"0123456789", "bytes"))
+        self.assertEqual(self.get("employees/p.jpg", HTTP_IF_NONE_MATCH=response["ETag"])[0].status_code, 304)
+
+        partial, body = self.get("employees/p.jpg", HTTP_RANGE="bytes=2-5")
+        self.assertEqual((partial.status_code, body, partial["Content-Range"], partial["Content-Length"]), (206, b"2345", "bytes 2-5/10", "4"))
+        self.assertEqual(self.get("employees/p.jpg", HTTP_RANGE="bytes=-3")[1], b"789")
+        reversed_range = self.get("employees/p.jpg", HTTP_RANGE="bytes=5-3")
+        self.assertEqual((reversed_range[0].status_code, reversed_range[1]), (200, b"0123456789"))
+        self.assertEqual(self.get("employees/p.jpg", HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE=response["ETag"])[0].status_code, 206)
+        self.assertEqual(self.get("employees/p.jpg", HTTP_RANGE="bytes=2-5", HTTP_IF_RANGE='"stale"')[1], b"0123456789")
+        unsatisfiable = self.get("employees/p.jpg", HTTP_RANGE="bytes=10-")[0]
+        self.assertEqual((unsatisfiable.status_code, unsatisfiable["Content-Range"]), (416, "bytes */10"))
+
+    def test_transfer_offloaded_to_front_server(self):
+        with self.settings(MEDIA_SENDFILE="nginx", MEDIA_ACCEL_REDIRECT_PREFIX="/protected-media/"):
+            response, body = self.get("employees/p.jpg")
+        self.assertEqual((response["X-Accel-Redirect"], response["Content-Type"], body), ("/protected-media/employees/p.jpg", "image/jpeg", b""))
+        with self.settings(MEDIA_SENDFILE="apache"):
+            response = self.get("employees/p.jpg")[0]
+        self.assertEqual(response["X-Sendfile"], os.path.join(self.media_root, "employees", "p.jpg"))
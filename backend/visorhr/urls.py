@@ -15,10 +15,15 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import include, path
-from employee import views as employee_views
+
+from . import views
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/auth/", include("accounts.urls")),
-    path("api/employee/save/", employee_views.save_employee, name="save_employee"),
+    path("api/employee/", include("employee.urls")),
+    path("api/jobs/", include("jobs.urls")),
+    path("api/health/db/", views.database_health, name="database_health"),
+    path("metrics", views.metrics, name="metrics"),
+    path("media/<path:name>", views.serve_media, name="serve_media"),
 ]
@@ -0,0 +1,67 @@
+import hmac
+import ipaddress
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET, require_safe
+
+from visorhr import media
+from visorhr.db.pool import pool_stats
+from visorhr.metrics import render_prometheus
+
+
+@require_GET
+def database_health(request):
+    """Ping the default database and report this process's connection pool gauges."""
+    try:
+        with connections["default"].cursor() as cursor:
+            cursor.execute("SELECT 1")
+        ok = True
+    except Exception:
+        ok = False
+    return JsonResponse({"success": ok, "pools": pool_stats()}, status=200 if ok else 503)
+
+
+def _internal_client(request):
+    networks = getattr(settings, "METRICS_ALLOWED_NETWORKS", ["127.0.0.1/32", "::1/128"])
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in networks)
+
+
+@require_GET
+def metrics(request):
+    """Prometheus scrape endpoint.
+
+    With METRICS_TOKEN set it requires ``Authorization: Bearer <token>``; without
+    one it is limited to staff users and clients in METRICS_ALLOWED_NETWORKS.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return HttpResponse(status=401)
+    elif not (request.user.is_staff or _internal_client(request)):
+        return HttpResponse(status=403)
+    return HttpResponse(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@require_safe
+def serve_media(request, name):
+    """A file under MEDIA_ROOT, for signed-in users allowed to read it (see ``visorhr.media``).
+
+    Clients revalidate every use with ``If-None-Match``/``If-Modified-Since``.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({"success": False, "message": "Authentication required."}, status=401)
+
+    name = media.clean_name(name)
+    stat = media.file_stat(name) if name and media.can_read(request.user, name) else None
+    if stat is None:
+        return JsonResponse({"success": False, "message": "File not found."}, status=404)
+    response = media.serve(request, stat, media.stat_etag(stat))
+    patch_cache_control(response, private=True, no_cache=True)
+    return response